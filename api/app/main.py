@@ -1,7 +1,14 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import projects_router, health_router, webhooks_router
+from .routers import projects_router, health_router, webhooks_router, github_router, analytics_router, contributors_router
 from .core.config import settings
+from .core.database import async_engine
+from .services.analytics import AnalyticsRefresher
+from .services.github_client import GitHubClient, create_http_client
+from .services.rate_limit import background_governor
+from .workers import ImportWorker, RefreshScheduler, RefreshWorker, WebhookConsumer
+import asyncio
 import logging
 
 # Configure logging
@@ -9,11 +16,46 @@ logging.basicConfig(
     level=logging.INFO,
     format='{"timestamp": "%(asctime)s", "level": "%(levelname)s", "message": "%(message)s", "module": "%(name)s"}'
 )
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own the pooled GitHub HTTP client and database pool for the lifetime of the app"""
+    http_client = create_http_client()
+    app.state.github_client = GitHubClient(http_client)
+    # In-process workers pace themselves like the worker process, on the same connection pool
+    background_client = GitHubClient(http_client, background_governor())
+    workers = []
+    if settings.scheduler_in_process:
+        workers.append(RefreshScheduler(background_client))
+    if settings.refresh_worker_in_process:
+        workers.append(RefreshWorker(background_client, analytics=AnalyticsRefresher()))
+    if settings.webhook_consumer_in_process:
+        workers.append(WebhookConsumer(background_client))
+    if settings.import_worker_in_process:
+        workers.append(ImportWorker(background_client))
+    if settings.response_cache_backend == "memory" and len(workers) < 4:
+        logger.warning(
+            "RESPONSE_CACHE_BACKEND=memory: writes from worker processes reach this process's "
+            "cached responses only as they expire; use redis when workers run separately"
+        )
+    worker_tasks = [asyncio.create_task(worker.run()) for worker in workers]
+    try:
+        yield
+    finally:
+        for worker in workers:
+            worker.stop()
+        await asyncio.gather(*worker_tasks)
+        await http_client.aclose()
+        await async_engine.dispose()
+
 
 app = FastAPI(
     title="AI Portfolio Console API",
     description="API for managing GitHub repository portfolio",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -29,6 +71,9 @@ app.add_middleware(
 app.include_router(health_router)
 app.include_router(projects_router)
 app.include_router(webhooks_router)
+app.include_router(github_router)
+app.include_router(analytics_router)
+app.include_router(contributors_router)
 
 
 @app.get("/")
@@ -1,4 +1,8 @@
-from .project import Project, ProjectContributor, ProjectRefreshQueue
+from .project import Project, ProjectContributor, ProjectContributorDay, ProjectPullRequestSnapshot, ProjectRefreshQueue
+from .webhook_event import WebhookEvent
+from .github_response import GitHubResponseCache
+from .import_job import ImportJob
+from .contributor_total import ContributorTotal
 from ..core.database import Base
 
-__all__ = ["Project", "ProjectContributor", "ProjectRefreshQueue", "Base"]
\ No newline at end of file
+__all__ = ["Project", "ProjectContributor", "ProjectContributorDay", "ProjectPullRequestSnapshot", "ProjectRefreshQueue", "WebhookEvent", "GitHubResponseCache", "ImportJob", "ContributorTotal", "Base"]
\ No newline at end of file
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Text, Integer, DateTime, Index
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class ContributorTotal(Base):
+    """
+    Per-login rollup of project_contributors: repositories a login is active in and its commits
+    over the window. Recomputed for the logins a write touched, in that write's transaction.
+    Logins no longer active anywhere keep a zeroed row, which the leaderboard leaves out.
+    """
+    __tablename__ = "contributor_totals"
+    
+    login = Column(Text, primary_key=True)
+    repositories = Column(Integer, nullable=False, server_default='0')
+    commits = Column(Integer, nullable=False, server_default='0')
+    last_commit_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # Leaderboard orders, read backwards for descending pages
+        Index('ix_contributor_totals_commits_login', 'commits', 'login'),
+        Index('ix_contributor_totals_repositories_login', 'repositories', 'login'),
+    )
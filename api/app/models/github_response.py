@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Text, DateTime, PrimaryKeyConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class GitHubResponseCache(Base):
+    """Last 200 response of a GitHub REST GET, replayed when GitHub answers a conditional request with 304"""
+    __tablename__ = "github_response_cache"
+    
+    # Token scope (installation:{id}, app, token): tokens rotate hourly, installations do not
+    scope = Column(Text, nullable=False)
+    # Full URL including the query string
+    url = Column(Text, nullable=False)
+    etag = Column(Text)
+    last_modified = Column(Text)
+    body = Column(JSONB, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        PrimaryKeyConstraint('scope', 'url'),
+    )
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Text, Integer, DateTime, CheckConstraint, Index, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+import uuid
+from ..core.database import Base
+
+
+class ImportJob(Base):
+    """A bulk import of many repositories; run by the import worker and polled for progress"""
+    __tablename__ = "import_jobs"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    status = Column(Text, CheckConstraint("status IN ('pending','running','completed','failed')", name='check_import_job_status'),
+                    nullable=False, server_default='pending')
+    # Set when the job imports every repository an organization's installation can see
+    org = Column(Text)
+    total = Column(Integer, nullable=False, server_default='0')
+    processed = Column(Integer, nullable=False, server_default='0')
+    # One {"repo_url", "status", "project_id", "error"} per repository, in request order
+    items = Column(JSONB, nullable=False, server_default='[]')
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True))
+    # Extended by the worker running the job; a running job whose lease lapsed lost its
+    # worker and is resumed from `processed` by the next one to poll
+    locked_until = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        # Claims scan only unfinished jobs, oldest first
+        Index('ix_import_jobs_unfinished', 'created_at', postgresql_where=text("status IN ('pending','running')")),
+    )
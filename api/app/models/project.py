@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, BigInteger, CheckConstraint
+from sqlalchemy import Column, String, Integer, Date, DateTime, Text, ForeignKey, BigInteger, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -18,16 +18,37 @@ class Project(Base):
     last_commit_at = Column(DateTime(timezone=True))
     last_actor = Column(Text)
     install_status = Column(Text, CheckConstraint("install_status IN ('app','oauth','none')"), default='none')
+    # Maintained by a trigger on project_contributors (migration 004); never written by the app
+    active_contributors_90d = Column(Integer, nullable=False, server_default='0')
+    # Newest default-branch commit already folded into contributors; later refreshes fetch only past it
+    history_watermark_oid = Column(Text)
+    history_watermark_at = Column(DateTime(timezone=True))
+    # First day currently counted in the contributors' window totals
+    contributor_window_start = Column(Date)
+    # When the scheduler should next queue a refresh; sooner for recently active projects
+    next_refresh_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     contributors = relationship("ProjectContributor", back_populates="project", cascade="all, delete-orphan")
     refresh_queue = relationship("ProjectRefreshQueue", back_populates="project", cascade="all, delete-orphan")
+    contributor_days = relationship("ProjectContributorDay", back_populates="project", cascade="all, delete-orphan")
+    pr_snapshot = relationship("ProjectPullRequestSnapshot", back_populates="project", uselist=False, cascade="all, delete-orphan")
     
     __table_args__ = (
         CheckConstraint("visibility IN ('public','private')", name='check_visibility'),
         CheckConstraint("install_status IN ('app','oauth','none')", name='check_install_status'),
+        # Keyset pagination: one (sort key, id) index per supported order, scanned in either direction
+        Index('ix_projects_last_commit_at_id', 'last_commit_at', 'id'),
+        Index('ix_projects_name_id', 'name', 'id'),
+        Index('ix_projects_active_contributors_id', 'active_contributors_90d', 'id'),
+        # Substring search (ILIKE '%q%') on owner/name; needs the pg_trgm extension
+        Index('ix_projects_owner_trgm', 'owner', postgresql_using='gin', postgresql_ops={'owner': 'gin_trgm_ops'}),
+        Index('ix_projects_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_projects_visibility', 'visibility'),
+        Index('ix_projects_install_status', 'install_status'),
+        Index('ix_projects_next_refresh_at', 'next_refresh_at'),
     )
 
 
@@ -43,6 +64,47 @@ class ProjectContributor(Base):
     
     # Relationships
     project = relationship("Project", back_populates="contributors")
+    
+    __table_args__ = (
+        # "Which repositories does this login touch": index-only scans, never the whole table
+        Index('ix_project_contributors_login_covering', 'login',
+              postgresql_include=['project_id', 'commits_90d', 'last_commit_at']),
+    )
+
+
+class ProjectContributorDay(Base):
+    """Commits per contributor per day; the window totals in project_contributors are sums over these"""
+    __tablename__ = "project_contributor_days"
+    
+    project_id = Column(UUID(as_uuid=True), ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    login = Column(Text, primary_key=True)
+    day = Column(Date, primary_key=True)
+    commits = Column(Integer, nullable=False, default=0)
+    last_commit_at = Column(DateTime(timezone=True), nullable=False)
+    
+    # Relationships
+    project = relationship("Project", back_populates="contributor_days")
+    
+    __table_args__ = (
+        Index('ix_project_contributor_days_project_day', 'project_id', 'day'),
+    )
+
+
+class ProjectPullRequestSnapshot(Base):
+    """Open pull request activity as of the last refresh, kept current in between by pull_request webhooks"""
+    __tablename__ = "project_pr_snapshots"
+    
+    project_id = Column(UUID(as_uuid=True), ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    open_pr_count = Column(Integer, nullable=False, server_default='0')
+    # Most recently updated open pull request
+    last_open_pr_number = Column(Integer)
+    last_open_pr_updated_at = Column(DateTime(timezone=True))
+    last_open_pr_author = Column(Text)
+    oldest_open_pr_created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    
+    # Relationships
+    project = relationship("Project", back_populates="pr_snapshot")
 
 
 class ProjectRefreshQueue(Base):
@@ -52,6 +114,19 @@ class ProjectRefreshQueue(Base):
     project_id = Column(UUID(as_uuid=True), ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
     queued_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     processed_at = Column(DateTime(timezone=True))
+    # Retry bookkeeping for the refresh worker
+    attempts = Column(Integer, nullable=False, server_default='0')
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # Set while a worker holds the row; an expired lease means the worker died and the row is claimable again
+    locked_until = Column(DateTime(timezone=True))
+    last_error = Column(Text)
     
     # Relationships
-    project = relationship("Project", back_populates="refresh_queue")
\ No newline at end of file
+    project = relationship("Project", back_populates="refresh_queue")
+    
+    __table_args__ = (
+        # At most one pending row per project, so a project is never refreshed twice at once
+        Index('uq_project_refresh_queue_pending', 'project_id', unique=True,
+              postgresql_where=processed_at.is_(None)),
+        Index('ix_project_refresh_queue_due', 'next_attempt_at', postgresql_where=processed_at.is_(None)),
+    )
\ No newline at end of file
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Text, Integer, DateTime, BigInteger, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class WebhookEvent(Base):
+    """Journal of received GitHub deliveries; the webhook consumer processes them in the background"""
+    __tablename__ = "webhook_events"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    # X-GitHub-Delivery; GitHub re-sends a delivery with the same id, so it is stored once
+    delivery_id = Column(Text, nullable=False, unique=True)
+    event_type = Column(Text, nullable=False)
+    # owner/name the event is about; events are coalesced per repository
+    repository = Column(Text)
+    payload = Column(JSONB, nullable=False)
+    received_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    processed_at = Column(DateTime(timezone=True))
+    attempts = Column(Integer, nullable=False, server_default='0')
+    # Lease while a consumer holds the event, and retry backoff after a failure
+    locked_until = Column(DateTime(timezone=True))
+    last_error = Column(Text)
+    
+    __table_args__ = (
+        Index('ix_webhook_events_pending', 'repository', 'received_at', postgresql_where=processed_at.is_(None)),
+    )
@@ -1,5 +1,8 @@
 from .projects import router as projects_router
 from .health import router as health_router
 from .webhooks import router as webhooks_router
+from .github import router as github_router
+from .analytics import router as analytics_router
+from .contributors import router as contributors_router
 
-__all__ = ["projects_router", "health_router", "webhooks_router"]
\ No newline at end of file
+__all__ = ["projects_router", "health_router", "webhooks_router", "github_router", "analytics_router", "contributors_router"]
\ No newline at end of file
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.database import get_db
+from ..schemas import (
+    ActivityResponse, AnalyticsSummary, ContributorOverlapResponse, OwnerActivityResponse
+)
+from ..services.analytics import AnalyticsService
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@router.get("/summary", response_model=AnalyticsSummary)
+async def get_summary(db: AsyncSession = Depends(get_db)):
+    """Portfolio totals as of the last analytics refresh"""
+    try:
+        summary = await AnalyticsService(db).get_summary()
+    except Exception as e:
+        logger.error(f"Failed to get analytics summary: {e}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve analytics")
+
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Analytics have not been computed yet")
+    return summary
+
+
+@router.get("/owners", response_model=OwnerActivityResponse)
+async def get_owners(
+    limit: int = Query(50, ge=1, le=100, description="Number of owners to return"),
+    offset: int = Query(0, ge=0, description="Number of owners to skip"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Repositories and activity per owner, most active repositories first"""
+    try:
+        owners = await AnalyticsService(db).get_owners(limit, offset)
+    except Exception as e:
+        logger.error(f"Failed to get owner analytics: {e}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve analytics")
+    return OwnerActivityResponse(owners=owners, limit=limit, offset=offset)
+
+
+@router.get("/overlap", response_model=ContributorOverlapResponse)
+async def get_overlap(
+    min_repositories: int = Query(2, ge=1, description="Minimum repositories a contributor is active in"),
+    limit: int = Query(50, ge=1, le=100, description="Number of contributors to return"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Contributors active across several repositories"""
+    try:
+        contributors = await AnalyticsService(db).get_overlap(min_repositories, limit)
+    except Exception as e:
+        logger.error(f"Failed to get contributor overlap: {e}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve analytics")
+    return ContributorOverlapResponse(contributors=contributors, min_repositories=min_repositories, limit=limit)
+
+
+@router.get("/activity", response_model=ActivityResponse)
+async def get_activity(
+    days: int = Query(90, ge=1, le=365, description="Days of daily commit totals to return"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Histogram of time since each repository's last commit, and commits per day"""
+    try:
+        activity = await AnalyticsService(db).get_activity(days)
+    except Exception as e:
+        logger.error(f"Failed to get activity analytics: {e}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve analytics")
+    return activity
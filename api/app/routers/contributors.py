@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.database import get_db
+from ..schemas import ContributorProfile, ContributorsListResponse
+from ..services.contributors import ContributorService
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/contributors", tags=["contributors"])
+
+
+@router.get("/", response_model=ContributorsListResponse)
+async def get_contributors(
+    order: str = Query("commits_desc", pattern="^(commits_desc|repositories_desc)$", description="Sort order"),
+    limit: int = Query(50, ge=1, le=100, description="Number of contributors to return"),
+    offset: int = Query(0, ge=0, description="Number of contributors to skip"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Contributors ranked by commits, or by repositories, over the contributor window"""
+    try:
+        return await ContributorService(db).get_leaderboard(order, limit, offset)
+    except Exception as e:
+        logger.error(f"Failed to get contributors: {e}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve contributors")
+
+
+@router.get("/{login}", response_model=ContributorProfile)
+async def get_contributor(
+    login: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """The repositories a contributor committed to over the window"""
+    try:
+        contributor = await ContributorService(db).get_contributor(login)
+    except Exception as e:
+        logger.error(f"Failed to get contributor: {e}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve contributor")
+    
+    if not contributor:
+        raise HTTPException(status_code=404, detail="Contributor not found")
+    return contributor
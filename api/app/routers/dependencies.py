@@ -0,0 +1,7 @@
+from fastapi import Request
+from ..services.github_client import GitHubClient
+
+
+def get_github_client(request: Request) -> GitHubClient:
+    """The app-lifetime GitHub client, opened and closed by the lifespan in main.py"""
+    return request.app.state.github_client
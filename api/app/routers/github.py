@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Depends
+from ..schemas import RateLimitScope, RateLimitsResponse
+from ..services.github_client import GitHubClient
+from .dependencies import get_github_client
+
+router = APIRouter(prefix="/github", tags=["github"])
+
+
+@router.get("/rate-limits", response_model=RateLimitsResponse)
+def get_rate_limits(github_client: GitHubClient = Depends(get_github_client)):
+    """Quota, pacing and throttling per installation, as seen by this process"""
+    return RateLimitsResponse(scopes=[RateLimitScope(**scope) for scope in github_client.governor.snapshot()])
@@ -1,9 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
+from datetime import datetime
+from uuid import UUID
 from ..core.database import get_db
-from ..schemas import ProjectCreate, ProjectResponse, ProjectsListResponse, ProjectDetail
+from ..models.import_job import ImportJob
+from ..schemas import BulkImportJob, BulkImportRequest, ProjectCreate, ProjectResponse, ProjectsListResponse, ProjectDetail
+from ..services.bulk_import import BulkImporter
+from ..services.export import ProjectExporter
+from ..services.github_client import GitHubClient
 from ..services.project_service import ProjectService
+from ..services.rate_limit import RateLimitExceeded
+from ..services.response_cache import CachedBody, response_cache
+from .dependencies import get_github_client
+import time
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,19 +23,31 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 
+def _cached_response(cached: CachedBody, if_none_match: Optional[str]) -> Response:
+    """Serve a cached body, or 304 when the client already holds it"""
+    # Clients may keep a copy but must revalidate it, which costs us only a cache lookup
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if if_none_match and cached.etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+def _rate_limited(error: RateLimitExceeded) -> HTTPException:
+    retry_after = max(1, int(error.retry_at - time.time()))
+    return HTTPException(status_code=429, detail=str(error), headers={"Retry-After": str(retry_after)})
+
+
 @router.post("/", response_model=ProjectResponse)
 async def create_project(
     project_data: ProjectCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    github_client: GitHubClient = Depends(get_github_client)
 ):
     """Create a new project by fetching data from GitHub"""
     try:
-        service = ProjectService(db)
+        service = ProjectService(db, github_client)
         project = await service.create_project(project_data)
         
-        # Get active contributors count
-        active_contributors = len([c for c in project.contributors if c.commits_90d > 0])
-        
         return ProjectResponse(
             id=project.id,
             owner=project.owner,
@@ -33,11 +57,13 @@ async def create_project(
             visibility=project.visibility,
             last_commit_at=project.last_commit_at,
             last_actor=project.last_actor,
-            active_contributors_90d=active_contributors,
+            active_contributors_90d=project.active_contributors_90d,
             install_status=project.install_status,
             created_at=project.created_at,
             updated_at=project.updated_at
         )
+    except RateLimitExceeded as e:
+        raise _rate_limited(e)
     except Exception as e:
         logger.error(f"Failed to create project: {e}")
         if "No access token available" in str(e):
@@ -48,37 +74,149 @@ async def create_project(
             raise HTTPException(status_code=400, detail=f"Failed to create project: {str(e)}")
 
 
+@router.post("/bulk", response_model=BulkImportJob, status_code=202)
+async def bulk_import_projects(
+    request: BulkImportRequest,
+    db: AsyncSession = Depends(get_db),
+    github_client: GitHubClient = Depends(get_github_client)
+):
+    """Import many repositories, or all of an organization's, as a job run by the import worker"""
+    try:
+        importer = BulkImporter(github_client)
+        job = await importer.create_job(db, [str(url) for url in request.repo_urls], request.org)
+    except Exception as e:
+        logger.error(f"Failed to create import job: {e}")
+        raise HTTPException(status_code=500, detail="Failed to create import job")
+    return job
+
+
+@router.get("/bulk/{job_id}", response_model=BulkImportJob)
+async def get_bulk_import(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """Progress and per-repository results of a bulk import"""
+    try:
+        job = await db.scalar(select(ImportJob).where(ImportJob.id == job_id))
+    except Exception as e:
+        logger.error(f"Failed to get import job: {e}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve import job")
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+
+@router.get("/export")
+async def export_projects(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson, or csv produced by COPY"),
+    include_contributors: bool = Query(False, description="Add each project's contributors over the window"),
+    q: Optional[str] = Query(None, min_length=1, max_length=200, description="Substring of owner or name, or owner/name"),
+    owner: Optional[str] = Query(None, description="Exact repository owner"),
+    visibility: Optional[str] = Query(None, pattern="^(public|private)$"),
+    install_status: Optional[str] = Query(None, pattern="^(app|oauth|none)$"),
+    last_commit_after: Optional[datetime] = Query(None, description="Last commit at or after this time"),
+    last_commit_before: Optional[datetime] = Query(None, description="Last commit before this time"),
+    min_contributors: Optional[int] = Query(None, ge=0, description="Minimum active contributors in the window"),
+    max_contributors: Optional[int] = Query(None, ge=0, description="Maximum active contributors in the window")
+):
+    """Stream every matching project in one response, in constant memory"""
+    filters = dict(
+        q=q,
+        owner=owner,
+        visibility=visibility,
+        install_status=install_status,
+        last_commit_after=last_commit_after,
+        last_commit_before=last_commit_before,
+        min_contributors=min_contributors,
+        max_contributors=max_contributors
+    )
+    exporter = ProjectExporter()
+    if format == "csv":
+        body, media_type = exporter.csv(include_contributors, **filters), "text/csv"
+    else:
+        body, media_type = exporter.ndjson(include_contributors, **filters), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="projects.{format}"'}
+    )
+
+
 @router.get("/", response_model=ProjectsListResponse)
-def get_projects(
+async def get_projects(
     order: str = Query("last_activity_at_desc", description="Sort order"),
     limit: int = Query(50, ge=1, le=100, description="Number of projects to return"),
-    offset: int = Query(0, ge=0, description="Number of projects to skip"),
-    db: Session = Depends(get_db)
+    offset: int = Query(0, ge=0, description="Number of projects to skip (ignored with a cursor)"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page"),
+    q: Optional[str] = Query(None, min_length=1, max_length=200, description="Substring of owner or name, or owner/name"),
+    owner: Optional[str] = Query(None, description="Exact repository owner"),
+    visibility: Optional[str] = Query(None, pattern="^(public|private)$"),
+    install_status: Optional[str] = Query(None, pattern="^(app|oauth|none)$"),
+    last_commit_after: Optional[datetime] = Query(None, description="Last commit at or after this time"),
+    last_commit_before: Optional[datetime] = Query(None, description="Last commit before this time"),
+    min_contributors: Optional[int] = Query(None, ge=0, description="Minimum active contributors in the window"),
+    max_contributors: Optional[int] = Query(None, ge=0, description="Maximum active contributors in the window"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+    github_client: GitHubClient = Depends(get_github_client)
 ):
     """Get paginated list of projects"""
+    params = dict(
+        order=order,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        q=q,
+        owner=owner,
+        visibility=visibility,
+        install_status=install_status,
+        last_commit_after=last_commit_after,
+        last_commit_before=last_commit_before,
+        min_contributors=min_contributors,
+        max_contributors=max_contributors
+    )
+    key, cached = await response_cache.get("list", params)
+    if cached:
+        return _cached_response(cached, if_none_match)
+    
     try:
-        service = ProjectService(db)
-        result = service.get_projects(order=order, limit=limit, offset=offset)
-        return ProjectsListResponse(**result)
+        service = ProjectService(db, github_client)
+        result = await service.get_projects(**params)
+        body = ProjectsListResponse(**result).model_dump_json().encode()
+        return _cached_response(await response_cache.set(key, body), if_none_match)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to get projects: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve projects")
 
 
 @router.get("/{project_id}", response_model=ProjectDetail)
-def get_project_detail(
+async def get_project_detail(
     project_id: str,
-    db: Session = Depends(get_db)
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+    github_client: GitHubClient = Depends(get_github_client)
 ):
     """Get detailed project information"""
+    key, cached = None, None
     try:
-        service = ProjectService(db)
-        project = service.get_project_detail(project_id)
+        # Keyed by the canonical id, which is what writes invalidate
+        key, cached = await response_cache.get("detail", {"project_id": UUID(project_id)})
+    except ValueError:
+        pass
+    if cached:
+        return _cached_response(cached, if_none_match)
+    
+    try:
+        service = ProjectService(db, github_client)
+        project = await service.get_project_detail(project_id)
         
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         
-        return project
+        return _cached_response(await response_cache.set(key, project.model_dump_json().encode()), if_none_match)
     except HTTPException:
         raise
     except Exception as e:
@@ -86,19 +224,35 @@ def get_project_detail(
         raise HTTPException(status_code=500, detail="Failed to retrieve project details")
 
 
+@router.delete("/{project_id}", status_code=204)
+async def delete_project(
+    project_id: str,
+    db: AsyncSession = Depends(get_db),
+    github_client: GitHubClient = Depends(get_github_client)
+):
+    """Stop tracking a project"""
+    try:
+        service = ProjectService(db, github_client)
+        if not await service.delete_project(project_id):
+            raise HTTPException(status_code=404, detail="Project not found")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to delete project: {e}")
+        raise HTTPException(status_code=500, detail="Failed to delete project")
+
+
 @router.post("/{project_id}/refresh", response_model=ProjectResponse)
 async def refresh_project(
     project_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    github_client: GitHubClient = Depends(get_github_client)
 ):
     """Refresh project data from GitHub"""
     try:
-        service = ProjectService(db)
+        service = ProjectService(db, github_client)
         project = await service.refresh_project(project_id)
         
-        # Get active contributors count
-        active_contributors = len([c for c in project.contributors if c.commits_90d > 0])
-        
         return ProjectResponse(
             id=project.id,
             owner=project.owner,
@@ -108,13 +262,15 @@ async def refresh_project(
             visibility=project.visibility,
             last_commit_at=project.last_commit_at,
             last_actor=project.last_actor,
-            active_contributors_90d=active_contributors,
+            active_contributors_90d=project.active_contributors_90d,
             install_status=project.install_status,
             created_at=project.created_at,
             updated_at=project.updated_at
         )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except RateLimitExceeded as e:
+        raise _rate_limited(e)
     except Exception as e:
         logger.error(f"Failed to refresh project: {e}")
         if "No access token available" in str(e):
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Request, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..core.database import get_db
 from ..core.config import settings
-from ..services.project_service import ProjectService
+from ..models.webhook_event import WebhookEvent
 import hashlib
 import hmac
 import json
@@ -12,6 +13,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
+# Events the webhook consumer acts on; anything else is acknowledged and dropped
+JOURNALED_EVENTS = {"push", "pull_request"}
+
 
 def verify_github_signature(payload: bytes, signature: str) -> bool:
     """Verify GitHub webhook signature"""
@@ -28,12 +32,15 @@ def verify_github_signature(payload: bytes, signature: str) -> bool:
     return hmac.compare_digest(f"sha256={expected_signature}", signature)
 
 
-@router.post("/github")
+@router.post("/github", status_code=202)
 async def github_webhook(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Handle GitHub webhook events"""
+    """
+    Verify and journal a GitHub delivery, then acknowledge it.
+    Processing happens in the webhook consumer, so GitHub never waits on it.
+    """
     try:
         # Get the raw payload
         payload = await request.body()
@@ -46,34 +53,33 @@ async def github_webhook(
         # Parse the payload
         try:
             event_data = json.loads(payload.decode())
-        except json.JSONDecodeError:
+        except (json.JSONDecodeError, UnicodeDecodeError):
             raise HTTPException(status_code=400, detail="Invalid JSON payload")
         
         # Get event type
         event_type = request.headers.get("X-GitHub-Event", "")
+        repository = (event_data.get("repository") or {}).get("full_name")
+        if event_type not in JOURNALED_EVENTS or not repository:
+            return {"status": "ignored"}
+        
+        delivery_id = request.headers.get("X-GitHub-Delivery")
+        if not delivery_id:
+            raise HTTPException(status_code=400, detail="Missing X-GitHub-Delivery header")
         
-        # Only process push events for now
-        if event_type == "push":
-            repository = event_data.get("repository", {})
-            owner = repository.get("owner", {}).get("login")
-            repo_name = repository.get("name")
-            
-            if owner and repo_name:
-                # Find the project in our database
-                service = ProjectService(db)
-                projects = service.get_projects(limit=1000, offset=0)  # Get all projects
-                
-                for project in projects["projects"]:
-                    if project.owner == owner and project.name == repo_name:
-                        # Queue for refresh
-                        service.queue_refresh(str(project.id))
-                        logger.info(f"Queued project {owner}/{repo_name} for refresh due to push event")
-                        break
+        # Redeliveries reuse the delivery id and are dropped here
+        stmt = insert(WebhookEvent).values(
+            delivery_id=delivery_id,
+            event_type=event_type,
+            repository=repository,
+            payload=event_data
+        ).on_conflict_do_nothing(index_elements=[WebhookEvent.delivery_id])
+        result = await db.execute(stmt)
+        await db.commit()
         
-        return {"status": "ok"}
+        return {"status": "accepted" if result.rowcount else "duplicate"}
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Webhook processing failed: {e}")
-        raise HTTPException(status_code=500, detail="Webhook processing failed")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Webhook processing failed")
@@ -1,8 +1,9 @@
-from pydantic import BaseModel, HttpUrl, validator
+from pydantic import BaseModel, HttpUrl, root_validator, validator
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 import re
+from .core.config import settings
 
 
 class ProjectCreate(BaseModel):
@@ -16,6 +17,48 @@ class ProjectCreate(BaseModel):
         return v
 
 
+class BulkImportRequest(BaseModel):
+    repo_urls: List[HttpUrl] = []
+    org: Optional[str] = None  # Import every repository the App installation on this org can read
+    
+    @validator('repo_urls', each_item=True)
+    def validate_github_url(cls, v):
+        if not re.match(r'https://github\.com/[^/]+/[^/]+/?$', str(v)):
+            raise ValueError('Must be a valid GitHub repository URL')
+        return v
+    
+    @root_validator(skip_on_failure=True)
+    def validate_source(cls, values):
+        if bool(values.get('repo_urls')) == bool(values.get('org')):
+            raise ValueError('Provide either repo_urls or org')
+        if len(values.get('repo_urls') or []) > settings.bulk_import_max_repositories:
+            raise ValueError(f'At most {settings.bulk_import_max_repositories} repositories per import')
+        return values
+
+
+class BulkImportItem(BaseModel):
+    repo_url: str
+    status: str  # pending, created, exists or failed
+    project_id: Optional[UUID] = None
+    error: Optional[str] = None
+
+
+class BulkImportJob(BaseModel):
+    id: UUID
+    status: str  # pending, running, completed or failed
+    org: Optional[str] = None
+    total: int
+    processed: int
+    items: List[BulkImportItem]
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
 class ContributorDetail(BaseModel):
     login: str
     commits: int
@@ -50,6 +93,8 @@ class ProjectList(ProjectBase):
 class ProjectDetail(ProjectBase):
     contributors_90d: List[ContributorDetail]
     last_open_pr: Optional[LastOpenPR] = None
+    open_pr_count: Optional[int] = None  # None until the first refresh has read the project's PRs
+    oldest_open_pr_at: Optional[datetime] = None
     default_branch_ref: Optional[str] = None
 
 
@@ -63,6 +108,111 @@ class HealthResponse(BaseModel):
 
 class ProjectsListResponse(BaseModel):
     projects: List[ProjectList]
-    total: int
+    total: Optional[int] = None  # Omitted when paging by cursor
+    limit: int
+    offset: int
+    next_cursor: Optional[str] = None
+
+
+class ContributorSummary(BaseModel):
+    login: str
+    repositories: int  # Repositories with commits by this login in the window
+    commits: int  # Across all of them, over the window
+    last_commit_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class ContributorsListResponse(BaseModel):
+    contributors: List[ContributorSummary]
+    limit: int
+    offset: int
+
+
+class ContributorProject(BaseModel):
+    id: UUID
+    owner: str
+    name: str
+    html_url: str
+    commits: int
+    last_commit_at: Optional[datetime] = None
+
+
+class ContributorProfile(ContributorSummary):
+    projects: List[ContributorProject]
+
+
+class RateLimitScope(BaseModel):
+    scope: str  # "installation:<id>", "app" (App JWT calls) or "token"
+    resource: str  # "core" (REST) or "graphql"
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_at: Optional[datetime] = None
+    paused_until: Optional[datetime] = None
+    concurrency: int
+    in_flight: int
+    waiting: int
+    last_cost: int
+    requests: int
+    throttled: int
+    secondary_limits: int
+
+
+class RateLimitsResponse(BaseModel):
+    scopes: List[RateLimitScope]
+
+
+class AnalyticsSummary(BaseModel):
+    repositories: int
+    active_repositories: int  # With at least one active contributor in the window
+    owners: int
+    active_contributors: int  # Distinct logins with commits in the window
+    shared_contributors: int  # Active in more than one repository
+    refreshed_at: Optional[datetime] = None
+
+
+class OwnerActivity(BaseModel):
+    owner: str
+    repositories: int
+    active_repositories: int
+    active_contributors: int
+    commits: int
+    last_commit_at: Optional[datetime] = None
+
+
+class OwnerActivityResponse(BaseModel):
+    owners: List[OwnerActivity]
+    limit: int
+    offset: int
+
+
+class ContributorOverlap(BaseModel):
+    login: str
+    repositories: int
+    owners: int
+    commits: int
+    last_commit_at: Optional[datetime] = None
+
+
+class ContributorOverlapResponse(BaseModel):
+    contributors: List[ContributorOverlap]
+    min_repositories: int
     limit: int
-    offset: int
\ No newline at end of file
+
+
+class ActivityBucket(BaseModel):
+    bucket: str  # week, month, quarter, year, older or never
+    repositories: int
+
+
+class DailyCommits(BaseModel):
+    day: date
+    commits: int
+    contributors: int
+    repositories: int
+
+
+class ActivityResponse(BaseModel):
+    last_commit_age: List[ActivityBucket]
+    daily_commits: List[DailyCommits]
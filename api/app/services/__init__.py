@@ -1,4 +1,5 @@
-from .github_client import GitHubClient
+from .github_client import GitHubClient, create_http_client
 from .project_service import ProjectService
+from .rate_limit import RateLimitExceeded, RateLimitGovernor
 
-__all__ = ["GitHubClient", "ProjectService"]
\ No newline at end of file
+__all__ = ["GitHubClient", "ProjectService", "RateLimitExceeded", "RateLimitGovernor", "create_http_client"]
@@ -0,0 +1,156 @@
+"""
+Portfolio-wide analytics, read from the materialized views of migration 013.
+
+The views are recomputed with REFRESH MATERIALIZED VIEW CONCURRENTLY after refresh
+batches (at most every ANALYTICS_REFRESH_MIN_INTERVAL_SECONDS), so readers never
+wait on a refresh and every endpoint reads a few pre-aggregated rows, however many
+projects and contributors there are.
+"""
+from sqlalchemy import BigInteger, Column, Date, DateTime, Integer, MetaData, Table, Text, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from typing import Any, Dict, List, Optional
+from datetime import date, timedelta
+import asyncio
+import time
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Views are not tables: kept out of Base.metadata so create_all never creates them
+views = MetaData()
+
+analytics_summary = Table(
+    "analytics_summary", views,
+    Column("id", Integer, primary_key=True),
+    Column("repositories", BigInteger),
+    Column("active_repositories", BigInteger),
+    Column("owners", BigInteger),
+    Column("active_contributors", BigInteger),
+    Column("shared_contributors", BigInteger),
+    Column("refreshed_at", DateTime(timezone=True)),
+)
+
+analytics_owner_activity = Table(
+    "analytics_owner_activity", views,
+    Column("owner", Text, primary_key=True),
+    Column("repositories", BigInteger),
+    Column("active_repositories", BigInteger),
+    Column("active_contributors", BigInteger),
+    Column("commits", BigInteger),
+    Column("last_commit_at", DateTime(timezone=True)),
+)
+
+analytics_contributor_overlap = Table(
+    "analytics_contributor_overlap", views,
+    Column("login", Text, primary_key=True),
+    Column("repositories", BigInteger),
+    Column("owners", BigInteger),
+    Column("commits", BigInteger),
+    Column("last_commit_at", DateTime(timezone=True)),
+)
+
+analytics_activity_histogram = Table(
+    "analytics_activity_histogram", views,
+    Column("bucket", Text, primary_key=True),
+    Column("position", Integer),
+    Column("repositories", BigInteger),
+)
+
+analytics_daily_commits = Table(
+    "analytics_daily_commits", views,
+    Column("day", Date, primary_key=True),
+    Column("commits", BigInteger),
+    Column("contributors", BigInteger),
+    Column("repositories", BigInteger),
+)
+
+# Arbitrary key for the advisory lock that keeps refreshes from overlapping across processes
+ANALYTICS_REFRESH_LOCK = 0x616E616C
+
+
+async def refresh_views(db: AsyncSession) -> bool:
+    """Recompute every analytics view; False when another process is already doing it"""
+    if not await db.scalar(select(func.pg_try_advisory_xact_lock(ANALYTICS_REFRESH_LOCK))):
+        await db.rollback()
+        return False
+
+    for view in views.sorted_tables:
+        await db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view.name}"))
+    await db.commit()
+    return True
+
+
+class AnalyticsRefresher:
+    """Throttles view refreshes triggered by refresh batches to one per interval per process"""
+
+    def __init__(self, session_factory: async_sessionmaker = AsyncSessionLocal, min_interval: Optional[float] = None):
+        self.session_factory = session_factory
+        self.min_interval = settings.analytics_refresh_min_interval_seconds if min_interval is None else min_interval
+        self._last_refresh: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def maybe_refresh(self) -> bool:
+        if self._lock.locked():
+            return False
+        async with self._lock:
+            now = time.monotonic()
+            if self._last_refresh is not None and now - self._last_refresh < self.min_interval:
+                return False
+            self._last_refresh = now
+
+            started = time.monotonic()
+            async with self.session_factory() as db:
+                refreshed = await refresh_views(db)
+            if refreshed:
+                logger.info(f"Refreshed analytics views in {time.monotonic() - started:.1f}s")
+            return refreshed
+
+
+class AnalyticsService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_summary(self) -> Optional[Dict[str, Any]]:
+        row = (await self.db.execute(select(analytics_summary))).mappings().first()
+        return dict(row) if row else None
+
+    async def get_owners(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """Owners with the most active repositories first"""
+        result = await self.db.execute(
+            select(analytics_owner_activity).order_by(
+                analytics_owner_activity.c.active_repositories.desc(),
+                analytics_owner_activity.c.owner.desc()
+            ).limit(limit).offset(offset)
+        )
+        return [dict(row) for row in result.mappings()]
+
+    async def get_overlap(self, min_repositories: int = 2, limit: int = 50) -> List[Dict[str, Any]]:
+        """Contributors active in at least `min_repositories` repositories, most spread out first"""
+        result = await self.db.execute(
+            select(analytics_contributor_overlap).where(
+                analytics_contributor_overlap.c.repositories >= min_repositories
+            ).order_by(
+                analytics_contributor_overlap.c.repositories.desc(),
+                analytics_contributor_overlap.c.login.desc()
+            ).limit(limit)
+        )
+        return [dict(row) for row in result.mappings()]
+
+    async def get_activity(self, days: int = 90) -> Dict[str, Any]:
+        """Repositories by time since their last commit, and portfolio-wide commits per day"""
+        histogram = await self.db.execute(
+            select(analytics_activity_histogram).order_by(analytics_activity_histogram.c.position)
+        )
+        daily = await self.db.execute(
+            select(analytics_daily_commits).where(
+                analytics_daily_commits.c.day >= date.today() - timedelta(days=days)
+            ).order_by(analytics_daily_commits.c.day)
+        )
+        return {
+            "last_commit_age": [
+                {"bucket": row["bucket"], "repositories": row["repositories"]} for row in histogram.mappings()
+            ],
+            "daily_commits": [dict(row) for row in daily.mappings()]
+        }
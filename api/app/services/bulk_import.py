@@ -0,0 +1,155 @@
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+import asyncio
+import contextlib
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from ..models.import_job import ImportJob
+from ..models.project import Project
+from .github_client import GitHubClient
+from .project_service import ProjectService
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _item(repo_url: str) -> Dict[str, Any]:
+    return {"repo_url": repo_url, "status": "pending", "project_id": None, "error": None}
+
+
+def _normalize(repo_url: str) -> str:
+    return repo_url.rstrip('/').removesuffix('.git')
+
+
+class BulkImporter:
+    """
+    Imports many repositories as one job.
+    Repositories are processed in chunks: one query finds those already tracked, the rest
+    are fetched with the client's batched GraphQL queries (bounded by
+    GITHUB_GRAPHQL_BATCH_CONCURRENCY) and inserted with multi-row INSERTs. The job row is
+    updated after every chunk, so progress can be polled from any API process and a job
+    whose worker died is resumed from its last finished chunk.
+    """
+
+    def __init__(self, github_client: GitHubClient, session_factory: async_sessionmaker = AsyncSessionLocal):
+        self.github_client = github_client
+        self.session_factory = session_factory
+
+    async def create_job(self, db: AsyncSession, repo_urls: List[str], org: Optional[str] = None) -> ImportJob:
+        """Record a pending job for the import worker; repositories of `org` are listed when it runs"""
+        urls = list(dict.fromkeys(_normalize(url) for url in repo_urls))
+        job = ImportJob(org=org, total=len(urls), processed=0, items=[_item(url) for url in urls], status="pending")
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        logger.info(f"Created import job {job.id} for {org or f'{len(urls)} repositories'}")
+        return job
+
+    async def run(self, job_id: UUID, stop: Optional[asyncio.Event] = None) -> None:
+        """
+        Work through a claimed job, recording per-repository results as chunks finish.
+        Picks up after the last finished chunk; once `stop` is set the lease is released
+        between chunks and the job left to the next worker.
+        """
+        async with self.session_factory() as db:
+            job = await db.scalar(select(ImportJob).where(ImportJob.id == job_id))
+            if job is None:
+                return
+
+            heartbeat = asyncio.create_task(self._heartbeat(job_id))
+            try:
+                if job.org and not job.items:
+                    urls = await self.github_client.list_owner_repositories(job.org)
+                    job.items = [_item(_normalize(url)) for url in urls]
+                    job.total = len(job.items)
+                    await db.commit()
+
+                chunk_size = settings.bulk_import_chunk_size
+                for start in range(job.processed, job.total, chunk_size):
+                    if stop is not None and stop.is_set():
+                        job.locked_until = None
+                        await db.commit()
+                        logger.info(f"Import job {job.id} released: {job.processed} of {job.total} processed")
+                        return
+                    await self._import_chunk(db, job, start, start + chunk_size)
+                job.status = "completed"
+            except Exception as e:
+                logger.error(f"Import job {job.id} failed: {e}")
+                await db.rollback()
+                await db.refresh(job)
+                job.status = "failed"
+                job.error = str(e)
+            finally:
+                heartbeat.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await heartbeat
+
+            job.finished_at = datetime.now(timezone.utc)
+            job.locked_until = None
+            await db.commit()
+            logger.info(f"Import job {job.id} {job.status}: {job.processed} of {job.total} processed")
+
+    async def _heartbeat(self, job_id: UUID) -> None:
+        """Extend the job's lease while it runs, however long GitHub keeps a chunk waiting"""
+        lease = timedelta(seconds=settings.import_worker_lease_seconds)
+        while True:
+            await asyncio.sleep(lease.total_seconds() / 3)
+            try:
+                async with self.session_factory() as db:
+                    await db.execute(update(ImportJob).where(
+                        ImportJob.id == job_id,
+                        ImportJob.status == "running"
+                    ).values(locked_until=func.now() + lease))
+                    await db.commit()
+            except Exception as e:
+                # The next beat tries again; the lease only lapses if every beat fails
+                logger.warning(f"Failed to extend the lease of import job {job_id}: {e}")
+
+    async def _import_chunk(self, db: AsyncSession, job: ImportJob, start: int, end: int) -> None:
+        items = [dict(item) for item in job.items]
+        chunk = items[start:end]
+
+        repos: Dict[str, Any] = {}
+        for item in chunk:
+            try:
+                repos[item["repo_url"]] = self.github_client._parse_github_url(item["repo_url"])
+            except ValueError as e:
+                item.update(status="failed", error=str(e))
+
+        existing = {}
+        if repos:
+            rows = await db.execute(select(Project.id, Project.owner, Project.name).where(
+                tuple_(Project.owner, Project.name).in_(list(repos.values()))
+            ))
+            existing = {(owner, name): project_id for project_id, owner, name in rows.all()}
+        to_fetch = [url for url, repo in repos.items() if repo not in existing]
+        # Nothing is held open while GitHub is awaited
+        await db.commit()
+
+        fetched = await self.github_client.fetch_many(to_fetch) if to_fetch else {}
+        imported = await ProjectService(db, self.github_client).import_projects(
+            [data for data in fetched.values() if not isinstance(data, Exception)]
+        )
+
+        for item in chunk:
+            if item["status"] != "pending":
+                continue
+            repo = repos[item["repo_url"]]
+            result = fetched.get(item["repo_url"])
+            if repo in existing:
+                item.update(status="exists", project_id=str(existing[repo]))
+            elif isinstance(result, Exception):
+                item.update(status="failed", error=str(result))
+            elif repo in imported:
+                item.update(status="created", project_id=str(imported[repo]))
+            else:
+                # Added by someone else between our lookup and the insert
+                item.update(status="exists")
+
+        # Reassigned rather than mutated so the JSONB column is written
+        job.items = items
+        job.processed = min(end, job.total)
+        await db.commit()
@@ -0,0 +1,217 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, delete, func, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import Insert, insert
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from datetime import date, datetime, timedelta, timezone
+from ..core.config import settings
+from ..models.project import Project, ProjectContributor, ProjectContributorDay
+from .github_client import contributor_window_start
+
+# (login, commits, last_commit_at)
+ContributorTotals = Tuple[str, int, datetime]
+
+
+class ContributorWindow:
+    """
+    Rolling-window contributor aggregation.
+    Commits are stored as per-(project, login, day) buckets. The totals in
+    project_contributors always equal the sum of the buckets inside the window:
+    new commits are added as they arrive and boundary days are added or
+    subtracted as the window moves, so no GitHub re-fetch is needed.
+    Totals are written with set-based INSERT ... ON CONFLICT / DELETE statements rather
+    than per-contributor ORM objects, so a write touches only rows whose totals change.
+    Logins whose totals may have changed are collected in `touched`, for the caller to
+    refresh their contributor_totals rollup once the write commits.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.touched: Set[str] = set()
+
+    def _bucket_totals(self, project: Project, start: date, end: Optional[date] = None) -> Select:
+        """Per-login sums of the buckets with start <= day < end, as (login, commits, last_commit_at)"""
+        query = select(
+            ProjectContributorDay.login,
+            func.sum(ProjectContributorDay.commits).label("commits"),
+            func.max(ProjectContributorDay.last_commit_at).label("last_commit_at")
+        ).where(
+            ProjectContributorDay.project_id == project.id,
+            ProjectContributorDay.day >= start
+        )
+        if end is not None:
+            query = query.where(ProjectContributorDay.day < end)
+        return query.group_by(ProjectContributorDay.login)
+
+    def _upsert(self, project: Project, totals: Union[Select, List[ContributorTotals]], replace: bool = False) -> Insert:
+        """
+        INSERT ... ON CONFLICT (project_id, login) DO UPDATE from per-login totals.
+        New logins are inserted; existing rows get the totals added, or set when `replace`,
+        in which case rows that would not change are skipped.
+        """
+        if isinstance(totals, list):
+            stmt = insert(ProjectContributor).values([
+                {
+                    "id": func.gen_random_uuid(),
+                    "project_id": project.id,
+                    "login": login,
+                    "commits_90d": commits,
+                    "last_commit_at": last_commit_at
+                }
+                for login, commits, last_commit_at in totals
+            ])
+        else:
+            source = totals.subquery()
+            stmt = insert(ProjectContributor).from_select(
+                ["id", "project_id", "login", "commits_90d", "last_commit_at"],
+                select(
+                    func.gen_random_uuid(),
+                    literal(project.id, ProjectContributor.project_id.type),
+                    source.c.login,
+                    source.c.commits,
+                    source.c.last_commit_at
+                ),
+                include_defaults=False
+            )
+
+        excluded = stmt.excluded
+        if replace:
+            return stmt.on_conflict_do_update(
+                index_elements=[ProjectContributor.project_id, ProjectContributor.login],
+                set_={"commits_90d": excluded.commits_90d, "last_commit_at": excluded.last_commit_at, "updated_at": func.now()},
+                where=tuple_(ProjectContributor.commits_90d, ProjectContributor.last_commit_at).is_distinct_from(
+                    tuple_(excluded.commits_90d, excluded.last_commit_at)
+                )
+            )
+        return stmt.on_conflict_do_update(
+            index_elements=[ProjectContributor.project_id, ProjectContributor.login],
+            set_={
+                "commits_90d": ProjectContributor.commits_90d + excluded.commits_90d,
+                "last_commit_at": func.greatest(ProjectContributor.last_commit_at, excluded.last_commit_at),
+                "updated_at": func.now()
+            }
+        )
+
+    async def _subtract_from_totals(self, project: Project, totals: Select) -> None:
+        """Take expired buckets off the totals in one statement, removing logins left with nothing"""
+        expired = totals.cte("expired")
+        # Both halves see the rows as they were, so each contributor is either deleted or updated
+        removed = delete(ProjectContributor).where(
+            ProjectContributor.project_id == project.id,
+            ProjectContributor.login == expired.c.login,
+            ProjectContributor.commits_90d <= expired.c.commits
+        ).cte("removed")
+        await self.db.execute(update(ProjectContributor).where(
+            ProjectContributor.project_id == project.id,
+            ProjectContributor.login == expired.c.login,
+            ProjectContributor.commits_90d > expired.c.commits
+        ).values(
+            commits_90d=ProjectContributor.commits_90d - expired.c.commits,
+            updated_at=func.now()
+        ).add_cte(removed))
+
+    async def record(self, project: Project, commit_days: List[Dict[str, Any]]) -> None:
+        """Fold newly fetched commits into the buckets and the running window totals"""
+        if not commit_days:
+            return
+
+        stmt = insert(ProjectContributorDay).values([
+            {
+                "project_id": project.id,
+                "login": bucket["login"],
+                "day": bucket["day"],
+                "commits": bucket["commits"],
+                "last_commit_at": bucket["last_commit_at"]
+            }
+            for bucket in commit_days
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["project_id", "login", "day"],
+            set_={
+                "commits": ProjectContributorDay.commits + stmt.excluded.commits,
+                "last_commit_at": func.greatest(ProjectContributorDay.last_commit_at, stmt.excluded.last_commit_at)
+            }
+        )
+        await self.db.execute(stmt)
+
+        totals: Dict[str, List[Any]] = {}
+        for bucket in commit_days:
+            if bucket["day"] < project.contributor_window_start:
+                continue
+            login_totals = totals.setdefault(bucket["login"], [bucket["login"], 0, bucket["last_commit_at"]])
+            login_totals[1] += bucket["commits"]
+            login_totals[2] = max(login_totals[2], bucket["last_commit_at"])
+
+        if totals:
+            await self.db.execute(self._upsert(project, [tuple(t) for t in totals.values()]))
+            self.touched.update(totals)
+
+    async def rebuild(self, project: Project, commit_days: List[Dict[str, Any]]) -> None:
+        """Replace the in-window buckets with a full fetch and recompute the totals from them"""
+        window_start = contributor_window_start().date()
+        # Logins about to leave the window are only known before the rewrite
+        self.touched.update(await self.db.scalars(
+            select(ProjectContributor.login).where(ProjectContributor.project_id == project.id)
+        ))
+
+        await self.db.execute(delete(ProjectContributorDay).where(
+            ProjectContributorDay.project_id == project.id,
+            ProjectContributorDay.day >= window_start
+        ))
+
+        rows = [
+            {
+                "project_id": project.id,
+                "login": bucket["login"],
+                "day": bucket["day"],
+                "commits": bucket["commits"],
+                "last_commit_at": bucket["last_commit_at"]
+            }
+            for bucket in commit_days
+            if bucket["day"] >= window_start
+        ]
+        if rows:
+            await self.db.execute(insert(ProjectContributorDay), rows)
+            self.touched.update(row["login"] for row in rows)
+
+        # One round trip: drop logins that left the window, upsert the rest, skip unchanged rows
+        totals = self._bucket_totals(project, window_start)
+        left = delete(ProjectContributor).where(
+            ProjectContributor.project_id == project.id,
+            ProjectContributor.login.not_in(select(totals.subquery().c.login))
+        ).cte("left_window")
+        await self.db.execute(self._upsert(project, totals, replace=True).add_cte(left))
+
+        project.contributor_window_start = window_start
+        await self.db.flush()
+
+    async def slide(self, project: Project) -> None:
+        """Move the window to today, adding or expiring only the days that crossed its start"""
+        old_start = project.contributor_window_start
+        new_start = contributor_window_start().date()
+        if old_start is None:
+            return
+
+        if new_start != old_start:
+            self.touched.update(await self.db.scalars(
+                select(ProjectContributorDay.login).distinct().where(
+                    ProjectContributorDay.project_id == project.id,
+                    ProjectContributorDay.day >= min(old_start, new_start),
+                    ProjectContributorDay.day < max(old_start, new_start)
+                )
+            ))
+        if new_start > old_start:
+            await self._subtract_from_totals(project, self._bucket_totals(project, old_start, new_start))
+        elif new_start < old_start:
+            # The window was widened; days we still keep buckets for count again
+            await self.db.execute(self._upsert(project, self._bucket_totals(project, new_start, old_start)))
+        project.contributor_window_start = new_start
+
+        # Buckets past retention can never re-enter the window
+        retention_days = max(settings.contributor_window_days, settings.contributor_bucket_retention_days)
+        retention_start = datetime.now(timezone.utc).date() - timedelta(days=retention_days)
+        await self.db.execute(delete(ProjectContributorDay).where(
+            ProjectContributorDay.project_id == project.id,
+            ProjectContributorDay.day < retention_start
+        ))
+
+        await self.db.flush()
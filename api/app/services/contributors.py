@@ -0,0 +1,169 @@
+from sqlalchemy import Executable, Select, Text, any_, bindparam, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, Insert, insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+from uuid import UUID
+from ..models.contributor_total import ContributorTotal
+from ..models.project import Project, ProjectContributor
+
+LEADERBOARD_ORDERS = {
+    "commits_desc": (ContributorTotal.commits.desc(), ContributorTotal.login.desc()),
+    "repositories_desc": (ContributorTotal.repositories.desc(), ContributorTotal.login.desc()),
+}
+
+
+def _matching(logins: Union[List[str], Select]) -> Callable[[Any], Any]:
+    """A predicate on a login column for a list of logins or a query returning them"""
+    if isinstance(logins, Select):
+        return lambda column: column.in_(logins)
+    # One array parameter however many logins, rather than a bind per login
+    logins_array = bindparam("logins", sorted(logins), type_=ARRAY(Text))
+    return lambda column: column == any_(logins_array)
+
+
+def lock_statements(logins: Union[List[str], Select]) -> List[Executable]:
+    """
+    Create the rollup rows of `logins` that do not exist yet, then lock them all, both in
+    login order so concurrent writers cannot deadlock. A login's recompute only starts once
+    every earlier recompute of it has committed, and reads their changes.
+    """
+    if isinstance(logins, Select):
+        candidates = logins.subquery().c.login
+    else:
+        candidates = func.unnest(bindparam("logins", sorted(logins), type_=ARRAY(Text))).column_valued("login")
+    create = insert(ContributorTotal).from_select(
+        ["login"],
+        select(candidates).distinct().order_by(candidates)
+    ).on_conflict_do_nothing(index_elements=[ContributorTotal.login])
+    lock = select(ContributorTotal.login).where(
+        _matching(logins)(ContributorTotal.login)
+    ).order_by(
+        ContributorTotal.login
+    ).with_for_update()
+    return [create, lock]
+
+
+def totals_statement(logins: Union[List[str], Select], excluding_project: Optional[UUID] = None) -> Insert:
+    """
+    Recompute contributor_totals for `logins` from project_contributors in one statement:
+    upsert logins still active somewhere (skipping unchanged rows), zero the rest.
+    The aggregate reads only the login-leading covering index. `excluding_project` leaves
+    out a project about to be deleted, whose rows are still there.
+    """
+    wanted = _matching(logins)
+    source = select(
+        ProjectContributor.login,
+        func.count().label("repositories"),
+        func.sum(ProjectContributor.commits_90d).label("commits"),
+        func.max(ProjectContributor.last_commit_at).label("last_commit_at")
+    ).where(
+        wanted(ProjectContributor.login)
+    )
+    if excluding_project is not None:
+        source = source.where(ProjectContributor.project_id != excluding_project)
+    source = source.group_by(ProjectContributor.login).cte("source")
+    # Rows are zeroed rather than deleted: a deleted row cannot be locked by the next writer
+    gone = update(ContributorTotal).where(
+        wanted(ContributorTotal.login),
+        ContributorTotal.login.not_in(select(source.c.login)),
+        ContributorTotal.repositories != 0
+    ).values(
+        repositories=0, commits=0, last_commit_at=None, updated_at=func.now()
+    ).cte("gone")
+
+    stmt = insert(ContributorTotal).from_select(
+        ["login", "repositories", "commits", "last_commit_at"],
+        select(source.c.login, source.c.repositories, source.c.commits, source.c.last_commit_at)
+    )
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[ContributorTotal.login],
+        set_={
+            "repositories": excluded.repositories,
+            "commits": excluded.commits,
+            "last_commit_at": excluded.last_commit_at,
+            "updated_at": func.now()
+        },
+        where=tuple_(ContributorTotal.repositories, ContributorTotal.commits, ContributorTotal.last_commit_at).is_distinct_from(
+            tuple_(excluded.repositories, excluded.commits, excluded.last_commit_at)
+        )
+    ).add_cte(gone)
+
+
+async def refresh_contributor_totals(
+    db: Union[AsyncSession, AsyncConnection],
+    logins: Union[Iterable[str], Select],
+    excluding_project: Optional[UUID] = None
+) -> None:
+    """
+    Bring the rollup up to date for logins whose project_contributors rows changed.
+    Called by writers right before they commit. The rows are locked first and recomputed
+    by a later statement, whose READ COMMITTED snapshot then includes every transaction
+    that held them before: recomputing from the snapshot the write started with would let
+    two writers of one login each overwrite the other's change.
+    """
+    if not isinstance(logins, Select):
+        logins = sorted(set(logins))
+        if not logins:
+            return
+    for statement in lock_statements(logins):
+        await db.execute(statement)
+    await db.execute(totals_statement(logins, excluding_project))
+
+
+class ContributorService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_leaderboard(self, order: str = "commits_desc", limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+        """Contributors ranked over the window, read from the rollup"""
+        if order not in LEADERBOARD_ORDERS:
+            raise ValueError(f"Unsupported order: {order}")
+
+        result = await self.db.scalars(
+            select(ContributorTotal).where(
+                ContributorTotal.repositories > 0
+            ).order_by(*LEADERBOARD_ORDERS[order]).limit(limit).offset(offset)
+        )
+        return {"contributors": result.all(), "limit": limit, "offset": offset}
+
+    async def get_contributor(self, login: str) -> Optional[Dict[str, Any]]:
+        """The repositories a login is active in, most commits first; None when it is active nowhere"""
+        rows = (await self.db.execute(
+            select(
+                Project.id,
+                Project.owner,
+                Project.name,
+                Project.html_url,
+                ProjectContributor.commits_90d,
+                ProjectContributor.last_commit_at
+            ).join(
+                Project, Project.id == ProjectContributor.project_id
+            ).where(
+                ProjectContributor.login == login
+            ).order_by(
+                ProjectContributor.commits_90d.desc(), Project.id
+            )
+        )).all()
+        if not rows:
+            return None
+
+        # Totals come from these rows rather than the rollup, so they always match the list
+        last_commits = [row.last_commit_at for row in rows if row.last_commit_at]
+        return {
+            "login": login,
+            "repositories": len(rows),
+            "commits": sum(row.commits_90d for row in rows),
+            "last_commit_at": max(last_commits) if last_commits else None,
+            "projects": [
+                {
+                    "id": row.id,
+                    "owner": row.owner,
+                    "name": row.name,
+                    "html_url": row.html_url,
+                    "commits": row.commits_90d,
+                    "last_commit_at": row.last_commit_at
+                }
+                for row in rows
+            ]
+        }
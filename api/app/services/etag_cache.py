@@ -0,0 +1,94 @@
+from collections import OrderedDict
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.sql import func
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from ..models.github_response import GitHubResponseCache
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: Any
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Validators to send so GitHub can answer 304 Not Modified"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ETagCache:
+    """
+    Validators and bodies of GitHub REST responses, keyed by (token scope, URL).
+    Entries live in github_response_cache so they survive restarts and are shared by
+    every API and worker process; the most recently used are also kept in memory.
+    The cache only ever saves GitHub calls, so database errors are logged and treated
+    as a miss rather than failing the request.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker = AsyncSessionLocal, max_memory_entries: Optional[int] = None):
+        self.session_factory = session_factory
+        self.max_memory_entries = (
+            settings.github_etag_cache_memory_entries if max_memory_entries is None else max_memory_entries
+        )
+        self._memory: "OrderedDict[Tuple[str, str], CachedResponse]" = OrderedDict()
+
+    def _remember(self, key: Tuple[str, str], cached: CachedResponse) -> None:
+        self._memory[key] = cached
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    async def get(self, scope: str, url: str) -> Optional[CachedResponse]:
+        key = (scope, url)
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        try:
+            async with self.session_factory() as db:
+                row = (await db.execute(
+                    select(GitHubResponseCache.etag, GitHubResponseCache.last_modified, GitHubResponseCache.body)
+                    .where(GitHubResponseCache.scope == scope, GitHubResponseCache.url == url)
+                )).first()
+        except Exception as e:
+            logger.warning(f"Reading cached GitHub response for {url} failed: {e}")
+            return None
+
+        if row is None:
+            return None
+        cached = CachedResponse(*row)
+        self._remember(key, cached)
+        return cached
+
+    async def set(self, scope: str, url: str, cached: CachedResponse) -> None:
+        if not cached.etag and not cached.last_modified:
+            # Nothing to revalidate with
+            return
+
+        self._remember((scope, url), cached)
+        values = dict(etag=cached.etag, last_modified=cached.last_modified, body=cached.body)
+        statement = insert(GitHubResponseCache).values(scope=scope, url=url, **values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[GitHubResponseCache.scope, GitHubResponseCache.url],
+            set_=dict(values, updated_at=func.now())
+        )
+        try:
+            async with self.session_factory() as db:
+                await db.execute(statement)
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Caching GitHub response for {url} failed: {e}")
+
+    def clear(self) -> None:
+        self._memory.clear()
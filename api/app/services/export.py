@@ -0,0 +1,116 @@
+from sqlalchemy import Select, Text, cast, func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from typing import Any, AsyncIterator
+import asyncio
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from ..models.project import Project, ProjectContributor
+from .project_service import apply_filters
+import logging
+
+logger = logging.getLogger(__name__)
+
+EXPORT_COLUMNS = (
+    Project.id,
+    Project.owner,
+    Project.name,
+    Project.html_url,
+    Project.default_branch,
+    Project.visibility,
+    Project.last_commit_at,
+    Project.last_actor,
+    Project.active_contributors_90d,
+    Project.install_status,
+    Project.created_at,
+    Project.updated_at,
+)
+
+
+def _contributors():
+    """A project's contributors as a JSON array, most commits first"""
+    return select(func.coalesce(
+        func.json_agg(aggregate_order_by(
+            func.json_build_object(
+                "login", ProjectContributor.login,
+                "commits", ProjectContributor.commits_90d,
+                "last_commit_at", ProjectContributor.last_commit_at
+            ),
+            ProjectContributor.commits_90d.desc()
+        )),
+        literal_column("'[]'::json")
+    )).where(
+        ProjectContributor.project_id == Project.id
+    ).scalar_subquery()
+
+
+def ndjson_query(include_contributors: bool = False, **filters: Any) -> Select:
+    """One JSON document per project, rendered by Postgres so rows are never built in Python"""
+    fields = []
+    for column in EXPORT_COLUMNS:
+        fields += [column.key, column]
+    if include_contributors:
+        fields += ["contributors", _contributors()]
+    query = select(cast(func.json_build_object(*fields), Text))
+    return apply_filters(query, **filters).order_by(Project.id)
+
+
+def csv_query(include_contributors: bool = False, **filters: Any) -> Select:
+    """Project columns for COPY; contributors, when included, are one JSON array cell"""
+    columns = list(EXPORT_COLUMNS)
+    if include_contributors:
+        columns.append(_contributors().label("contributors"))
+    return apply_filters(select(*columns), **filters).order_by(Project.id)
+
+
+class ProjectExporter:
+    """
+    Streams every project matching the list filters, in constant memory.
+    NDJSON is read through a server-side cursor, EXPORT_FETCH_SIZE rows at a time; CSV is
+    produced by Postgres itself with COPY ... TO STDOUT. Both run on their own session,
+    since the response body is sent after the request's session has been released.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker = AsyncSessionLocal):
+        self.session_factory = session_factory
+
+    async def ndjson(self, include_contributors: bool = False, **filters: Any) -> AsyncIterator[bytes]:
+        query = ndjson_query(include_contributors, **filters)
+        async with self.session_factory() as db:
+            result = await db.stream(query.execution_options(yield_per=settings.export_fetch_size))
+            async for lines in result.scalars().partitions():
+                yield "".join(f"{line}\n" for line in lines).encode()
+
+    async def csv(self, include_contributors: bool = False, **filters: Any) -> AsyncIterator[bytes]:
+        # COPY pushes chunks as fast as Postgres produces them; the bounded queue makes it
+        # wait for the client instead of buffering the whole export
+        chunks: asyncio.Queue = asyncio.Queue(maxsize=settings.export_max_buffered_chunks)
+        copy = asyncio.create_task(self._copy(csv_query(include_contributors, **filters), chunks))
+        try:
+            while (chunk := await chunks.get()) is not None:
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+        finally:
+            # A client that went away stops the COPY rather than leaving it blocked
+            copy.cancel()
+            await asyncio.gather(copy, return_exceptions=True)
+
+    async def _copy(self, query: Select, chunks: asyncio.Queue) -> None:
+        try:
+            async with self.session_factory() as db:
+                connection = await db.connection()
+                compiled = query.compile(dialect=connection.dialect)
+                raw = await connection.get_raw_connection()
+                await raw.driver_connection.copy_from_query(
+                    str(compiled),
+                    *[compiled.params[name] for name in compiled.positiontup],
+                    output=chunks.put,
+                    format="csv",
+                    header=True
+                )
+        except Exception as e:
+            logger.error(f"Project export failed: {e}")
+            await chunks.put(e)
+            return
+        await chunks.put(None)
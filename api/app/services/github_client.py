@@ -1,24 +1,171 @@
+import asyncio
 import httpx
 import jwt
 import time
 import re
-from typing import Optional, Dict, Any, List, Tuple
-from datetime import datetime, timedelta
+from typing import Optional, Callable, Dict, Any, List, Tuple, AsyncIterator
+from datetime import date, datetime, timedelta, timezone
 from ..core.config import settings
+from .etag_cache import CachedResponse, ETagCache
+from .rate_limit import RateLimitExceeded, RateLimitGovernor
+from .token_cache import CachedToken, TokenCache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Re-sign the App JWT this long before its 10 minute lifetime runs out
+JWT_REFRESH_MARGIN_SECONDS = 60
+
+# Fields fetched for every repository, shared by single and aliased batch queries
+REPOSITORY_FIELDS_FRAGMENT = """
+fragment RepoFields on Repository {
+  nameWithOwner
+  isPrivate
+  url
+  defaultBranchRef {
+    name
+    target {
+      ... on Commit {
+        oid
+        committedDate
+      }
+    }
+  }
+  pullRequests(states: OPEN, first: 1, orderBy: {field: UPDATED_AT, direction: DESC}) {
+    totalCount
+    nodes {
+      number
+      updatedAt
+      author {
+        login
+      }
+    }
+  }
+  oldestPullRequests: pullRequests(states: OPEN, first: 1, orderBy: {field: CREATED_AT, direction: ASC}) {
+    nodes {
+      createdAt
+    }
+  }
+}
+"""
+
+# One page of default-branch history; selected per repository because `since` differs
+HISTORY_PAGE_FRAGMENT = """
+fragment HistoryPage on CommitHistoryConnection {
+  nodes {
+    oid
+    committedDate
+    author {
+      user {
+        login
+      }
+      email
+      name
+    }
+  }
+  pageInfo {
+    hasNextPage
+    endCursor
+  }
+}
+"""
+
+# Selected alongside every query so the rate-limit governor learns each query's real cost
+RATE_LIMIT_FRAGMENT = """
+fragment RateLimitFields on RateLimit {
+  cost
+  remaining
+  resetAt
+  limit
+}
+"""
+
+# GitHub charges one point per 100 connection requests; each repository opens three
+# (history, latest and oldest open PR)
+GRAPHQL_CONNECTIONS_PER_REPOSITORY = 3
+
+
+def contributor_window_start() -> datetime:
+    """Midnight (UTC) of the first day that still counts towards the contributor window"""
+    first_day = datetime.now(timezone.utc).date() - timedelta(days=settings.contributor_window_days)
+    return datetime.combine(first_day, datetime.min.time(), tzinfo=timezone.utc)
+
+
+def add_commit_to_days(
+    commit_days: Dict[Tuple[str, date], Dict[str, Any]],
+    login: str,
+    commit_date: datetime
+) -> None:
+    """Count one commit in its (login, UTC day) bucket"""
+    day = commit_date.astimezone(timezone.utc).date()
+    bucket = commit_days.setdefault((login, day), {
+        "login": login,
+        "day": day,
+        "commits": 0,
+        "last_commit_at": commit_date
+    })
+    bucket["commits"] += 1
+    bucket["last_commit_at"] = max(bucket["last_commit_at"], commit_date)
+
+
+def _graphql_rate_limited(body: Dict[str, Any]) -> bool:
+    return any(error.get("type") == "RATE_LIMITED" for error in body.get("errors") or [])
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Build the pooled HTTP client shared by all GitHub API calls"""
+    limits = httpx.Limits(
+        max_connections=settings.github_http_max_connections,
+        max_keepalive_connections=settings.github_http_max_keepalive_connections,
+        keepalive_expiry=settings.github_http_keepalive_expiry
+    )
+    return httpx.AsyncClient(
+        http2=settings.github_http2,
+        limits=limits,
+        timeout=httpx.Timeout(settings.github_http_timeout)
+    )
+
 
 class GitHubClient:
-    def __init__(self):
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        governor: Optional[RateLimitGovernor] = None,
+        etag_cache: Optional[ETagCache] = None
+    ):
         self.base_url = "https://api.github.com"
         self.graphql_url = "https://api.github.com/graphql"
+        self._http_client = http_client
+        self._owns_http_client = http_client is None
+        self._jwt: Optional[CachedToken] = None
+        self._installation_ids: Dict[str, int] = {}
+        self._installation_tokens = TokenCache(settings.github_token_refresh_margin_seconds)
+        self.governor = governor or RateLimitGovernor()
+        # Installation token -> its governor scope; the App's own calls use the "app" scope
+        self._token_scopes: Dict[str, str] = {}
+        self.etag_cache = etag_cache or ETagCache()
+    
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Pooled HTTP client, created lazily when none was injected"""
+        if self._http_client is None:
+            self._http_client = create_http_client()
+        return self._http_client
+    
+    async def aclose(self) -> None:
+        """Close the HTTP client if this instance created it"""
+        if self._owns_http_client and self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
         
     def _generate_jwt_token(self) -> Optional[str]:
-        """Generate JWT token for GitHub App authentication"""
+        """Generate JWT token for GitHub App authentication, reusing it until near expiry"""
         if not settings.github_app_id or not settings.github_app_private_key:
             return None
+        
+        # RS256 signing is comparatively expensive; a JWT is good for 10 minutes
+        if self._jwt and self._jwt.is_fresh(timedelta(seconds=JWT_REFRESH_MARGIN_SECONDS)):
+            return self._jwt.token
             
         now = int(time.time())
         payload = {
@@ -28,56 +175,162 @@ class GitHubClient:
         }
         
         try:
-            return jwt.encode(payload, settings.github_app_private_key, algorithm='RS256')
+            token = jwt.encode(payload, settings.github_app_private_key, algorithm='RS256')
         except Exception as e:
             logger.error(f"Failed to generate JWT token: {e}")
             return None
+        
+        self._jwt = CachedToken(token, datetime.fromtimestamp(payload['exp'], tz=timezone.utc))
+        return token
+    
+    def _app_headers(self, jwt_token: str) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {jwt_token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+    
+    async def _get_installation_id(self, owner: str, repo: str) -> Optional[int]:
+        """Resolve the App installation covering an owner, remembering it per owner"""
+        installation_id = self._installation_ids.get(owner)
+        if installation_id is not None:
+            return installation_id
+        
+        jwt_token = self._generate_jwt_token()
+        if not jwt_token:
+            return None
+        
+        response = await self._send(
+            "GET",
+            f"{self.base_url}/repos/{owner}/{repo}/installation",
+            "app",
+            headers=self._app_headers(jwt_token)
+        )
+        
+        if response.status_code != 200:
+            logger.warning(f"No installation found for {owner}/{repo}: {response.status_code}")
+            return None
+        
+        installation_id = response.json()["id"]
+        self._installation_ids[owner] = installation_id
+        return installation_id
+    
+    async def _create_installation_token(self, installation_id: int) -> Optional[CachedToken]:
+        """Exchange the App JWT for a new installation access token"""
+        jwt_token = self._generate_jwt_token()
+        if not jwt_token:
+            return None
+        
+        response = await self._send(
+            "POST",
+            f"{self.base_url}/app/installations/{installation_id}/access_tokens",
+            "app",
+            headers=self._app_headers(jwt_token)
+        )
+        
+        if response.status_code != 201:
+            logger.error(f"Failed to get installation token: {response.status_code}")
+            if response.status_code == 404:
+                # Installation was removed; forget it so the owner is looked up again
+                self._forget_installation(installation_id)
+            return None
+        
+        data = response.json()
+        expires_at = datetime.fromisoformat(data["expires_at"].replace('Z', '+00:00'))
+        
+        # Installation tokens share their installation's quota, so they share its budget
+        scope = f"installation:{installation_id}"
+        self._token_scopes = {token: s for token, s in self._token_scopes.items() if s != scope}
+        self._token_scopes[data["token"]] = scope
+        return CachedToken(data["token"], expires_at)
+    
+    def _forget_installation(self, installation_id: int) -> None:
+        self._installation_tokens.invalidate(installation_id)
+        for owner, cached_id in list(self._installation_ids.items()):
+            if cached_id == installation_id:
+                del self._installation_ids[owner]
     
     async def _get_installation_token(self, owner: str, repo: str) -> Optional[str]:
         """Get installation access token for a specific repository"""
+        try:
+            installation_id = await self._get_installation_id(owner, repo)
+            if installation_id is None:
+                return None
+            
+            return await self._installation_tokens.get_or_refresh(
+                installation_id,
+                lambda: self._create_installation_token(installation_id)
+            )
+                
+        except RateLimitExceeded:
+            # A throttled lookup is not a missing installation: callers back off and retry
+            raise
+        except Exception as e:
+            logger.error(f"Error getting installation token: {e}")
+            return None
+    
+    async def _get_owner_installation_id(self, owner: str) -> Optional[int]:
+        """Resolve the App installation on an organization or user account, without naming a repository"""
+        installation_id = self._installation_ids.get(owner)
+        if installation_id is not None:
+            return installation_id
+        
         jwt_token = self._generate_jwt_token()
         if not jwt_token:
             return None
-            
+        
+        for kind in ("orgs", "users"):
+            response = await self._send(
+                "GET",
+                f"{self.base_url}/{kind}/{owner}/installation",
+                "app",
+                headers=self._app_headers(jwt_token)
+            )
+            if response.status_code == 200:
+                installation_id = response.json()["id"]
+                self._installation_ids[owner] = installation_id
+                return installation_id
+        
+        logger.warning(f"No installation found for {owner}: {response.status_code}")
+        return None
+    
+    async def list_owner_repositories(self, owner: str) -> List[str]:
+        """URLs of every repository of `owner` the App installation can read"""
+        self._check_allowed_owner(owner)
+        
+        installation_id = await self._get_owner_installation_id(owner)
+        token = None
+        if installation_id is not None:
+            token = await self._installation_tokens.get_or_refresh(
+                installation_id,
+                lambda: self._create_installation_token(installation_id)
+            )
+        if not token:
+            install_url = f"https://github.com/apps/your-app-name/installations/new/permissions?target_id={owner}"
+            raise Exception(f"No access token available. Install the GitHub App: {install_url}")
+        
         headers = {
-            "Authorization": f"Bearer {jwt_token}",
+            "Authorization": f"Bearer {token}",
             "Accept": "application/vnd.github.v3+json"
         }
+        repo_urls = []
+        url: Optional[str] = f"{self.base_url}/installation/repositories?per_page=100"
+        while url:
+            response = await self._send("GET", url, self._scope(token), headers=headers)
+            if response.status_code != 200:
+                raise Exception(f"Failed to list repositories of {owner}: {response.status_code}")
+            
+            for repository in response.json()["repositories"]:
+                # A user installation may also cover repositories the user does not own
+                if repository["owner"]["login"].lower() == owner.lower():
+                    repo_urls.append(repository["html_url"])
+            url = response.links.get("next", {}).get("url")
         
-        async with httpx.AsyncClient() as client:
-            try:
-                # Get installation for the repository
-                response = await client.get(
-                    f"{self.base_url}/repos/{owner}/{repo}/installation",
-                    headers=headers
-                )
-                
-                if response.status_code != 200:
-                    logger.warning(f"No installation found for {owner}/{repo}: {response.status_code}")
-                    return None
-                
-                installation_id = response.json()["id"]
-                
-                # Get access token for the installation
-                response = await client.post(
-                    f"{self.base_url}/app/installations/{installation_id}/access_tokens",
-                    headers=headers
-                )
-                
-                if response.status_code == 201:
-                    return response.json()["token"]
-                else:
-                    logger.error(f"Failed to get installation token: {response.status_code}")
-                    return None
-                    
-            except Exception as e:
-                logger.error(f"Error getting installation token: {e}")
-                return None
+        return repo_urls
     
     def _parse_github_url(self, repo_url: str) -> Tuple[str, str]:
         """Parse GitHub URL to extract owner and repo name"""
         # Remove trailing slash and .git if present
-        url = repo_url.rstrip('/').rstrip('.git')
+        url = repo_url.rstrip('/').removesuffix('.git')
         
         # Extract owner and repo from URL
         match = re.match(r'https://github\.com/([^/]+)/([^/]+)', url)
@@ -104,50 +357,128 @@ class GitHubClient:
         
         return None, 'none'
     
+    def _scope(self, token: str) -> str:
+        return self._token_scopes.get(token, "token")
+    
+    def rate_limit_fraction(self) -> float:
+        """Lowest share of quota left across the scopes seen so far; 1.0 when nothing is known"""
+        return self.governor.quota_fraction()
+    
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        scope: str,
+        resource: str = "core",
+        throttled: Optional[Callable[[httpx.Response], bool]] = None,
+        **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Make a GitHub API call through the rate-limit governor, retrying when it was throttled.
+        `throttled` recognises limits the status code does not show; this is the only retry loop.
+        """
+        for _ in range(settings.github_rate_limit_max_retries + 1):
+            async with self.governor.slot(scope, resource):
+                response = await self.http.request(method, url, **kwargs)
+            if not self.governor.observe(scope, resource, response) and not (throttled and throttled(response)):
+                break
+        return response
+    
+    async def _conditional_get(
+        self,
+        url: str,
+        scope: str,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, Any]:
+        """
+        GET a REST resource, revalidating the cached copy with If-None-Match/If-Modified-Since.
+        A 304 costs no rate-limit points and is returned as (200, cached body); any other
+        non-200 status comes back with a body of None.
+        """
+        if not settings.github_etag_cache_enabled:
+            response = await self._send("GET", url, scope, headers=headers, params=params)
+            return response.status_code, response.json() if response.status_code == 200 else None
+        
+        key = str(httpx.URL(url, params=params))
+        cached = await self.etag_cache.get(scope, key)
+        if cached:
+            headers = {**headers, **cached.conditional_headers()}
+        
+        response = await self._send("GET", url, scope, headers=headers, params=params)
+        
+        if response.status_code == 304 and cached:
+            return 200, cached.body
+        if response.status_code != 200:
+            return response.status_code, None
+        
+        body = response.json()
+        await self.etag_cache.set(scope, key, CachedResponse(
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            body
+        ))
+        return 200, body
+    
+    async def _graphql_request(self, query: str, variables: Dict[str, Any], token: str) -> Dict[str, Any]:
+        """POST a GraphQL document and return the decoded response body"""
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json"
+        }
+        
+        scope = self._scope(token)
+        
+        def rate_limited(response: httpx.Response) -> bool:
+            # An exhausted GraphQL quota still answers 200; wait for the window to reset
+            if response.status_code != 200:
+                return False
+            body = response.json()
+            rate_limit = (body.get("data") or {}).get("rateLimit")
+            if rate_limit:
+                self.governor.observe_graphql(scope, rate_limit)
+            if not _graphql_rate_limited(body):
+                return False
+            budget = self.governor.budget(scope, "graphql")
+            self.governor.pause(scope, "graphql", max(budget.reset_at, time.time() + settings.github_secondary_limit_pause_seconds))
+            return True
+        
+        response = await self._send(
+            "POST",
+            self.graphql_url,
+            scope,
+            "graphql",
+            throttled=rate_limited,
+            json={"query": query, "variables": variables},
+            headers=headers
+        )
+        if response.status_code != 200:
+            raise Exception(f"GraphQL request failed: {response.status_code}")
+        
+        body = response.json()
+        if _graphql_rate_limited(body):
+            raise RateLimitExceeded(scope, "graphql", self.governor.budget(scope, "graphql").paused_until)
+        return body
+    
     async def get_repository_activity_graphql(self, owner: str, repo: str, token: str, since: datetime) -> Dict[str, Any]:
         """Fetch repository activity using GraphQL API"""
         query = """
         query RepoActivity($owner: String!, $name: String!, $since: GitTimestamp!) {
+          rateLimit { ...RateLimitFields }
           repository(owner: $owner, name: $name) {
-            nameWithOwner
-            isPrivate
-            url
+            ...RepoFields
             defaultBranchRef {
-              name
               target {
                 ... on Commit {
-                  committedDate
                   history(since: $since, first: 100) {
-                    nodes {
-                      committedDate
-                      author {
-                        user {
-                          login
-                        }
-                        email
-                        name
-                      }
-                    }
-                    pageInfo {
-                      hasNextPage
-                      endCursor
-                    }
+                    ...HistoryPage
                   }
                 }
               }
             }
-            pullRequests(states: OPEN, first: 1, orderBy: {field: UPDATED_AT, direction: DESC}) {
-              nodes {
-                number
-                updatedAt
-                author {
-                  login
-                }
-              }
-            }
           }
         }
-        """
+        """ + REPOSITORY_FIELDS_FRAGMENT + HISTORY_PAGE_FRAGMENT + RATE_LIMIT_FRAGMENT
         
         variables = {
             "owner": owner,
@@ -155,26 +486,119 @@ class GitHubClient:
             "since": since.isoformat()
         }
         
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
+        data = await self._graphql_request(query, variables, token)
+        if "errors" in data:
+            raise Exception(f"GraphQL errors: {data['errors']}")
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.graphql_url,
-                json={"query": query, "variables": variables},
-                headers=headers
+        return data["data"]["repository"]
+    
+    async def get_repositories_activity_graphql(
+        self,
+        repos: List[Tuple[str, str, datetime]],
+        token: str
+    ) -> Dict[Tuple[str, str], Any]:
+        """
+        Fetch activity for several (owner, name, since) repositories in one aliased GraphQL query.
+        Returns the repository data, or the Exception for that repository, keyed by (owner, name).
+        """
+        declarations = []
+        selections = []
+        variables: Dict[str, Any] = {}
+        for i, (owner, repo, since) in enumerate(repos):
+            declarations.append(f"$owner{i}: String!, $name{i}: String!, $since{i}: GitTimestamp!")
+            selections.append(
+                f"r{i}: repository(owner: $owner{i}, name: $name{i}) {{ ...RepoFields "
+                f"defaultBranchRef {{ target {{ ... on Commit {{ "
+                f"history(since: $since{i}, first: 100) {{ ...HistoryPage }} }} }} }} }}"
             )
+            variables[f"owner{i}"] = owner
+            variables[f"name{i}"] = repo
+            variables[f"since{i}"] = since.isoformat()
+        
+        query = (
+            f"query RepoActivityBatch({', '.join(declarations)}) {{\n"
+            + "rateLimit { ...RateLimitFields }\n"
+            + "\n".join(selections)
+            + "\n}\n"
+            + REPOSITORY_FIELDS_FRAGMENT
+            + HISTORY_PAGE_FRAGMENT
+            + RATE_LIMIT_FRAGMENT
+        )
+        
+        data = await self._graphql_request(query, variables, token)
+        
+        # Errors carry the alias as the first path element; anything else failed the whole query
+        errors_by_alias: Dict[Optional[str], List[Any]] = {}
+        for error in data.get("errors", []):
+            path = error.get("path") or [None]
+            errors_by_alias.setdefault(path[0], []).append(error)
+        if None in errors_by_alias:
+            raise Exception(f"GraphQL errors: {errors_by_alias[None]}")
+        
+        repositories = data.get("data") or {}
+        results: Dict[Tuple[str, str], Any] = {}
+        for i, (owner, repo, _) in enumerate(repos):
+            alias = f"r{i}"
+            if repositories.get(alias) is None:
+                results[(owner, repo)] = Exception(f"GraphQL errors: {errors_by_alias.get(alias, 'repository not found')}")
+            else:
+                results[(owner, repo)] = repositories[alias]
+        
+        return results
+    
+    async def iter_commit_history(
+        self,
+        owner: str,
+        repo: str,
+        token: str,
+        since: datetime,
+        after: Optional[str] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream default-branch commits since `since`, one page of nodes at a time,
+        following pageInfo.endCursor from `after` until history is exhausted.
+        """
+        query = """
+        query CommitHistory($owner: String!, $name: String!, $since: GitTimestamp!, $after: String) {
+          rateLimit { ...RateLimitFields }
+          repository(owner: $owner, name: $name) {
+            defaultBranchRef {
+              target {
+                ... on Commit {
+                  history(since: $since, first: 100, after: $after) {
+                    ...HistoryPage
+                  }
+                }
+              }
+            }
+          }
+        }
+        """ + HISTORY_PAGE_FRAGMENT + RATE_LIMIT_FRAGMENT
+        
+        for _ in range(settings.github_history_max_pages):
+            variables = {
+                "owner": owner,
+                "name": repo,
+                "since": since.isoformat(),
+                "after": after
+            }
             
-            if response.status_code != 200:
-                raise Exception(f"GraphQL request failed: {response.status_code}")
-            
-            data = response.json()
+            data = await self._graphql_request(query, variables, token)
             if "errors" in data:
                 raise Exception(f"GraphQL errors: {data['errors']}")
             
-            return data["data"]["repository"]
+            repository = data["data"]["repository"] or {}
+            target = (repository.get("defaultBranchRef") or {}).get("target") or {}
+            history = target.get("history") or {}
+            
+            yield history.get("nodes", [])
+            
+            page_info = history.get("pageInfo") or {}
+            if not page_info.get("hasNextPage"):
+                return
+            after = page_info["endCursor"]
+        
+        logger.warning(f"Stopped paginating {owner}/{repo} history after {settings.github_history_max_pages} pages")
     
     async def get_repository_basic_info(self, owner: str, repo: str, token: str) -> Dict[str, Any]:
         """Fallback REST API call to get basic repository information"""
@@ -183,139 +607,284 @@ class GitHubClient:
             "Accept": "application/vnd.github.v3+json"
         }
         
-        async with httpx.AsyncClient() as client:
-            # Get repository info
-            response = await client.get(
-                f"{self.base_url}/repos/{owner}/{repo}",
-                headers=headers
-            )
-            
-            if response.status_code != 200:
-                raise Exception(f"Failed to fetch repository: {response.status_code}")
-            
-            repo_data = response.json()
-            
-            # Get latest commit from default branch
-            default_branch = repo_data["default_branch"]
-            commits_response = await client.get(
-                f"{self.base_url}/repos/{owner}/{repo}/commits",
-                headers=headers,
-                params={"sha": default_branch, "per_page": 1}
-            )
-            
-            latest_commit = None
-            if commits_response.status_code == 200:
-                commits = commits_response.json()
-                if commits:
-                    latest_commit = commits[0]
-            
-            return {
-                "nameWithOwner": repo_data["full_name"],
-                "isPrivate": repo_data["private"],
-                "url": repo_data["html_url"],
-                "defaultBranchRef": {
-                    "name": default_branch
-                },
-                "latestCommit": latest_commit
-            }
-    
-    async def fetch_repository_data(self, repo_url: str) -> Dict[str, Any]:
-        """Main method to fetch repository data with token resolution"""
-        owner, repo = self._parse_github_url(repo_url)
+        # Get repository info
+        scope = self._scope(token)
+        status_code, repo_data = await self._conditional_get(
+            f"{self.base_url}/repos/{owner}/{repo}",
+            scope,
+            headers
+        )
         
-        # Check if organization is allowed
+        if status_code != 200:
+            raise Exception(f"Failed to fetch repository: {status_code}")
+        
+        # Get latest commit from default branch
+        default_branch = repo_data["default_branch"]
+        status_code, commits = await self._conditional_get(
+            f"{self.base_url}/repos/{owner}/{repo}/commits",
+            scope,
+            headers,
+            params={"sha": default_branch, "per_page": 1}
+        )
+        
+        latest_commit = None
+        if status_code == 200 and commits:
+            latest_commit = commits[0]
+        
+        return {
+            "nameWithOwner": repo_data["full_name"],
+            "isPrivate": repo_data["private"],
+            "url": repo_data["html_url"],
+            "defaultBranchRef": {
+                "name": default_branch
+            },
+            "latestCommit": latest_commit
+        }
+    
+    def _check_allowed_owner(self, owner: str) -> None:
+        """Check if organization is allowed"""
         if settings.allowed_orgs_list and owner not in settings.allowed_orgs_list:
             raise Exception(f"Organization '{owner}' is not in the allowed list")
-        
+    
+    async def _require_token(self, owner: str, repo: str) -> Tuple[str, str]:
         token, install_status = await self.resolve_token(owner, repo)
         
         if not token:
             install_url = f"https://github.com/apps/your-app-name/installations/new/permissions?target_id={owner}"
             raise Exception(f"No access token available. Install the GitHub App: {install_url}")
         
-        try:
-            # Try GraphQL first for comprehensive data
-            since = datetime.now() - timedelta(days=settings.contributor_window_days)
-            repo_data = await self.get_repository_activity_graphql(owner, repo, token, since)
+        return token, install_status
+    
+    def _graphql_chunk_size(self) -> int:
+        """Most repositories one aliased query may hold while staying within the cost budget"""
+        by_cost = settings.github_graphql_max_query_cost * 100 // GRAPHQL_CONNECTIONS_PER_REPOSITORY
+        return max(1, min(settings.github_graphql_batch_size, by_cost))
+    
+    def _accumulate_commits(
+        self,
+        contributors: Dict[str, Dict[str, Any]],
+        commit_days: Dict[Tuple[str, date], Dict[str, Any]],
+        nodes: List[Dict[str, Any]],
+        after_oid: Optional[str] = None
+    ) -> bool:
+        """
+        Fold a page of history nodes into per-login and per-login-per-day commit counts.
+        History is newest-first and `since` is inclusive, so the watermark commit and any
+        older ones sharing its timestamp come back again: everything from `after_oid` on
+        was already counted. Returns True once it is reached, so no further page is read.
+        """
+        for commit in nodes:
+            if after_oid and commit.get("oid") == after_oid:
+                return True
             
-            # Process contributor data
-            contributors = {}
-            if repo_data.get("defaultBranchRef") and repo_data["defaultBranchRef"].get("target"):
-                history = repo_data["defaultBranchRef"]["target"].get("history", {})
-                for commit in history.get("nodes", []):
-                    author = commit.get("author", {})
-                    user = author.get("user")
-                    login = user.get("login") if user else author.get("email", "unknown")
-                    
-                    if login not in contributors:
-                        contributors[login] = {
-                            "login": login,
-                            "commits": 0,
-                            "last_commit_at": None
-                        }
-                    
-                    contributors[login]["commits"] += 1
-                    commit_date = datetime.fromisoformat(commit["committedDate"].replace('Z', '+00:00'))
-                    if not contributors[login]["last_commit_at"] or commit_date > contributors[login]["last_commit_at"]:
-                        contributors[login]["last_commit_at"] = commit_date
+            author = commit.get("author", {})
+            user = author.get("user")
+            login = user.get("login") if user else author.get("email", "unknown")
             
-            # Get last open PR
-            last_open_pr = None
-            if repo_data.get("pullRequests", {}).get("nodes"):
-                pr = repo_data["pullRequests"]["nodes"][0]
-                last_open_pr = {
-                    "number": pr["number"],
-                    "updated_at": datetime.fromisoformat(pr["updatedAt"].replace('Z', '+00:00')),
-                    "author": pr["author"]["login"] if pr["author"] else "unknown"
+            if login not in contributors:
+                contributors[login] = {
+                    "login": login,
+                    "commits": 0,
+                    "last_commit_at": None
                 }
             
-            # Get last commit info
-            last_commit_at = None
-            last_actor = None
-            if repo_data.get("defaultBranchRef") and repo_data["defaultBranchRef"].get("target"):
-                target = repo_data["defaultBranchRef"]["target"]
-                last_commit_at = datetime.fromisoformat(target["committedDate"].replace('Z', '+00:00'))
-                history = target.get("history", {})
-                if history.get("nodes"):
-                    latest_commit = history["nodes"][0]
-                    author = latest_commit.get("author", {})
-                    user = author.get("user")
-                    last_actor = user.get("login") if user else author.get("email", "unknown")
+            contributors[login]["commits"] += 1
+            commit_date = datetime.fromisoformat(commit["committedDate"].replace('Z', '+00:00'))
+            if not contributors[login]["last_commit_at"] or commit_date > contributors[login]["last_commit_at"]:
+                contributors[login]["last_commit_at"] = commit_date
             
-            return {
-                "owner": owner,
-                "name": repo,
-                "html_url": repo_data["url"],
-                "default_branch": repo_data.get("defaultBranchRef", {}).get("name"),
-                "visibility": "private" if repo_data["isPrivate"] else "public",
-                "last_commit_at": last_commit_at,
-                "last_actor": last_actor,
-                "install_status": install_status,
-                "contributors": list(contributors.values()),
-                "last_open_pr": last_open_pr
+            add_commit_to_days(commit_days, login, commit_date)
+        return False
+    
+    async def _build_repository_data(
+        self,
+        owner: str,
+        repo: str,
+        token: str,
+        since: datetime,
+        repo_data: Dict[str, Any],
+        install_status: str,
+        after_oid: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Flatten a GraphQL repository result into the shape ProjectService stores, paging the rest of history"""
+        target = (repo_data.get("defaultBranchRef") or {}).get("target") or {}
+        history = target.get("history") or {}
+        
+        # Process contributor data
+        contributors: Dict[str, Dict[str, Any]] = {}
+        commit_days: Dict[Tuple[str, date], Dict[str, Any]] = {}
+        reached_watermark = self._accumulate_commits(contributors, commit_days, history.get("nodes", []), after_oid)
+        
+        page_info = history.get("pageInfo") or {}
+        if page_info.get("hasNextPage") and not reached_watermark:
+            async for nodes in self.iter_commit_history(owner, repo, token, since, after=page_info["endCursor"]):
+                if self._accumulate_commits(contributors, commit_days, nodes, after_oid):
+                    break
+        
+        # Get last open PR
+        last_open_pr = None
+        if repo_data.get("pullRequests", {}).get("nodes"):
+            pr = repo_data["pullRequests"]["nodes"][0]
+            last_open_pr = {
+                "number": pr["number"],
+                "updated_at": datetime.fromisoformat(pr["updatedAt"].replace('Z', '+00:00')),
+                "author": pr["author"]["login"] if pr["author"] else "unknown"
             }
+        
+        oldest_open_pr_at = None
+        if (repo_data.get("oldestPullRequests") or {}).get("nodes"):
+            created_at = repo_data["oldestPullRequests"]["nodes"][0]["createdAt"]
+            oldest_open_pr_at = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+        
+        # Get last commit info
+        last_commit_at = None
+        last_actor = None
+        if target:
+            last_commit_at = datetime.fromisoformat(target["committedDate"].replace('Z', '+00:00'))
+            if history.get("nodes"):
+                latest_commit = history["nodes"][0]
+                author = latest_commit.get("author", {})
+                user = author.get("user")
+                last_actor = user.get("login") if user else author.get("email", "unknown")
+        
+        return {
+            "owner": owner,
+            "name": repo,
+            "html_url": repo_data["url"],
+            "default_branch": (repo_data.get("defaultBranchRef") or {}).get("name"),
+            "visibility": "private" if repo_data["isPrivate"] else "public",
+            "last_commit_at": last_commit_at,
+            "last_actor": last_actor,
+            "install_status": install_status,
+            "contributors": list(contributors.values()),
+            "commit_days": list(commit_days.values()),
+            "last_open_pr": last_open_pr,
+            "open_pr_count": (repo_data.get("pullRequests") or {}).get("totalCount", 0),
+            "oldest_open_pr_at": oldest_open_pr_at,
+            "head_oid": target.get("oid")
+        }
+    
+    async def _fetch_repository_data_rest(self, owner: str, repo: str, token: str, install_status: str) -> Dict[str, Any]:
+        """Fallback to REST API"""
+        repo_data = await self.get_repository_basic_info(owner, repo, token)
+        
+        last_commit_at = None
+        last_actor = None
+        if repo_data.get("latestCommit"):
+            commit = repo_data["latestCommit"]
+            last_commit_at = datetime.fromisoformat(commit["commit"]["committer"]["date"].replace('Z', '+00:00'))
+            last_actor = (commit.get("author") or {}).get("login", "unknown")
+        
+        return {
+            "owner": owner,
+            "name": repo,
+            "html_url": repo_data["url"],
+            "default_branch": repo_data.get("defaultBranchRef", {}).get("name"),
+            "visibility": "private" if repo_data["isPrivate"] else "public",
+            "last_commit_at": last_commit_at,
+            "last_actor": last_actor,
+            "install_status": install_status,
+            "contributors": [],  # Limited data in REST fallback
+            "commit_days": [],
+            "last_open_pr": None,
+            "open_pr_count": None,  # Unknown; the stored PR snapshot is kept
+            "oldest_open_pr_at": None,
+            "head_oid": None  # No history was read, so there is no new watermark
+        }
+    
+    async def fetch_repository_data(
+        self,
+        repo_url: str,
+        since: Optional[datetime] = None,
+        after_oid: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Main method to fetch repository data with token resolution.
+        Pass a stored watermark as `since`/`after_oid` to only read commits made after it.
+        """
+        owner, repo = self._parse_github_url(repo_url)
+        self._check_allowed_owner(owner)
+        token, install_status = await self._require_token(owner, repo)
+        since = since or contributor_window_start()
+        
+        try:
+            # Try GraphQL first for comprehensive data
+            repo_data = await self.get_repository_activity_graphql(owner, repo, token, since)
+            return await self._build_repository_data(owner, repo, token, since, repo_data, install_status, after_oid)
             
+        except RateLimitExceeded:
+            # REST shares the installation's quota; falling back would only spend more of it
+            raise
         except Exception as e:
             logger.warning(f"GraphQL failed, falling back to REST API: {e}")
-            # Fallback to REST API
-            repo_data = await self.get_repository_basic_info(owner, repo, token)
-            
-            last_commit_at = None
-            last_actor = None
-            if repo_data.get("latestCommit"):
-                commit = repo_data["latestCommit"]
-                last_commit_at = datetime.fromisoformat(commit["commit"]["committer"]["date"].replace('Z', '+00:00'))
-                last_actor = commit.get("author", {}).get("login", "unknown")
-            
-            return {
-                "owner": owner,
-                "name": repo,
-                "html_url": repo_data["url"],
-                "default_branch": repo_data.get("defaultBranchRef", {}).get("name"),
-                "visibility": "private" if repo_data["isPrivate"] else "public",
-                "last_commit_at": last_commit_at,
-                "last_actor": last_actor,
-                "install_status": install_status,
-                "contributors": [],  # Limited data in REST fallback
-                "last_open_pr": None
-            }
\ No newline at end of file
+            return await self._fetch_repository_data_rest(owner, repo, token, install_status)
+    
+    async def fetch_many(
+        self,
+        repo_urls: List[str],
+        watermarks: Optional[Dict[str, Tuple[datetime, str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch data for many repositories, packing them into aliased GraphQL queries.
+        `watermarks` maps a repo URL to the (since, after_oid) of its last refresh.
+        Returns a dict keyed by repo URL whose values are either the dict
+        fetch_repository_data returns or the Exception raised for that repository.
+        """
+        results: Dict[str, Any] = {}
+        watermarks = watermarks or {}
+        window_start = contributor_window_start()
+        
+        # Repositories can only share a query when they share a token
+        groups: Dict[Tuple[str, str], List[Tuple[str, str, str]]] = {}
+        for repo_url in repo_urls:
+            try:
+                owner, repo = self._parse_github_url(repo_url)
+                self._check_allowed_owner(owner)
+                token, install_status = await self._require_token(owner, repo)
+            except Exception as e:
+                results[repo_url] = e
+                continue
+            groups.setdefault((token, install_status), []).append((repo_url, owner, repo))
+        
+        chunk_size = self._graphql_chunk_size()
+        semaphore = asyncio.Semaphore(settings.github_graphql_batch_concurrency)
+        
+        async def fetch_chunk(token: str, install_status: str, chunk: List[Tuple[str, str, str]]) -> None:
+            async with semaphore:
+                since_by_url = {
+                    repo_url: watermarks.get(repo_url, (window_start, None))
+                    for repo_url, _, _ in chunk
+                }
+                try:
+                    repo_data = await self.get_repositories_activity_graphql(
+                        [(owner, repo, since_by_url[repo_url][0]) for repo_url, owner, repo in chunk], token
+                    )
+                except RateLimitExceeded as e:
+                    for repo_url, _, _ in chunk:
+                        results[repo_url] = e
+                    return
+                except Exception as e:
+                    logger.warning(f"Batched GraphQL query failed, fetching {len(chunk)} repositories individually: {e}")
+                    repo_data = {}
+                
+                for repo_url, owner, repo in chunk:
+                    since, after_oid = since_by_url[repo_url]
+                    data = repo_data.get((owner, repo))
+                    try:
+                        if data is None or isinstance(data, Exception):
+                            # One bad repository should not fail the rest of the batch
+                            results[repo_url] = await self.fetch_repository_data(repo_url, since, after_oid)
+                        else:
+                            results[repo_url] = await self._build_repository_data(
+                                owner, repo, token, since, data, install_status, after_oid
+                            )
+                    except Exception as e:
+                        results[repo_url] = e
+        
+        await asyncio.gather(*[
+            fetch_chunk(token, install_status, group[i:i + chunk_size])
+            for (token, install_status), group in groups.items()
+            for i in range(0, len(group), chunk_size)
+        ])
+        
+        return results
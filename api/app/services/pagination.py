@@ -0,0 +1,90 @@
+from sqlalchemy import Select, and_, or_, tuple_
+from typing import Any, Dict, Optional, Tuple
+from datetime import datetime
+from uuid import UUID
+import base64
+import json
+from ..models.project import Project
+
+# order -> (sort column, descending). Each has a matching (column, id) index from migration 005.
+SORT_ORDERS: Dict[str, Tuple[Any, bool]] = {
+    "last_activity_at_desc": (Project.last_commit_at, True),
+    "last_activity_at_asc": (Project.last_commit_at, False),
+    "name_asc": (Project.name, False),
+    "name_desc": (Project.name, True),
+    "active_contributors_desc": (Project.active_contributors_90d, True),
+    "active_contributors_asc": (Project.active_contributors_90d, False),
+}
+DEFAULT_ORDER = "last_activity_at_desc"
+
+
+def resolve_order(order: str) -> str:
+    return order if order in SORT_ORDERS else DEFAULT_ORDER
+
+
+def apply_order(query: Select, order: str) -> Select:
+    """
+    Order by (sort key, id) so ties are broken the same way on every page.
+    NULLs keep Postgres' default placement (last ascending, first descending),
+    which lets one (key, id) index serve both directions.
+    """
+    column, descending = SORT_ORDERS[resolve_order(order)]
+    if descending:
+        return query.order_by(column.desc(), Project.id.desc())
+    return query.order_by(column.asc(), Project.id.asc())
+
+
+def encode_cursor(order: str, project: Project) -> str:
+    """Opaque cursor pointing just past `project` in the given order"""
+    column, _ = SORT_ORDERS[resolve_order(order)]
+    value = getattr(project, column.key)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([resolve_order(order), value, str(project.id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(order: str, cursor: str) -> Tuple[Any, UUID]:
+    """Return the (sort value, id) a cursor points past; ValueError if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_order, value, project_id = json.loads(base64.urlsafe_b64decode(padded))
+        project_id = UUID(project_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if cursor_order != resolve_order(order):
+        raise ValueError("Cursor was issued for a different order")
+
+    column, _ = SORT_ORDERS[cursor_order]
+    if value is not None and column is Project.last_commit_at:
+        value = datetime.fromisoformat(value)
+    return value, project_id
+
+
+def apply_cursor(query: Select, order: str, cursor: str) -> Select:
+    """Keep only rows after the cursor position, matching apply_order's NULL placement"""
+    column, descending = SORT_ORDERS[resolve_order(order)]
+    value, project_id = decode_cursor(order, cursor)
+
+    if not column.expression.nullable:
+        if descending:
+            return query.where(tuple_(column, Project.id) < tuple_(value, project_id))
+        return query.where(tuple_(column, Project.id) > tuple_(value, project_id))
+
+    if descending:
+        if value is None:
+            # NULLs come first descending: finish the NULL run, then every non-NULL row
+            return query.where(or_(
+                and_(column.is_(None), Project.id < project_id),
+                column.isnot(None)
+            ))
+        return query.where(tuple_(column, Project.id) < tuple_(value, project_id))
+
+    if value is None:
+        # NULLs come last ascending: only the rest of the NULL run is left
+        return query.where(and_(column.is_(None), Project.id > project_id))
+    return query.where(or_(
+        tuple_(column, Project.id) > tuple_(value, project_id),
+        column.is_(None)
+    ))
@@ -0,0 +1,38 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+from ..models.project import Project
+
+
+class ProjectLookup:
+    """
+    In-process owner/name -> project id map in front of the (owner, name) unique index.
+    Only hits are cached: a repository added by another process is found on its next
+    event, and ids cached for projects deleted elsewhere are dropped when they fail to resolve.
+    """
+
+    def __init__(self):
+        self._ids: Dict[Tuple[str, str], UUID] = {}
+
+    async def get_id(self, db: AsyncSession, owner: str, name: str) -> Optional[UUID]:
+        project_id = self._ids.get((owner, name))
+        if project_id is not None:
+            return project_id
+
+        project_id = await db.scalar(select(Project.id).where(Project.owner == owner, Project.name == name))
+        if project_id is not None:
+            self._ids[(owner, name)] = project_id
+        return project_id
+
+    def remember(self, owner: str, name: str, project_id: UUID) -> None:
+        self._ids[(owner, name)] = project_id
+
+    def forget(self, owner: str, name: str) -> None:
+        self._ids.pop((owner, name), None)
+
+    def clear(self) -> None:
+        self._ids.clear()
+
+
+project_lookup = ProjectLookup()
@@ -1,19 +1,80 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
-from typing import List, Optional, Dict, Any
-from datetime import datetime
-from ..models.project import Project, ProjectContributor, ProjectRefreshQueue
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from typing import List, Optional, Dict, Any, Set, Tuple
+from datetime import datetime, timezone
+from uuid import UUID
+import uuid
+from ..models.project import Project, ProjectContributor, ProjectContributorDay, ProjectPullRequestSnapshot, ProjectRefreshQueue
 from ..schemas import ProjectCreate, ProjectList, ProjectDetail, ContributorDetail, LastOpenPR
-from .github_client import GitHubClient
+from .contributor_window import ContributorWindow
+from .contributors import refresh_contributor_totals
+from .github_client import GitHubClient, contributor_window_start
+from .pagination import apply_cursor, apply_order, encode_cursor
+from .project_lookup import project_lookup
+from .pull_request_events import apply_pull_request_event, snapshot_values
+from .push_events import commit_login, commit_time, is_default_branch_push, needs_full_refresh, push_commit_days, push_head
+from .refresh_schedule import refresh_interval
+from .response_cache import response_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input only ever matches literally"""
+    return value.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+def apply_filters(
+    query,
+    q: Optional[str] = None,
+    owner: Optional[str] = None,
+    visibility: Optional[str] = None,
+    install_status: Optional[str] = None,
+    last_commit_after: Optional[datetime] = None,
+    last_commit_before: Optional[datetime] = None,
+    min_contributors: Optional[int] = None,
+    max_contributors: Optional[int] = None
+):
+    """Narrow a project query; `q` is a substring search served by the trigram indexes"""
+    if q:
+        if "/" in q:
+            # "owner/name" searches each half against its own column
+            owner_part, name_part = q.split("/", 1)
+            query = query.where(
+                Project.owner.ilike(f"%{_escape_like(owner_part)}%", escape="!"),
+                Project.name.ilike(f"%{_escape_like(name_part)}%", escape="!")
+            )
+        else:
+            pattern = f"%{_escape_like(q)}%"
+            query = query.where(or_(
+                Project.owner.ilike(pattern, escape="!"),
+                Project.name.ilike(pattern, escape="!")
+            ))
+    if owner:
+        query = query.where(Project.owner == owner)
+    if visibility:
+        query = query.where(Project.visibility == visibility)
+    if install_status:
+        query = query.where(Project.install_status == install_status)
+    if last_commit_after:
+        query = query.where(Project.last_commit_at >= last_commit_after)
+    if last_commit_before:
+        query = query.where(Project.last_commit_at < last_commit_before)
+    if min_contributors is not None:
+        query = query.where(Project.active_contributors_90d >= min_contributors)
+    if max_contributors is not None:
+        query = query.where(Project.active_contributors_90d <= max_contributors)
+    return query
+
+
 class ProjectService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, github_client: GitHubClient):
         self.db = db
-        self.github_client = GitHubClient()
+        self.github_client = github_client
+        # Logins whose contributor_totals rollup is refreshed before the next commit
+        self._touched_logins: Set[str] = set()
     
     async def create_project(self, project_data: ProjectCreate) -> Project:
         """Create a new project by fetching data from GitHub"""
@@ -21,76 +82,200 @@ class ProjectService:
         
         # Check if project already exists
         owner, repo = self.github_client._parse_github_url(repo_url)
-        existing_project = self.db.query(Project).filter(
+        existing_project = await self.db.scalar(select(Project).where(
             Project.owner == owner,
             Project.name == repo
-        ).first()
+        ))
         
         if existing_project:
             # Refresh existing project
             return await self.refresh_project(existing_project.id)
         
         # Fetch data from GitHub
+        await self._release_connection()
         github_data = await self.github_client.fetch_repository_data(repo_url)
         
         # Create project record
         project = Project(
             owner=github_data["owner"],
             name=github_data["name"],
-            html_url=github_data["html_url"],
-            default_branch=github_data["default_branch"],
-            visibility=github_data["visibility"],
-            last_commit_at=github_data["last_commit_at"],
-            last_actor=github_data["last_actor"],
-            install_status=github_data["install_status"]
+            html_url=github_data["html_url"]
         )
         
         self.db.add(project)
-        self.db.flush()  # Get the project ID
-        
-        # Add contributors
-        for contributor_data in github_data["contributors"]:
-            contributor = ProjectContributor(
-                project_id=project.id,
-                login=contributor_data["login"],
-                commits_90d=contributor_data["commits"],
-                last_commit_at=contributor_data["last_commit_at"]
-            )
-            self.db.add(contributor)
+        await self.db.flush()  # Get the project ID
+        
+        await self._apply_github_data(project, github_data)
+        await self._save_contributor_totals()
         
-        self.db.commit()
-        self.db.refresh(project)
+        await self.db.commit()
+        await self.db.refresh(project)
+        project_lookup.remember(project.owner, project.name, project.id)
+        await response_cache.invalidate(project.id)
         
         logger.info(f"Created project {project.owner}/{project.name} with {len(github_data['contributors'])} contributors")
         return project
     
-    def get_projects(self, order: str = "last_activity_at_desc", limit: int = 50, offset: int = 0) -> Dict[str, Any]:
-        """Get paginated list of projects"""
-        query = self.db.query(Project)
+    async def import_projects(self, fetched: List[Dict[str, Any]]) -> Dict[Tuple[str, str], UUID]:
+        """
+        Insert many freshly fetched repositories, their day buckets and contributor totals with
+        one multi-row INSERT ... ON CONFLICT per table, instead of a flush per project.
+        Repositories that already exist are left alone. Returns the new ids by (owner, name).
+        """
+        if not fetched:
+            return {}
         
-        # Apply ordering
-        if order == "last_activity_at_desc":
-            query = query.order_by(desc(Project.last_commit_at))
-        elif order == "last_activity_at_asc":
-            query = query.order_by(Project.last_commit_at)
-        elif order == "name_asc":
-            query = query.order_by(Project.name)
-        elif order == "name_desc":
-            query = query.order_by(desc(Project.name))
+        now = datetime.now(timezone.utc)
+        window_start = contributor_window_start().date()
+        project_rows = []
+        for data in fetched:
+            has_history = bool(data["head_oid"])
+            project_rows.append({
+                "id": uuid.uuid4(),
+                "owner": data["owner"],
+                "name": data["name"],
+                "html_url": data["html_url"],
+                "default_branch": data["default_branch"],
+                "visibility": data["visibility"],
+                "last_commit_at": data["last_commit_at"],
+                "last_actor": data["last_actor"],
+                "install_status": data["install_status"],
+                "history_watermark_oid": data["head_oid"],
+                "history_watermark_at": data["last_commit_at"] if has_history else None,
+                # REST fallback data has no history, so the window starts with the first full refresh
+                "contributor_window_start": window_start if has_history else None,
+                "next_refresh_at": now + refresh_interval(data["last_commit_at"], data["install_status"])
+            })
+        
+        stmt = insert(Project).on_conflict_do_nothing(
+            index_elements=[Project.owner, Project.name]
+        ).returning(Project.id, Project.owner, Project.name)
+        # executemany with RETURNING is sent as batched multi-row VALUES
+        result = await self.db.execute(stmt, project_rows)
+        inserted = {(owner, name): project_id for project_id, owner, name in result.all()}
+        
+        day_rows = []
+        contributor_rows = []
+        snapshot_rows = []
+        for data in fetched:
+            project_id = inserted.get((data["owner"], data["name"]))
+            if project_id is None:
+                continue
+            snapshot = snapshot_values(data)
+            if snapshot is not None:
+                snapshot_rows.append({"project_id": project_id, **snapshot})
+            if not data["head_oid"]:
+                continue
+            
+            totals: Dict[str, Dict[str, Any]] = {}
+            for bucket in data["commit_days"]:
+                if bucket["day"] < window_start:
+                    continue
+                day_rows.append({
+                    "project_id": project_id,
+                    "login": bucket["login"],
+                    "day": bucket["day"],
+                    "commits": bucket["commits"],
+                    "last_commit_at": bucket["last_commit_at"]
+                })
+                login_totals = totals.setdefault(bucket["login"], {
+                    "id": uuid.uuid4(),
+                    "project_id": project_id,
+                    "login": bucket["login"],
+                    "commits_90d": 0,
+                    "last_commit_at": bucket["last_commit_at"]
+                })
+                login_totals["commits_90d"] += bucket["commits"]
+                login_totals["last_commit_at"] = max(login_totals["last_commit_at"], bucket["last_commit_at"])
+            contributor_rows.extend(totals.values())
+        
+        if day_rows:
+            await self.db.execute(insert(ProjectContributorDay).on_conflict_do_nothing(), day_rows)
+        if contributor_rows:
+            await self.db.execute(insert(ProjectContributor).on_conflict_do_nothing(
+                index_elements=[ProjectContributor.project_id, ProjectContributor.login]
+            ), contributor_rows)
+        if snapshot_rows:
+            await self.db.execute(insert(ProjectPullRequestSnapshot).on_conflict_do_nothing(), snapshot_rows)
+        await refresh_contributor_totals(self.db, (row["login"] for row in contributor_rows))
+        
+        await self.db.commit()
+        for (owner, name), project_id in inserted.items():
+            project_lookup.remember(owner, name, project_id)
+        if inserted:
+            await response_cache.invalidate()
+        
+        logger.info(f"Imported {len(inserted)} of {len(fetched)} projects with {len(contributor_rows)} contributors")
+        return inserted
+    
+    async def delete_project(self, project_id: str) -> bool:
+        """Delete a project; contributors, buckets and queue rows go with it (ON DELETE CASCADE)"""
+        # Contributor totals without this project, while its rows still say who they are
+        await refresh_contributor_totals(
+            self.db,
+            select(ProjectContributor.login).where(ProjectContributor.project_id == project_id),
+            excluding_project=project_id
+        )
+        # Core DELETE so the database cascades instead of the ORM loading every child row
+        deleted = (await self.db.execute(
+            delete(Project).where(Project.id == project_id).returning(Project.owner, Project.name)
+        )).first()
+        await self.db.commit()
+        if not deleted:
+            return False
+        
+        owner, name = deleted
+        project_lookup.forget(owner, name)
+        await response_cache.invalidate(project_id)
+        
+        logger.info(f"Deleted project {owner}/{name}")
+        return True
+    
+    async def get_projects(
+        self,
+        order: str = "last_activity_at_desc",
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        **filters: Any
+    ) -> Dict[str, Any]:
+        """
+        Get a page of projects, optionally filtered (see apply_filters).
+        With a cursor, pages by (sort key, id) and skips the total; offset paging is kept for compatibility.
+        """
+        if cursor:
+            query = apply_cursor(select(Project, literal(None)), order, cursor)
         else:
-            query = query.order_by(desc(Project.last_commit_at))
+            query = select(
+                Project,
+                func.count().over()  # Total before LIMIT/OFFSET, in the same round trip
+            )
+        
+        query = apply_filters(query, **filters)
         
-        total = query.count()
-        projects = query.offset(offset).limit(limit).all()
+        # Apply ordering
+        query = apply_order(query, order)
+        
+        # One extra row tells us whether there is a next page
+        if not cursor:
+            query = query.offset(offset)
+        rows = (await self.db.execute(query.limit(limit + 1))).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        if cursor:
+            total = None
+        elif rows:
+            total = rows[0][1]
+        elif offset == 0:
+            total = 0
+        else:
+            # Paged past the end, so no row carried the total
+            total = await self.db.scalar(apply_filters(select(func.count(Project.id)), **filters))
         
         # Convert to response format
         project_list = []
-        for project in projects:
-            active_contributors = self.db.query(func.count(ProjectContributor.id)).filter(
-                ProjectContributor.project_id == project.id,
-                ProjectContributor.commits_90d > 0
-            ).scalar() or 0
-            
+        for project, _ in rows:
             project_data = ProjectList(
                 id=project.id,
                 owner=project.owner,
@@ -100,7 +285,7 @@ class ProjectService:
                 visibility=project.visibility,
                 last_commit_at=project.last_commit_at,
                 last_actor=project.last_actor,
-                active_contributors_90d=active_contributors,
+                active_contributors_90d=project.active_contributors_90d,
                 install_status=project.install_status,
                 created_at=project.created_at,
                 updated_at=project.updated_at
@@ -111,19 +296,25 @@ class ProjectService:
             "projects": project_list,
             "total": total,
             "limit": limit,
-            "offset": offset
+            "offset": 0 if cursor else offset,
+            "next_cursor": encode_cursor(order, rows[-1][0]) if has_more else None
         }
     
-    def get_project_detail(self, project_id: str) -> Optional[ProjectDetail]:
+    async def get_project_detail(self, project_id: str) -> Optional[ProjectDetail]:
         """Get detailed project information"""
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-        if not project:
+        row = (await self.db.execute(
+            select(Project, ProjectPullRequestSnapshot).outerjoin(
+                ProjectPullRequestSnapshot, ProjectPullRequestSnapshot.project_id == Project.id
+            ).where(Project.id == project_id)
+        )).first()
+        if not row:
             return None
+        project, pr_snapshot = row
         
         # Get contributors
-        contributors = self.db.query(ProjectContributor).filter(
+        contributors = await self.db.scalars(select(ProjectContributor).where(
             ProjectContributor.project_id == project.id
-        ).all()
+        ))
         
         contributors_90d = [
             ContributorDetail(
@@ -134,11 +325,14 @@ class ProjectService:
             for c in contributors
         ]
         
-        active_contributors = len([c for c in contributors if c.commits_90d > 0])
-        
-        # For now, we don't store last_open_pr in the database
-        # In a real implementation, you might want to cache this data
+        # PR activity as of the last refresh or pull_request webhook; no GitHub call needed
         last_open_pr = None
+        if pr_snapshot and pr_snapshot.last_open_pr_number is not None:
+            last_open_pr = LastOpenPR(
+                number=pr_snapshot.last_open_pr_number,
+                updated_at=pr_snapshot.last_open_pr_updated_at,
+                author=pr_snapshot.last_open_pr_author
+            )
         
         return ProjectDetail(
             id=project.id,
@@ -149,64 +343,273 @@ class ProjectService:
             visibility=project.visibility,
             last_commit_at=project.last_commit_at,
             last_actor=project.last_actor,
-            active_contributors_90d=active_contributors,
+            active_contributors_90d=project.active_contributors_90d,
             install_status=project.install_status,
             created_at=project.created_at,
             updated_at=project.updated_at,
             contributors_90d=contributors_90d,
             last_open_pr=last_open_pr,
+            open_pr_count=pr_snapshot.open_pr_count if pr_snapshot else None,
+            oldest_open_pr_at=pr_snapshot.oldest_open_pr_created_at if pr_snapshot else None,
             default_branch_ref=project.default_branch
         )
     
-    async def refresh_project(self, project_id: str) -> Project:
-        """Refresh project data from GitHub"""
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-        if not project:
-            raise ValueError("Project not found")
+    def _history_watermark(self, project: Project) -> Optional[Tuple[datetime, str]]:
+        """(since, after_oid) for an incremental history fetch, or None when a full fetch is needed"""
+        if not project.history_watermark_oid or not project.history_watermark_at:
+            return None
         
-        # Fetch fresh data from GitHub
-        repo_url = project.html_url
-        github_data = await self.github_client.fetch_repository_data(repo_url)
+        # Projects whose daily buckets were never filled need one full fetch first
+        if project.contributor_window_start is None:
+            return None
         
+        return project.history_watermark_at, project.history_watermark_oid
+    
+    async def _release_connection(self) -> None:
+        """End the read transaction so no pooled connection sits idle while GitHub is awaited"""
+        await self.db.commit()
+    
+    async def _watermark_moved(self, project: Project) -> bool:
+        """Lock the project row and report whether its watermark changed since it was loaded"""
+        loaded_oid = project.history_watermark_oid
+        await self.db.refresh(
+            project,
+            ["history_watermark_oid", "history_watermark_at", "last_commit_at", "last_actor"],
+            with_for_update=True
+        )
+        return project.history_watermark_oid != loaded_oid
+    
+    def _apply_head(self, project: Project, github_data: Dict[str, Any], incremental: bool) -> None:
+        """Take the fetched head commit, unless an incremental fetch is older than the stored one"""
+        fetched_at = github_data["last_commit_at"]
+        if incremental and project.last_commit_at and (fetched_at is None or fetched_at < project.last_commit_at):
+            return
+        project.last_commit_at = fetched_at
+        if github_data["last_actor"] or not incremental:
+            project.last_actor = github_data["last_actor"]
+    
+    async def _apply_github_data(self, project: Project, github_data: Dict[str, Any], incremental: bool = False) -> None:
+        """Copy freshly fetched GitHub data onto a project and update its contributors"""
         # Update project
         project.default_branch = github_data["default_branch"]
         project.visibility = github_data["visibility"]
-        project.last_commit_at = github_data["last_commit_at"]
-        project.last_actor = github_data["last_actor"]
         project.install_status = github_data["install_status"]
-        project.updated_at = datetime.utcnow()
+        project.updated_at = datetime.now(timezone.utc)
         
-        # Clear existing contributors
-        self.db.query(ProjectContributor).filter(
-            ProjectContributor.project_id == project.id
-        ).delete()
-        
-        # Add fresh contributors
-        for contributor_data in github_data["contributors"]:
-            contributor = ProjectContributor(
-                project_id=project.id,
-                login=contributor_data["login"],
-                commits_90d=contributor_data["commits"],
-                last_commit_at=contributor_data["last_commit_at"]
-            )
-            self.db.add(contributor)
+        window = ContributorWindow(self.db)
+        head_moved = False
+        if github_data["head_oid"]:
+            if incremental and await self._watermark_moved(project):
+                # A push was applied while we fetched and its commits overlap this fetch;
+                # counting them again would double them, so history and head stay with the push
+                head_moved = True
+            elif incremental:
+                await window.record(project, github_data["commit_days"])
+                project.history_watermark_oid = github_data["head_oid"]
+                project.history_watermark_at = github_data["last_commit_at"]
+            else:
+                await window.rebuild(project, github_data["commit_days"])
+                project.history_watermark_oid = github_data["head_oid"]
+                project.history_watermark_at = github_data["last_commit_at"]
+        if not head_moved:
+            self._apply_head(project, github_data, incremental)
+        
+        # REST fallback reads no history, but the window still moves on
+        await window.slide(project)
+        self._touched_logins.update(window.touched)
+        await self._save_pr_snapshot(project, github_data)
+        
+        project.next_refresh_at = datetime.now(timezone.utc) + refresh_interval(
+            project.last_commit_at, project.install_status
+        )
+    
+    async def _save_pr_snapshot(self, project: Project, github_data: Dict[str, Any]) -> None:
+        """Replace the project's PR snapshot with freshly fetched PR data, when the fetch read any"""
+        values = snapshot_values(github_data)
+        if values is None:
+            return
+        
+        stmt = insert(ProjectPullRequestSnapshot).values(project_id=project.id, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProjectPullRequestSnapshot.project_id],
+            set_={**values, "updated_at": func.now()}
+        )
+        await self.db.execute(stmt)
+    
+    async def _save_contributor_totals(self) -> None:
+        await refresh_contributor_totals(self.db, self._touched_logins)
+        self._touched_logins.clear()
+    
+    async def refresh_project(self, project_id: str) -> Project:
+        """Refresh project data from GitHub"""
+        project = await self.db.scalar(select(Project).where(Project.id == project_id))
+        if not project:
+            raise ValueError("Project not found")
+        
+        # Fetch fresh data from GitHub, only past the watermark when we have one
+        repo_url = project.html_url
+        watermark = self._history_watermark(project)
+        await self._release_connection()
+        if watermark:
+            github_data = await self.github_client.fetch_repository_data(repo_url, *watermark)
+        else:
+            github_data = await self.github_client.fetch_repository_data(repo_url)
         
-        self.db.commit()
-        self.db.refresh(project)
+        await self._apply_github_data(project, github_data, incremental=watermark is not None)
+        await self._save_contributor_totals()
+        
+        await self.db.commit()
+        await self.db.refresh(project)
+        await response_cache.invalidate(project.id)
         
         logger.info(f"Refreshed project {project.owner}/{project.name}")
         return project
     
-    def queue_refresh(self, project_id: str) -> None:
+    async def refresh_projects(self, project_ids: List[str]) -> Dict[str, Any]:
+        """
+        Refresh many projects with batched GitHub queries.
+        Returns the refreshed Project, or the Exception that stopped it, keyed by project id.
+        """
+        projects = (await self.db.scalars(select(Project).where(Project.id.in_(project_ids)))).all()
+        results: Dict[str, Any] = {
+            str(project_id): ValueError("Project not found") for project_id in project_ids
+        }
+        
+        watermarks = {}
+        for project in projects:
+            watermark = self._history_watermark(project)
+            if watermark:
+                watermarks[project.html_url] = watermark
+        await self._release_connection()
+        
+        fetched = await self.github_client.fetch_many(
+            [project.html_url for project in projects], watermarks
+        )
+        
+        for project in projects:
+            github_data = fetched.get(project.html_url)
+            if isinstance(github_data, Exception):
+                results[str(project.id)] = github_data
+                continue
+            
+            await self._apply_github_data(project, github_data, incremental=project.html_url in watermarks)
+            results[str(project.id)] = project
+        
+        await self._save_contributor_totals()
+        await self.db.commit()
+        refreshed_ids = [result.id for result in results.values() if isinstance(result, Project)]
+        if refreshed_ids:
+            await response_cache.invalidate(*refreshed_ids)
+        
+        refreshed = len(refreshed_ids)
+        logger.info(f"Refreshed {refreshed} of {len(project_ids)} projects")
+        return results
+    
+    async def queue_refresh(self, project_id: str) -> None:
         """Queue a project for refresh (for webhook processing)"""
-        # Check if already queued
-        existing = self.db.query(ProjectRefreshQueue).filter(
-            ProjectRefreshQueue.project_id == project_id,
-            ProjectRefreshQueue.processed_at.is_(None)
-        ).first()
-        
-        if not existing:
-            queue_item = ProjectRefreshQueue(project_id=project_id)
-            self.db.add(queue_item)
-            self.db.commit()
-            logger.info(f"Queued project {project_id} for refresh")
\ No newline at end of file
+        stmt = insert(ProjectRefreshQueue).values(project_id=project_id)
+        # Already pending: keep the one row, but make it due now. clock_timestamp() rather
+        # than now() so a worker that claimed the row earlier sees it was re-queued
+        # and does not mark it processed with data fetched before this event.
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProjectRefreshQueue.project_id],
+            index_where=ProjectRefreshQueue.processed_at.is_(None),
+            set_={
+                "queued_at": func.clock_timestamp(),
+                "next_attempt_at": func.clock_timestamp(),
+                "attempts": 0
+            }
+        )
+        await self.db.execute(stmt)
+        await self.db.commit()
+        logger.info(f"Queued project {project_id} for refresh")
+    
+    async def apply_push(self, payload: Dict[str, Any]) -> str:
+        """
+        Apply a push event straight from its payload, without calling GitHub.
+        Returns "applied", "queued" when only a full refresh can account for it, or "ignored".
+        """
+        repository = payload.get("repository") or {}
+        owner = (repository.get("owner") or {}).get("login")
+        name = repository.get("name")
+        if not owner or not name or not is_default_branch_push(payload):
+            return "ignored"
+        
+        project_id = await project_lookup.get_id(self.db, owner, name)
+        if project_id is None:
+            return "ignored"
+        
+        # Locked so concurrent pushes and refreshes of this project apply one at a time
+        project = await self.db.scalar(select(Project).where(Project.id == project_id).with_for_update())
+        if not project:
+            project_lookup.forget(owner, name)
+            return "ignored"
+        
+        if project.history_watermark_oid == payload.get("after"):
+            # A refresh already read past this push
+            await self.db.rollback()
+            return "ignored"
+        
+        # The payload's commits are exactly what lies between `before` and `after`, so they
+        # can only be added when our counts end at `before`; otherwise a refresh fills the gap
+        if (
+            needs_full_refresh(payload)
+            or self._history_watermark(project) is None
+            or project.history_watermark_oid != payload.get("before")
+        ):
+            await self.queue_refresh(str(project.id))
+            return "queued"
+        
+        head = push_head(payload)
+        project.default_branch = repository["default_branch"]
+        project.last_commit_at = commit_time(head)
+        project.last_actor = commit_login(head)
+        project.history_watermark_oid = payload["after"]
+        project.history_watermark_at = project.last_commit_at
+        project.updated_at = datetime.now(timezone.utc)
+        
+        window = ContributorWindow(self.db)
+        await window.record(project, push_commit_days(payload))
+        await window.slide(project)
+        self._touched_logins.update(window.touched)
+        await self._save_contributor_totals()
+        
+        await self.db.commit()
+        await response_cache.invalidate(project.id)
+        logger.info(f"Applied push of {len(payload['commits'])} commits to {owner}/{name}")
+        return "applied"
+    
+    async def apply_pull_requests(self, payloads: List[Dict[str, Any]]) -> str:
+        """
+        Keep a project's PR snapshot current from its pull_request events, in delivery order.
+        Returns "applied", "queued" when only a refresh can restore what an event removed, or "ignored".
+        """
+        repository = payloads[-1].get("repository") or {}
+        owner = (repository.get("owner") or {}).get("login")
+        name = repository.get("name")
+        if not owner or not name:
+            return "ignored"
+        
+        project_id = await project_lookup.get_id(self.db, owner, name)
+        if project_id is None:
+            return "ignored"
+        
+        snapshot = await self.db.scalar(select(ProjectPullRequestSnapshot).where(
+            ProjectPullRequestSnapshot.project_id == project_id
+        ).with_for_update())
+        if snapshot is None:
+            # Nothing to adjust until a refresh has counted the open PRs
+            await self.queue_refresh(str(project_id))
+            return "queued"
+        
+        stale = False
+        for payload in payloads:
+            stale = apply_pull_request_event(snapshot, payload) or stale
+        await self.db.commit()
+        await response_cache.invalidate(project_id)
+        
+        logger.info(f"Applied {len(payloads)} pull request events to {owner}/{name}")
+        if stale:
+            await self.queue_refresh(str(project_id))
+            return "queued"
+        return "applied"
@@ -0,0 +1,75 @@
+from typing import Any, Dict, Optional
+from datetime import datetime
+from ..models.project import ProjectPullRequestSnapshot
+
+
+def _time(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value.replace('Z', '+00:00')) if value else None
+
+
+def snapshot_values(github_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """PR snapshot columns from fetched repository data; None when the fetch read no PRs (REST fallback)"""
+    if github_data.get("open_pr_count") is None:
+        return None
+    last_open_pr = github_data.get("last_open_pr") or {}
+    return {
+        "open_pr_count": github_data["open_pr_count"],
+        "last_open_pr_number": last_open_pr.get("number"),
+        "last_open_pr_updated_at": last_open_pr.get("updated_at"),
+        "last_open_pr_author": last_open_pr.get("author"),
+        "oldest_open_pr_created_at": github_data.get("oldest_open_pr_at")
+    }
+
+
+def _set_latest(snapshot: ProjectPullRequestSnapshot, pull_request: Dict[str, Any]) -> None:
+    updated_at = _time(pull_request.get("updated_at"))
+    if updated_at is None:
+        return
+    if snapshot.last_open_pr_updated_at is None or updated_at >= snapshot.last_open_pr_updated_at:
+        snapshot.last_open_pr_number = pull_request.get("number")
+        snapshot.last_open_pr_updated_at = updated_at
+        snapshot.last_open_pr_author = (pull_request.get("user") or {}).get("login", "unknown")
+
+
+def apply_pull_request_event(snapshot: ProjectPullRequestSnapshot, payload: Dict[str, Any]) -> bool:
+    """
+    Fold one pull_request event into a snapshot.
+    Returns True when the snapshot lost information only GitHub has: closing the latest or
+    oldest open PR leaves no way to tell which PR takes its place, so a refresh is needed.
+    """
+    action = payload.get("action")
+    pull_request = payload.get("pull_request") or {}
+
+    if action in ("opened", "reopened"):
+        snapshot.open_pr_count += 1
+        created_at = _time(pull_request.get("created_at"))
+        if created_at and (snapshot.oldest_open_pr_created_at is None or created_at < snapshot.oldest_open_pr_created_at):
+            snapshot.oldest_open_pr_created_at = created_at
+        _set_latest(snapshot, pull_request)
+        return False
+
+    if action == "closed":
+        snapshot.open_pr_count = max(snapshot.open_pr_count - 1, 0)
+        if snapshot.open_pr_count == 0:
+            snapshot.last_open_pr_number = None
+            snapshot.last_open_pr_updated_at = None
+            snapshot.last_open_pr_author = None
+            snapshot.oldest_open_pr_created_at = None
+            return False
+
+        stale = False
+        if pull_request.get("number") == snapshot.last_open_pr_number:
+            snapshot.last_open_pr_number = None
+            snapshot.last_open_pr_updated_at = None
+            snapshot.last_open_pr_author = None
+            stale = True
+        created_at = _time(pull_request.get("created_at"))
+        if created_at and snapshot.oldest_open_pr_created_at and created_at <= snapshot.oldest_open_pr_created_at:
+            snapshot.oldest_open_pr_created_at = None
+            stale = True
+        return stale
+
+    # Any other activity (edits, new commits, reviews, ...) on an open PR makes it the latest
+    if pull_request.get("state") == "open":
+        _set_latest(snapshot, pull_request)
+    return False
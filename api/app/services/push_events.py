@@ -0,0 +1,78 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, datetime
+from .github_client import add_commit_to_days
+
+# GitHub lists at most this many commits in a push payload; a full list may have been cut off
+PUSH_PAYLOAD_COMMIT_LIMIT = 20
+
+
+def is_default_branch_push(payload: Dict[str, Any]) -> bool:
+    """True for pushes that add commits to the repository's default branch"""
+    default_branch = (payload.get("repository") or {}).get("default_branch")
+    return (
+        bool(default_branch)
+        and payload.get("ref") == f"refs/heads/{default_branch}"
+        and not payload.get("deleted")
+    )
+
+
+def needs_full_refresh(payload: Dict[str, Any]) -> bool:
+    """
+    Force-pushes rewrite history the stored counts were built from, and a payload
+    at the commit limit may be missing commits, so neither can be applied as-is.
+    """
+    commits = payload.get("commits") or []
+    if payload.get("forced") or not commits:
+        return True
+    # Coalesced payloads carry the verdict for their sources, since their own list can be longer
+    if "incomplete" in payload:
+        return payload["incomplete"]
+    return len(commits) >= PUSH_PAYLOAD_COMMIT_LIMIT
+
+
+def coalesce_pushes(payloads: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Merge consecutive default-branch pushes (in delivery order) into one payload spanning
+    the first `before` to the last `after`, so a burst is applied in one pass.
+    The result is marked incomplete if any push needs a full refresh or the pushes do not chain.
+    """
+    pushes = [payload for payload in payloads if is_default_branch_push(payload)]
+    if not pushes:
+        return None
+    
+    merged = dict(pushes[0])
+    merged["commits"] = list(pushes[0].get("commits") or [])
+    merged["incomplete"] = needs_full_refresh(pushes[0])
+    for push in pushes[1:]:
+        if push.get("before") != merged.get("after") or needs_full_refresh(push):
+            merged["incomplete"] = True
+        merged["commits"].extend(push.get("commits") or [])
+        merged["forced"] = merged.get("forced") or push.get("forced")
+        merged["after"] = push.get("after")
+        merged["head_commit"] = push.get("head_commit")
+        merged["repository"] = push.get("repository")
+    return merged
+
+
+def commit_login(commit: Dict[str, Any]) -> str:
+    """Same identity rule as history fetches: GitHub login, else the author email"""
+    author = commit.get("author") or {}
+    return author.get("username") or author.get("email", "unknown")
+
+
+def commit_time(commit: Dict[str, Any]) -> datetime:
+    return datetime.fromisoformat(commit["timestamp"].replace('Z', '+00:00'))
+
+
+def push_commit_days(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Bucket a push's commits the way ContributorWindow.record expects"""
+    commit_days: Dict[Tuple[str, date], Dict[str, Any]] = {}
+    for commit in payload.get("commits") or []:
+        add_commit_to_days(commit_days, commit_login(commit), commit_time(commit))
+    return list(commit_days.values())
+
+
+def push_head(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The commit the branch now points at"""
+    commits = payload.get("commits") or []
+    return payload.get("head_commit") or (commits[-1] if commits else None)
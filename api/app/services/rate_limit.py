@@ -0,0 +1,218 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+import asyncio
+import time
+import httpx
+from ..core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitExceeded(Exception):
+    """A GitHub budget is exhausted for longer than the caller is willing to wait"""
+
+    def __init__(self, scope: str, resource: str, retry_at: float):
+        self.scope = scope
+        self.resource = resource
+        self.retry_at = retry_at
+        when = datetime.fromtimestamp(retry_at, tz=timezone.utc).isoformat()
+        super().__init__(f"GitHub rate limit exceeded for {scope} ({resource}); retry after {when}")
+
+
+class Budget:
+    """
+    What is known about one scope's quota for one GitHub resource ("core" REST or "graphql").
+    `remaining` comes from the latest response; points held by requests still in flight
+    are tracked separately so concurrent callers cannot overdraw it between responses.
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self.reserved = 0
+        self.cost_estimate = 1
+        self.paused_until = 0.0
+        # Additive increase, multiplicative decrease on secondary limits
+        self.max_concurrency = max_concurrency
+        self.concurrency = max_concurrency
+        self.in_flight = 0
+        self.waiting = 0
+        self._successes = 0
+        self.requests = 0
+        self.throttled = 0
+        self.secondary_limits = 0
+        self.condition = asyncio.Condition()
+
+    def available(self, now: float) -> Optional[int]:
+        """Points we may still spend in the current window; None when unknown"""
+        if self.remaining is None or self.reset_at <= now:
+            return None
+        return self.remaining - self.reserved
+
+    def wait_time(self, cost: int, now: float, reserve: int = 0) -> float:
+        """Seconds until a request costing `cost` may start without dipping into `reserve`; 0 when it may start now"""
+        if self.paused_until > now:
+            return self.paused_until - now
+        available = self.available(now)
+        if available is not None and available - cost < reserve:
+            return self.reset_at - now + 1
+        return 0.0
+
+    def on_success(self) -> None:
+        self._successes += 1
+        if self._successes >= self.concurrency and self.concurrency < self.max_concurrency:
+            self.concurrency += 1
+            self._successes = 0
+
+    def on_secondary_limit(self, retry_after: float, now: float) -> None:
+        self.secondary_limits += 1
+        self.concurrency = max(1, self.concurrency // 2)
+        self._successes = 0
+        self.paused_until = max(self.paused_until, now + retry_after)
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining if self.reset_at > now else self.limit,
+            "reset_at": datetime.fromtimestamp(self.reset_at, tz=timezone.utc) if self.reset_at else None,
+            "paused_until": datetime.fromtimestamp(self.paused_until, tz=timezone.utc) if self.paused_until > now else None,
+            "concurrency": self.concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "last_cost": self.cost_estimate,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "secondary_limits": self.secondary_limits,
+        }
+
+
+class RateLimitGovernor:
+    """
+    Central pacing of GitHub calls per token scope (an App installation, the App itself, ...).
+    Callers take a slot before each request and report the response afterwards: the slot
+    waits while the scope is paused, its budget would dip below `reserve`, or its adaptive
+    concurrency limit is reached. Waits longer than `max_wait_seconds` raise RateLimitExceeded
+    instead, so interactive requests fail fast while background refreshes queue up. Only
+    background work keeps a reserve (see background_governor): it is what interactive
+    requests spend once the workers have stopped short of it.
+    """
+
+    def __init__(self, max_wait_seconds: Optional[float] = None, reserve: int = 0):
+        self.max_wait_seconds = (
+            settings.github_rate_limit_max_wait_seconds if max_wait_seconds is None else max_wait_seconds
+        )
+        self.reserve = reserve
+        self._budgets: Dict[Tuple[str, str], Budget] = {}
+
+    def budget(self, scope: str, resource: str) -> Budget:
+        key = (scope, resource)
+        if key not in self._budgets:
+            self._budgets[key] = Budget(settings.github_max_concurrency_per_scope)
+        return self._budgets[key]
+
+    @asynccontextmanager
+    async def slot(self, scope: str, resource: str, cost: Optional[int] = None) -> AsyncIterator[Budget]:
+        budget = self.budget(scope, resource)
+        cost = budget.cost_estimate if cost is None else cost
+        async with budget.condition:
+            budget.waiting += 1
+            try:
+                counted = False
+                while True:
+                    now = time.time()
+                    delay = budget.wait_time(cost, now, self.reserve)
+                    if delay > self.max_wait_seconds:
+                        raise RateLimitExceeded(scope, resource, now + delay)
+                    if not delay and budget.in_flight < budget.concurrency:
+                        break
+                    if delay and not counted:
+                        budget.throttled += 1
+                        counted = True
+                    try:
+                        # Woken early when a request finishes or a response moves the budget
+                        await asyncio.wait_for(budget.condition.wait(), timeout=delay or None)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                budget.waiting -= 1
+            budget.in_flight += 1
+            budget.reserved += cost
+            budget.requests += 1
+        try:
+            yield budget
+        finally:
+            async with budget.condition:
+                budget.in_flight -= 1
+                budget.reserved -= cost
+                budget.condition.notify_all()
+
+    def observe(self, scope: str, resource: str, response: httpx.Response) -> bool:
+        """Update the budget from a response; True when it was rate limited and should be retried"""
+        budget = self.budget(scope, resource)
+        now = time.time()
+        headers = response.headers
+
+        if headers.get("X-RateLimit-Limit"):
+            budget.limit = int(headers["X-RateLimit-Limit"])
+        if headers.get("X-RateLimit-Remaining") is not None:
+            budget.remaining = int(headers["X-RateLimit-Remaining"])
+        if headers.get("X-RateLimit-Reset"):
+            budget.reset_at = float(headers["X-RateLimit-Reset"])
+
+        if response.status_code not in (403, 429):
+            budget.on_success()
+            return False
+
+        retry_after = headers.get("Retry-After")
+        if budget.remaining == 0 and not retry_after:
+            # Primary limit: nothing more until the window resets
+            budget.paused_until = max(budget.paused_until, budget.reset_at)
+            logger.warning(f"GitHub {resource} quota exhausted for {scope} until {budget.reset_at:.0f}")
+            return True
+        if retry_after or "rate limit" in response.text.lower():
+            budget.on_secondary_limit(float(retry_after or settings.github_secondary_limit_pause_seconds), now)
+            logger.warning(f"GitHub secondary rate limit for {scope}; concurrency now {budget.concurrency}")
+            return True
+        # An ordinary 403 (no access), not a limit
+        return False
+
+    def observe_graphql(self, scope: str, rate_limit: Dict[str, Any]) -> None:
+        """Fold a GraphQL `rateLimit { cost remaining resetAt limit }` result into the budget"""
+        budget = self.budget(scope, "graphql")
+        if rate_limit.get("cost") is not None:
+            budget.cost_estimate = max(1, int(rate_limit["cost"]))
+        if rate_limit.get("remaining") is not None:
+            budget.remaining = int(rate_limit["remaining"])
+        if rate_limit.get("limit") is not None:
+            budget.limit = int(rate_limit["limit"])
+        if rate_limit.get("resetAt"):
+            budget.reset_at = datetime.fromisoformat(rate_limit["resetAt"].replace('Z', '+00:00')).timestamp()
+
+    def pause(self, scope: str, resource: str, until: float) -> None:
+        budget = self.budget(scope, resource)
+        budget.paused_until = max(budget.paused_until, until)
+
+    def quota_fraction(self) -> float:
+        """Lowest share of quota left across known budgets; 1.0 when nothing is known"""
+        now = time.time()
+        fractions = []
+        for budget in self._budgets.values():
+            available = budget.available(now)
+            if available is not None and budget.limit:
+                fractions.append(max(available, 0) / budget.limit)
+        return min(fractions, default=1.0)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        return [
+            {"scope": scope, "resource": resource, **budget.snapshot(now)}
+            for (scope, resource), budget in sorted(self._budgets.items())
+        ]
+
+
+def background_governor() -> RateLimitGovernor:
+    """For workers: waits out a whole window rather than fail, and leaves GITHUB_RATE_LIMIT_RESERVE to interactive requests"""
+    return RateLimitGovernor(settings.github_rate_limit_worker_max_wait_seconds, settings.github_rate_limit_reserve)
@@ -0,0 +1,51 @@
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from typing import Optional
+from datetime import datetime, timedelta, timezone
+from ..core.config import settings
+from ..models.project import Project, ProjectRefreshQueue
+
+
+def refresh_interval(last_commit_at: Optional[datetime], install_status: Optional[str]) -> timedelta:
+    """
+    How long a project's data may age before the scheduler queues it again.
+    Grows by REFRESH_MIN_INTERVAL_SECONDS per idle day since the last commit, so active
+    projects stay fresh and dormant ones settle at the freshness SLO. Projects read without
+    any token draw on a far smaller quota and wait four times as long, still within the SLO.
+    """
+    if last_commit_at is None:
+        seconds = settings.refresh_slo_seconds
+    else:
+        idle_days = max((datetime.now(timezone.utc) - last_commit_at).total_seconds(), 0) / 86400
+        seconds = settings.refresh_min_interval_seconds * (1 + idle_days)
+    if install_status == "none":
+        seconds *= 4
+    return timedelta(seconds=min(seconds, settings.refresh_slo_seconds))
+
+
+def schedule_statement(limit: int):
+    """
+    Queue up to `limit` of the most overdue projects in one round trip.
+    Their due time is pushed out by the SLO so the next tick skips them; the refresh
+    itself then sets the real next due time. SKIP LOCKED keeps concurrent schedulers apart.
+    """
+    due = select(Project.id).where(
+        Project.next_refresh_at <= func.now()
+    ).order_by(
+        Project.next_refresh_at
+    ).limit(limit).with_for_update(skip_locked=True).cte("due")
+
+    queued = insert(ProjectRefreshQueue).from_select(
+        ["project_id"], select(due.c.id)
+    ).on_conflict_do_nothing(
+        index_elements=[ProjectRefreshQueue.project_id],
+        index_where=ProjectRefreshQueue.processed_at.is_(None)
+    ).cte("queued")
+
+    return update(Project).where(
+        Project.id == due.c.id
+    ).values(
+        next_refresh_at=func.now() + timedelta(seconds=settings.refresh_slo_seconds),
+        # Keep the onupdate hook away: updated_at means the data was refreshed
+        updated_at=Project.updated_at
+    ).returning(Project.id).add_cte(queued)
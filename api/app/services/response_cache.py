@@ -0,0 +1,179 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol, Tuple
+from uuid import UUID
+import hashlib
+import json
+import time
+from ..core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def incr(self, key: str) -> int: ...
+
+
+class MemoryBackend:
+    """
+    In-process LRU with per-entry TTL.
+    Counters (the cache versions) are kept apart from entries so eviction never resets them.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if key in self._counters:
+            return str(self._counters[key]).encode()
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._counters.clear()
+
+
+class RedisBackend:
+    """Any client with redis.asyncio's get/set(ex=)/incr; versions are then shared by every process"""
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = await self.client.get(key)
+        if isinstance(value, str):
+            return value.encode()
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.client.set(key, value, ex=max(1, int(ttl)))
+
+    async def incr(self, key: str) -> int:
+        return await self.client.incr(key)
+
+    def clear(self) -> None:
+        pass
+
+
+class CachedBody:
+    def __init__(self, etag: str, body: bytes):
+        self.etag = etag
+        self.body = body
+
+    def encode(self) -> bytes:
+        return self.etag.encode() + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, value: bytes) -> "CachedBody":
+        etag, body = value.split(b"\n", 1)
+        return cls(etag.decode(), body)
+
+
+class ResponseCache:
+    """
+    Serialized GET /projects responses.
+    Keys embed a version: one for every list, one per project for its detail. ProjectService
+    bumps them whenever it writes a project, so stale entries are never read again and
+    simply age out. Versions live in the backend: with Redis (the docker-compose default)
+    every process sees every write at once. The memory backend keeps them per process, so
+    writes made by the worker process only reach the API's cache when entries expire
+    (RESPONSE_CACHE_TTL_SECONDS); it is meant for tests and single-process development.
+    Backend errors are logged and treated as a miss, so the cache can only ever make reads
+    slower, never fail them.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: float, prefix: str = "projects:"):
+        self.backend = backend
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def _version(self, name: str) -> str:
+        value = await self.backend.get(f"{self.prefix}version:{name}")
+        return value.decode() if value else "0"
+
+    async def _key(self, kind: str, params: Dict[str, Any]) -> str:
+        if kind == "detail":
+            version = await self._version(f"project:{params['project_id']}")
+            return f"{self.prefix}detail:{params['project_id']}:{version}"
+        version = await self._version("list")
+        digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        return f"{self.prefix}list:{version}:{digest}"
+
+    async def get(self, kind: str, params: Dict[str, Any]) -> Tuple[Optional[str], Optional[CachedBody]]:
+        """Return (key to store under, cached body or None)"""
+        if not self.enabled:
+            return None, None
+        try:
+            key = await self._key(kind, params)
+            value = await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {e}")
+            return None, None
+        return key, CachedBody.decode(value) if value else None
+
+    async def set(self, key: Optional[str], body: bytes) -> CachedBody:
+        cached = CachedBody(f'"{hashlib.sha1(body).hexdigest()}"', body)
+        if key is None:
+            return cached
+        try:
+            await self.backend.set(key, cached.encode(), self.ttl)
+        except Exception as e:
+            logger.warning(f"Response cache write failed: {e}")
+        return cached
+
+    async def invalidate(self, *project_ids: UUID) -> None:
+        """Drop every cached list and the details of the given projects"""
+        if not self.enabled:
+            return
+        try:
+            await self.backend.incr(f"{self.prefix}version:list")
+            for project_id in project_ids:
+                await self.backend.incr(f"{self.prefix}version:project:{project_id}")
+        except Exception as e:
+            logger.error(f"Response cache invalidation failed: {e}")
+
+    def clear(self) -> None:
+        if self.enabled:
+            self.backend.clear()
+
+
+def create_backend() -> Optional[CacheBackend]:
+    if settings.response_cache_backend == "none":
+        return None
+    if settings.response_cache_backend == "redis":
+        # Installed from requirements.txt; imported here so the other backends never load it
+        import redis.asyncio as redis
+        return RedisBackend(redis.from_url(settings.redis_url))
+    return MemoryBackend(settings.response_cache_max_entries)
+
+
+response_cache = ResponseCache(create_backend(), settings.response_cache_ttl_seconds)
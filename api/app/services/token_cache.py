@@ -0,0 +1,65 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class CachedToken:
+    """A bearer token together with the moment GitHub stops accepting it"""
+
+    def __init__(self, token: str, expires_at: datetime):
+        self.token = token
+        self.expires_at = expires_at
+
+    def is_fresh(self, margin: timedelta) -> bool:
+        """True while the token is valid for at least `margin` longer"""
+        return datetime.now(timezone.utc) + margin < self.expires_at
+
+
+class TokenCache:
+    """
+    Expiry-aware token cache.
+    Tokens are handed out until they are within the refresh margin of expiring;
+    concurrent refreshes for the same key are single-flighted behind a lock.
+    """
+
+    def __init__(self, refresh_margin_seconds: int):
+        self.margin = timedelta(seconds=refresh_margin_seconds)
+        self._tokens: Dict[Any, CachedToken] = {}
+        self._locks: Dict[Any, asyncio.Lock] = {}
+
+    def get(self, key: Any) -> Optional[str]:
+        """Return a cached token that is still fresh, if any"""
+        cached = self._tokens.get(key)
+        if cached and cached.is_fresh(self.margin):
+            return cached.token
+        return None
+
+    def set(self, key: Any, cached: CachedToken) -> None:
+        self._tokens[key] = cached
+
+    def invalidate(self, key: Any) -> None:
+        self._tokens.pop(key, None)
+
+    async def get_or_refresh(
+        self,
+        key: Any,
+        refresh: Callable[[], Awaitable[Optional[CachedToken]]]
+    ) -> Optional[str]:
+        """Return a fresh token for `key`, calling `refresh` at most once per expiry"""
+        token = self.get(key)
+        if token:
+            return token
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another caller may have refreshed while we were waiting
+            token = self.get(key)
+            if token:
+                return token
+
+            cached = await refresh()
+            if cached is None:
+                return None
+
+            self._tokens[key] = cached
+            return cached.token
@@ -0,0 +1,6 @@
+from .import_worker import ImportWorker
+from .refresh_scheduler import RefreshScheduler
+from .refresh_worker import RefreshWorker
+from .webhook_consumer import WebhookConsumer
+
+__all__ = ["ImportWorker", "RefreshScheduler", "RefreshWorker", "WebhookConsumer"]
@@ -0,0 +1,48 @@
+"""Worker process: `python -m app.workers` schedules refreshes, drains the refresh queue and the webhook journal, and runs bulk imports"""
+import asyncio
+import logging
+import signal
+from ..core.database import async_engine
+from ..core.config import settings
+from ..services.analytics import AnalyticsRefresher
+from ..services.github_client import GitHubClient, create_http_client
+from ..services.rate_limit import background_governor
+from .import_worker import ImportWorker
+from .refresh_scheduler import RefreshScheduler
+from .refresh_worker import RefreshWorker
+from .webhook_consumer import WebhookConsumer
+
+
+async def main() -> None:
+    http_client = create_http_client()
+    # Background work would rather wait for quota than fail and retry
+    github_client = GitHubClient(http_client, background_governor())
+    workers = [
+        RefreshScheduler(github_client),
+        RefreshWorker(github_client, analytics=AnalyticsRefresher()),
+        WebhookConsumer(github_client),
+        ImportWorker(github_client),
+    ]
+
+    def stop() -> None:
+        for worker in workers:
+            worker.stop()
+
+    # One handler per signal: a later add_signal_handler replaces the earlier one
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop)
+
+    try:
+        await asyncio.gather(*(worker.run() for worker in workers))
+    finally:
+        await http_client.aclose()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='{"timestamp": "%(asctime)s", "level": "%(levelname)s", "message": "%(message)s", "module": "%(name)s"}'
+    )
+    asyncio.run(main())
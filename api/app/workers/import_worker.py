@@ -0,0 +1,79 @@
+"""
+Runs bulk import jobs.
+
+POST /projects/bulk only records a pending job; this worker runs it, in the worker
+process (`python -m app.workers`) or inside the API with IMPORT_WORKER_IN_PROCESS=true.
+Jobs are claimed with SELECT ... FOR UPDATE SKIP LOCKED and leased for
+IMPORT_WORKER_LEASE_SECONDS, renewed while the job runs, so a job whose worker died or
+was redeployed is resumed by the next worker to poll instead of staying `running` forever.
+"""
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from typing import Optional
+from datetime import timedelta
+from uuid import UUID
+import asyncio
+import logging
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from ..models.import_job import ImportJob
+from ..services.bulk_import import BulkImporter
+from ..services.github_client import GitHubClient
+
+logger = logging.getLogger(__name__)
+
+
+def claim_statement(lease_seconds: int):
+    """Lease the oldest pending job, or a running one whose worker stopped renewing its lease"""
+    claimable = select(ImportJob.id).where(or_(
+        ImportJob.status == "pending",
+        and_(
+            ImportJob.status == "running",
+            or_(ImportJob.locked_until.is_(None), ImportJob.locked_until < func.now())
+        )
+    )).order_by(
+        ImportJob.created_at
+    ).limit(1).with_for_update(skip_locked=True)
+
+    return update(ImportJob).where(
+        ImportJob.id == claimable.scalar_subquery()
+    ).values(
+        status="running",
+        locked_until=func.now() + timedelta(seconds=lease_seconds)
+    ).returning(ImportJob.id)
+
+
+class ImportWorker:
+    def __init__(self, github_client: GitHubClient, session_factory: async_sessionmaker = AsyncSessionLocal):
+        self.importer = BulkImporter(github_client, session_factory)
+        self.session_factory = session_factory
+        self._stop = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    async def claim(self) -> Optional[UUID]:
+        async with self.session_factory() as db:
+            job_id = await db.scalar(claim_statement(settings.import_worker_lease_seconds))
+            await db.commit()
+        return job_id
+
+    async def run(self) -> None:
+        """Run claimed jobs one at a time until stop() is called"""
+        logger.info("Import worker started")
+        while not self._stop.is_set():
+            try:
+                job_id = await self.claim()
+                if job_id is not None:
+                    logger.info(f"Running import job {job_id}")
+                    await self.importer.run(job_id, self._stop)
+                    continue
+            except Exception as e:
+                logger.error(f"Import worker iteration failed: {e}")
+
+            # Nothing to run (or the database unreachable): wait for the next poll
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=settings.import_worker_poll_interval)
+            except asyncio.TimeoutError:
+                pass
+        logger.info("Import worker stopped")
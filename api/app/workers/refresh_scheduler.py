@@ -0,0 +1,68 @@
+"""
+Feeds project_refresh_queue from the projects' stored next_refresh_at.
+
+Each tick queues the most overdue projects, at most SCHEDULER_BATCH_SIZE of them,
+fewer as GitHub quota runs down, and none while the refresh worker still has
+SCHEDULER_MAX_PENDING rows to drain. When each project is due depends on how
+recently it was committed to (see refresh_interval).
+"""
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+import asyncio
+import logging
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from ..models.project import ProjectRefreshQueue
+from ..services.github_client import GitHubClient
+from ..services.refresh_schedule import schedule_statement
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshScheduler:
+    def __init__(self, github_client: GitHubClient, session_factory: async_sessionmaker = AsyncSessionLocal):
+        self.github_client = github_client
+        self.session_factory = session_factory
+        self._stop = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def capacity(self, pending: int) -> int:
+        """Projects to queue this tick given the queue depth and the quota left"""
+        quota = self.github_client.rate_limit_fraction()
+        if quota < settings.scheduler_min_quota_fraction:
+            return 0
+        return max(0, min(int(settings.scheduler_batch_size * quota), settings.scheduler_max_pending - pending))
+
+    async def tick(self) -> int:
+        async with self.session_factory() as db:
+            pending = await db.scalar(
+                select(func.count()).select_from(ProjectRefreshQueue).where(ProjectRefreshQueue.processed_at.is_(None))
+            )
+            limit = self.capacity(pending)
+            if not limit:
+                logger.info(f"Scheduler skipped a tick: {pending} refreshes pending, "
+                            f"{self.github_client.rate_limit_fraction():.0%} quota left")
+                return 0
+
+            queued = (await db.execute(schedule_statement(limit))).scalars().all()
+            await db.commit()
+
+        if queued:
+            logger.info(f"Scheduled {len(queued)} projects for refresh")
+        return len(queued)
+
+    async def run(self) -> None:
+        logger.info("Refresh scheduler started")
+        while not self._stop.is_set():
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.error(f"Refresh scheduler tick failed: {e}")
+
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=settings.scheduler_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+        logger.info("Refresh scheduler stopped")
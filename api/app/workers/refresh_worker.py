@@ -0,0 +1,178 @@
+"""
+Drains project_refresh_queue.
+
+Runs in the worker process (`python -m app.workers`), or inside the API with
+REFRESH_WORKER_IN_PROCESS=true. Any number of workers can run at once:
+rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED and leased for
+REFRESH_WORKER_LEASE_SECONDS, and the queue holds at most one pending row per
+project, so no project is refreshed by two workers at the same time.
+Batches that refreshed anything also refresh the /analytics materialized views,
+throttled by the AnalyticsRefresher passed in.
+"""
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from typing import Dict, List, NamedTuple, Optional
+from datetime import datetime, timedelta
+from uuid import UUID
+import asyncio
+import logging
+import random
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from ..models.project import Project, ProjectRefreshQueue
+from ..services.analytics import AnalyticsRefresher
+from ..services.github_client import GitHubClient
+from ..services.project_service import ProjectService
+
+logger = logging.getLogger(__name__)
+
+
+class ClaimedRefresh(NamedTuple):
+    queue_id: int
+    project_id: UUID
+    attempts: int
+    claimed_at: datetime
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff, capped and jittered so failed batches do not retry in lockstep"""
+    ceiling = min(
+        settings.refresh_worker_max_backoff_seconds,
+        settings.refresh_worker_backoff_seconds * 2 ** max(attempts - 1, 0)
+    )
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def claim_statement(batch_size: int, lease_seconds: int):
+    """
+    Lease up to batch_size due rows in one round trip.
+    SKIP LOCKED lets concurrent workers take disjoint batches instead of queueing on each
+    other's row locks; the lease keeps the rows out of later claims once this commits.
+    """
+    due = select(ProjectRefreshQueue.id).where(
+        ProjectRefreshQueue.processed_at.is_(None),
+        ProjectRefreshQueue.next_attempt_at <= func.now(),
+        or_(ProjectRefreshQueue.locked_until.is_(None), ProjectRefreshQueue.locked_until < func.now())
+    ).order_by(
+        ProjectRefreshQueue.next_attempt_at
+    ).limit(batch_size).with_for_update(skip_locked=True)
+
+    return update(ProjectRefreshQueue).where(
+        ProjectRefreshQueue.id.in_(due.scalar_subquery())
+    ).values(
+        locked_until=func.now() + timedelta(seconds=lease_seconds),
+        attempts=ProjectRefreshQueue.attempts + 1
+    ).returning(
+        ProjectRefreshQueue.id,
+        ProjectRefreshQueue.project_id,
+        ProjectRefreshQueue.attempts,
+        func.now()
+    )
+
+
+class RefreshWorker:
+    def __init__(
+        self,
+        github_client: GitHubClient,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        analytics: Optional[AnalyticsRefresher] = None
+    ):
+        self.github_client = github_client
+        self.session_factory = session_factory
+        self.concurrency = concurrency or settings.refresh_worker_concurrency
+        self.batch_size = batch_size or settings.refresh_worker_batch_size
+        self.analytics = analytics
+        self._stop = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    async def claim(self) -> List[ClaimedRefresh]:
+        async with self.session_factory() as db:
+            result = await db.execute(claim_statement(self.batch_size, settings.refresh_worker_lease_seconds))
+            claimed = [ClaimedRefresh(*row) for row in result.all()]
+            await db.commit()
+        return claimed
+
+    async def process(self, claimed: List[ClaimedRefresh]) -> None:
+        """Refresh a claimed batch with one batched GitHub fetch and settle every row"""
+        async with self.session_factory() as db:
+            try:
+                results = await ProjectService(db, self.github_client).refresh_projects(
+                    [item.project_id for item in claimed]
+                )
+            except Exception as e:
+                await db.rollback()
+                results = {str(item.project_id): e for item in claimed}
+
+            refreshed = await self._settle(db, claimed, results)
+
+        if refreshed and self.analytics is not None:
+            try:
+                await self.analytics.maybe_refresh()
+            except Exception as e:
+                # The views just stay as of their last refresh; the next batch tries again
+                logger.error(f"Analytics refresh failed: {e}")
+
+    async def _settle(self, db: AsyncSession, claimed: List[ClaimedRefresh], results: Dict[str, object]) -> int:
+        """Record every row's outcome; returns how many projects were refreshed"""
+        succeeded = [item for item in claimed if isinstance(results.get(str(item.project_id)), Project)]
+        failed = [item for item in claimed if item not in succeeded]
+
+        for item in succeeded:
+            # A webhook that re-queued the row mid-refresh moved queued_at past our claim;
+            # that row stays pending and is released for another pass
+            await db.execute(update(ProjectRefreshQueue).where(
+                ProjectRefreshQueue.id == item.queue_id,
+                ProjectRefreshQueue.queued_at <= item.claimed_at
+            ).values(processed_at=func.now(), locked_until=None, last_error=None))
+            await db.execute(update(ProjectRefreshQueue).where(
+                ProjectRefreshQueue.id == item.queue_id,
+                ProjectRefreshQueue.processed_at.is_(None)
+            ).values(locked_until=None, attempts=0))
+
+        for item in failed:
+            error = str(results.get(str(item.project_id)))
+            if item.attempts >= settings.refresh_worker_max_attempts:
+                logger.error(f"Giving up refreshing project {item.project_id} after {item.attempts} attempts: {error}")
+                values = dict(processed_at=func.now(), locked_until=None, last_error=error)
+            else:
+                delay = retry_delay(item.attempts)
+                logger.warning(f"Refresh of project {item.project_id} failed, retrying in {delay:.0f}s: {error}")
+                values = dict(
+                    next_attempt_at=func.now() + timedelta(seconds=delay),
+                    locked_until=None,
+                    last_error=error
+                )
+            await db.execute(update(ProjectRefreshQueue).where(
+                ProjectRefreshQueue.id == item.queue_id
+            ).values(**values))
+
+        await db.commit()
+        logger.info(f"Refresh batch done: {len(succeeded)} refreshed, {len(failed)} failed")
+        return len(succeeded)
+
+    async def _drain(self) -> None:
+        while not self._stop.is_set():
+            try:
+                claimed = await self.claim()
+                if claimed:
+                    await self.process(claimed)
+                    continue
+            except Exception as e:
+                logger.error(f"Refresh worker iteration failed: {e}")
+
+            # Queue empty (or the database unreachable): wait for the next poll
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=settings.refresh_worker_poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self) -> None:
+        """Drain the queue with `concurrency` batches in flight until stop() is called"""
+        logger.info(f"Refresh worker started with {self.concurrency} concurrent batches of {self.batch_size}")
+        await asyncio.gather(*(self._drain() for _ in range(self.concurrency)))
+        logger.info("Refresh worker stopped")
+
@@ -0,0 +1,166 @@
+"""
+Processes the webhook_events journal.
+
+The webhook endpoint only verifies and records deliveries; this consumer applies them.
+A repository's pending events are picked up together once no new event has arrived
+for WEBHOOK_DEBOUNCE_SECONDS (or the oldest has waited WEBHOOK_MAX_DELAY_SECONDS), so a
+burst of pushes costs one coalesced update instead of one per delivery.
+"""
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import aliased
+from typing import Any, Dict, List, NamedTuple, Optional
+from datetime import timedelta
+import asyncio
+import logging
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from ..models.webhook_event import WebhookEvent
+from ..services.github_client import GitHubClient
+from ..services.project_service import ProjectService
+from ..services.push_events import coalesce_pushes
+from .refresh_worker import retry_delay
+
+logger = logging.getLogger(__name__)
+
+
+class ClaimedEvent(NamedTuple):
+    event_id: int
+    repository: str
+    event_type: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+def claim_statement(batch_size: int, lease_seconds: int):
+    """Lease every pending event of up to batch_size repositories whose debounce window has passed"""
+    claimable = and_(
+        WebhookEvent.processed_at.is_(None),
+        or_(WebhookEvent.locked_until.is_(None), WebhookEvent.locked_until < func.now())
+    )
+    # A repository with a leased event is being processed (or backing off): its newer events
+    # wait, so one repository is never applied by two consumers at once or out of order
+    leased = aliased(WebhookEvent)
+    repository_leased = select(leased.id).where(
+        leased.repository == WebhookEvent.repository,
+        leased.processed_at.is_(None),
+        leased.locked_until >= func.now()
+    ).exists()
+    due_repositories = select(WebhookEvent.repository).where(claimable, ~repository_leased).group_by(
+        WebhookEvent.repository
+    ).having(or_(
+        func.max(WebhookEvent.received_at) <= func.now() - timedelta(seconds=settings.webhook_debounce_seconds),
+        func.min(WebhookEvent.received_at) <= func.now() - timedelta(seconds=settings.webhook_max_delay_seconds)
+    )).limit(batch_size)
+
+    events = select(WebhookEvent.id).where(
+        claimable,
+        WebhookEvent.repository.in_(due_repositories)
+    ).with_for_update(skip_locked=True)
+
+    return update(WebhookEvent).where(
+        WebhookEvent.id.in_(events.scalar_subquery())
+    ).values(
+        locked_until=func.now() + timedelta(seconds=lease_seconds),
+        attempts=WebhookEvent.attempts + 1
+    ).returning(
+        WebhookEvent.id,
+        WebhookEvent.repository,
+        WebhookEvent.event_type,
+        WebhookEvent.payload,
+        WebhookEvent.attempts
+    )
+
+
+class WebhookConsumer:
+    def __init__(
+        self,
+        github_client: GitHubClient,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        concurrency: Optional[int] = None
+    ):
+        self.github_client = github_client
+        self.session_factory = session_factory
+        self.concurrency = concurrency or settings.webhook_consumer_concurrency
+        self._stop = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    async def claim(self) -> Dict[str, List[ClaimedEvent]]:
+        """Claimed events grouped by repository, in delivery order"""
+        async with self.session_factory() as db:
+            result = await db.execute(claim_statement(
+                settings.webhook_consumer_batch_size, settings.webhook_consumer_lease_seconds
+            ))
+            claimed = [ClaimedEvent(*row) for row in result.all()]
+            await db.commit()
+
+        by_repository: Dict[str, List[ClaimedEvent]] = {}
+        for event in sorted(claimed, key=lambda event: event.event_id):
+            by_repository.setdefault(event.repository, []).append(event)
+        return by_repository
+
+    async def _apply(self, service: ProjectService, events: List[ClaimedEvent]) -> str:
+        outcomes = []
+        merged = coalesce_pushes([event.payload for event in events if event.event_type == "push"])
+        if merged is not None:
+            outcomes.append(f"push {await service.apply_push(merged)}")
+        pull_requests = [event.payload for event in events if event.event_type == "pull_request"]
+        if pull_requests:
+            outcomes.append(f"pull requests {await service.apply_pull_requests(pull_requests)}")
+        return ", ".join(outcomes) or "ignored"
+
+    async def process_repository(self, repository: str, events: List[ClaimedEvent]) -> None:
+        """Apply one repository's claimed events as a single update and settle them"""
+        event_ids = [event.event_id for event in events]
+        async with self.session_factory() as db:
+            try:
+                outcome = await self._apply(ProjectService(db, self.github_client), events)
+            except Exception as e:
+                await db.rollback()
+                await self._fail(db, events, str(e))
+                return
+
+            # Replaying an applied push is a no-op (the watermark already moved past it),
+            # so a crash before this commit only costs a repeat
+            await db.execute(update(WebhookEvent).where(WebhookEvent.id.in_(event_ids)).values(
+                processed_at=func.now(), locked_until=None, last_error=None
+            ))
+            await db.commit()
+        logger.info(f"Coalesced {len(events)} webhook events for {repository}: {outcome}")
+
+    async def _fail(self, db, events: List[ClaimedEvent], error: str) -> None:
+        attempts = max(event.attempts for event in events)
+        event_ids = [event.event_id for event in events]
+        if attempts >= settings.webhook_consumer_max_attempts:
+            logger.error(f"Dropping {len(events)} webhook events for {events[0].repository}: {error}")
+            values = dict(processed_at=func.now(), locked_until=None, last_error=error)
+        else:
+            # The lease doubles as the retry delay
+            values = dict(locked_until=func.now() + timedelta(seconds=retry_delay(attempts)), last_error=error)
+        await db.execute(update(WebhookEvent).where(WebhookEvent.id.in_(event_ids)).values(**values))
+        await db.commit()
+
+    async def run(self) -> None:
+        logger.info("Webhook consumer started")
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(repository: str, events: List[ClaimedEvent]) -> None:
+            async with semaphore:
+                await self.process_repository(repository, events)
+
+        while not self._stop.is_set():
+            try:
+                claimed = await self.claim()
+                if claimed:
+                    await asyncio.gather(*(bounded(repo, events) for repo, events in claimed.items()))
+                    continue
+            except Exception as e:
+                logger.error(f"Webhook consumer iteration failed: {e}")
+
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=settings.webhook_consumer_poll_interval)
+            except asyncio.TimeoutError:
+                pass
+        logger.info("Webhook consumer stopped")
@@ -0,0 +1,25 @@
+"""Add commit history watermark to projects
+
+Revision ID: 002
+Revises: 001
+Create Date: 2024-02-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('history_watermark_oid', sa.Text(), nullable=True))
+    op.add_column('projects', sa.Column('history_watermark_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('projects', 'history_watermark_at')
+    op.drop_column('projects', 'history_watermark_oid')
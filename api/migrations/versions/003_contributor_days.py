@@ -0,0 +1,37 @@
+"""Add daily contributor commit buckets
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-02-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('project_contributor_days',
+    sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('login', sa.Text(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('commits', sa.Integer(), nullable=False),
+    sa.Column('last_commit_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id', 'login', 'day')
+    )
+    op.create_index('ix_project_contributor_days_project_day', 'project_contributor_days', ['project_id', 'day'])
+    # NULL until the first full refresh has filled the buckets
+    op.add_column('projects', sa.Column('contributor_window_start', sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('projects', 'contributor_window_start')
+    op.drop_index('ix_project_contributor_days_project_day', table_name='project_contributor_days')
+    op.drop_table('project_contributor_days')
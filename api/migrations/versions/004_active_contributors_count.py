@@ -0,0 +1,69 @@
+"""Add trigger-maintained active_contributors_90d to projects
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-03-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('active_contributors_90d', sa.Integer(), server_default='0', nullable=False))
+    op.create_index('ix_projects_active_contributors_90d', 'projects', ['active_contributors_90d'])
+
+    op.execute("""
+        UPDATE projects p
+        SET active_contributors_90d = c.active
+        FROM (
+            SELECT project_id, count(*) AS active
+            FROM project_contributors
+            WHERE commits_90d > 0
+            GROUP BY project_id
+        ) c
+        WHERE c.project_id = p.id
+    """)
+
+    # Keep the count in step with every write to project_contributors, whoever makes it
+    op.execute("""
+        CREATE OR REPLACE FUNCTION project_contributors_active_count() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE'
+               AND OLD.project_id = NEW.project_id
+               AND (OLD.commits_90d > 0) = (NEW.commits_90d > 0) THEN
+                RETURN NULL;
+            END IF;
+
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.commits_90d > 0 THEN
+                UPDATE projects SET active_contributors_90d = active_contributors_90d - 1
+                WHERE id = OLD.project_id;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.commits_90d > 0 THEN
+                UPDATE projects SET active_contributors_90d = active_contributors_90d + 1
+                WHERE id = NEW.project_id;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_project_contributors_active_count
+        AFTER INSERT OR UPDATE OF project_id, commits_90d OR DELETE ON project_contributors
+        FOR EACH ROW EXECUTE FUNCTION project_contributors_active_count()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_project_contributors_active_count ON project_contributors")
+    op.execute("DROP FUNCTION IF EXISTS project_contributors_active_count()")
+    op.drop_index('ix_projects_active_contributors_90d', table_name='projects')
+    op.drop_column('projects', 'active_contributors_90d')
@@ -0,0 +1,30 @@
+"""Add (sort key, id) indexes for keyset pagination
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-03-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_projects_last_commit_at_id', 'projects', ['last_commit_at', 'id'])
+    op.create_index('ix_projects_name_id', 'projects', ['name', 'id'])
+    # Supersedes the single-column index from 004
+    op.create_index('ix_projects_active_contributors_id', 'projects', ['active_contributors_90d', 'id'])
+    op.drop_index('ix_projects_active_contributors_90d', table_name='projects')
+
+
+def downgrade() -> None:
+    op.create_index('ix_projects_active_contributors_90d', 'projects', ['active_contributors_90d'])
+    op.drop_index('ix_projects_active_contributors_id', table_name='projects')
+    op.drop_index('ix_projects_name_id', table_name='projects')
+    op.drop_index('ix_projects_last_commit_at_id', table_name='projects')
@@ -0,0 +1,33 @@
+"""Add trigram and filter indexes for project search
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-04-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_projects_owner_trgm', 'projects', ['owner'],
+                    postgresql_using='gin', postgresql_ops={'owner': 'gin_trgm_ops'})
+    op.create_index('ix_projects_name_trgm', 'projects', ['name'],
+                    postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    # Exact owner filters use the (owner, name) unique constraint's index
+    op.create_index('ix_projects_visibility', 'projects', ['visibility'])
+    op.create_index('ix_projects_install_status', 'projects', ['install_status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_projects_install_status', table_name='projects')
+    op.drop_index('ix_projects_visibility', table_name='projects')
+    op.drop_index('ix_projects_name_trgm', table_name='projects')
+    op.drop_index('ix_projects_owner_trgm', table_name='projects')
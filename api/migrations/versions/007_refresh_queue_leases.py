@@ -0,0 +1,45 @@
+"""Add lease and retry bookkeeping to project_refresh_queue
+
+Revision ID: 007
+Revises: 006
+Create Date: 2024-04-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('project_refresh_queue', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('project_refresh_queue', sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+    op.add_column('project_refresh_queue', sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('project_refresh_queue', sa.Column('last_error', sa.Text(), nullable=True))
+
+    # Nothing ever drained the queue, so collapse duplicate pending rows before enforcing one per project
+    op.execute("""
+        DELETE FROM project_refresh_queue q
+        USING project_refresh_queue keep
+        WHERE q.processed_at IS NULL
+          AND keep.processed_at IS NULL
+          AND keep.project_id = q.project_id
+          AND keep.id < q.id
+    """)
+    op.create_index('uq_project_refresh_queue_pending', 'project_refresh_queue', ['project_id'],
+                    unique=True, postgresql_where=sa.text('processed_at IS NULL'))
+    op.create_index('ix_project_refresh_queue_due', 'project_refresh_queue', ['next_attempt_at'],
+                    postgresql_where=sa.text('processed_at IS NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_project_refresh_queue_due', table_name='project_refresh_queue')
+    op.drop_index('uq_project_refresh_queue_pending', table_name='project_refresh_queue')
+    op.drop_column('project_refresh_queue', 'last_error')
+    op.drop_column('project_refresh_queue', 'locked_until')
+    op.drop_column('project_refresh_queue', 'next_attempt_at')
+    op.drop_column('project_refresh_queue', 'attempts')
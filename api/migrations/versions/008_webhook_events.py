@@ -0,0 +1,40 @@
+"""Add webhook_events journal
+
+Revision ID: 008
+Revises: 007
+Create Date: 2024-05-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('webhook_events',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('delivery_id', sa.Text(), nullable=False),
+    sa.Column('event_type', sa.Text(), nullable=False),
+    sa.Column('repository', sa.Text(), nullable=True),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('received_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('delivery_id')
+    )
+    op.create_index('ix_webhook_events_pending', 'webhook_events', ['repository', 'received_at'],
+                    postgresql_where=sa.text('processed_at IS NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_webhook_events_pending', table_name='webhook_events')
+    op.drop_table('webhook_events')
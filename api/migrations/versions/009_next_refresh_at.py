@@ -0,0 +1,26 @@
+"""Add scheduler due time to projects
+
+Revision ID: 009
+Revises: 008
+Create Date: 2024-05-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing projects start out due; the scheduler works through them at its own rate
+    op.add_column('projects', sa.Column('next_refresh_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+    op.create_index('ix_projects_next_refresh_at', 'projects', ['next_refresh_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_projects_next_refresh_at', table_name='projects')
+    op.drop_column('projects', 'next_refresh_at')
@@ -0,0 +1,35 @@
+"""Add project_pr_snapshots
+
+Revision ID: 012
+Revises: 011
+Create Date: 2024-06-20 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filled by the next refresh of each project
+    op.create_table('project_pr_snapshots',
+    sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('open_pr_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_open_pr_number', sa.Integer(), nullable=True),
+    sa.Column('last_open_pr_updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_open_pr_author', sa.Text(), nullable=True),
+    sa.Column('oldest_open_pr_created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('project_pr_snapshots')
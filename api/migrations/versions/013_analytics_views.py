@@ -0,0 +1,109 @@
+"""Add materialized views behind /analytics
+
+Revision ID: 013
+Revises: 012
+Create Date: 2024-07-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Every view gets a unique index so it can be refreshed CONCURRENTLY, without blocking readers
+    op.execute("""
+        CREATE MATERIALIZED VIEW analytics_summary AS
+        SELECT
+            1 AS id,
+            (SELECT count(*) FROM projects) AS repositories,
+            (SELECT count(*) FROM projects WHERE active_contributors_90d > 0) AS active_repositories,
+            (SELECT count(DISTINCT owner) FROM projects) AS owners,
+            (SELECT count(DISTINCT login) FROM project_contributors WHERE commits_90d > 0) AS active_contributors,
+            (SELECT count(*) FROM (
+                SELECT login FROM project_contributors
+                WHERE commits_90d > 0
+                GROUP BY login
+                HAVING count(*) > 1
+            ) shared) AS shared_contributors,
+            now() AS refreshed_at
+    """)
+    op.execute("CREATE UNIQUE INDEX uq_analytics_summary ON analytics_summary (id)")
+
+    op.execute("""
+        CREATE MATERIALIZED VIEW analytics_owner_activity AS
+        SELECT
+            p.owner,
+            count(DISTINCT p.id) AS repositories,
+            count(DISTINCT p.id) FILTER (WHERE p.active_contributors_90d > 0) AS active_repositories,
+            count(DISTINCT c.login) FILTER (WHERE c.commits_90d > 0) AS active_contributors,
+            coalesce(sum(c.commits_90d), 0) AS commits,
+            max(p.last_commit_at) AS last_commit_at
+        FROM projects p
+        LEFT JOIN project_contributors c ON c.project_id = p.id
+        GROUP BY p.owner
+    """)
+    op.execute("CREATE UNIQUE INDEX uq_analytics_owner_activity ON analytics_owner_activity (owner)")
+    op.execute("CREATE INDEX ix_analytics_owner_activity_active ON analytics_owner_activity (active_repositories, owner)")
+
+    op.execute("""
+        CREATE MATERIALIZED VIEW analytics_contributor_overlap AS
+        SELECT
+            c.login,
+            count(*) AS repositories,
+            count(DISTINCT p.owner) AS owners,
+            sum(c.commits_90d) AS commits,
+            max(c.last_commit_at) AS last_commit_at
+        FROM project_contributors c
+        JOIN projects p ON p.id = c.project_id
+        WHERE c.commits_90d > 0
+        GROUP BY c.login
+    """)
+    op.execute("CREATE UNIQUE INDEX uq_analytics_contributor_overlap ON analytics_contributor_overlap (login)")
+    op.execute("CREATE INDEX ix_analytics_contributor_overlap_repositories ON analytics_contributor_overlap (repositories, login)")
+
+    op.execute("""
+        CREATE MATERIALIZED VIEW analytics_activity_histogram AS
+        WITH ages AS (
+            SELECT CASE
+                WHEN last_commit_at IS NULL THEN 'never'
+                WHEN last_commit_at >= now() - interval '7 days' THEN 'week'
+                WHEN last_commit_at >= now() - interval '30 days' THEN 'month'
+                WHEN last_commit_at >= now() - interval '90 days' THEN 'quarter'
+                WHEN last_commit_at >= now() - interval '365 days' THEN 'year'
+                ELSE 'older'
+            END AS bucket
+            FROM projects
+        )
+        SELECT b.bucket, b.position, count(a.bucket) AS repositories
+        FROM (VALUES ('week', 1), ('month', 2), ('quarter', 3), ('year', 4), ('older', 5), ('never', 6))
+            AS b(bucket, position)
+        LEFT JOIN ages a ON a.bucket = b.bucket
+        GROUP BY b.bucket, b.position
+    """)
+    op.execute("CREATE UNIQUE INDEX uq_analytics_activity_histogram ON analytics_activity_histogram (bucket)")
+
+    op.execute("""
+        CREATE MATERIALIZED VIEW analytics_daily_commits AS
+        SELECT
+            day,
+            sum(commits) AS commits,
+            count(DISTINCT login) AS contributors,
+            count(DISTINCT project_id) AS repositories
+        FROM project_contributor_days
+        GROUP BY day
+    """)
+    op.execute("CREATE UNIQUE INDEX uq_analytics_daily_commits ON analytics_daily_commits (day)")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS analytics_daily_commits")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS analytics_activity_histogram")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS analytics_contributor_overlap")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS analytics_owner_activity")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS analytics_summary")
@@ -0,0 +1,46 @@
+"""Add a login-leading covering index and contributor_totals
+
+Revision ID: 014
+Revises: 013
+Create Date: 2024-07-10 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_project_contributors_login_covering', 'project_contributors', ['login'],
+                    postgresql_include=['project_id', 'commits_90d', 'last_commit_at'])
+    
+    op.create_table('contributor_totals',
+    sa.Column('login', sa.Text(), nullable=False),
+    sa.Column('repositories', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('commits', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_commit_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('login')
+    )
+    op.create_index('ix_contributor_totals_commits_login', 'contributor_totals', ['commits', 'login'])
+    op.create_index('ix_contributor_totals_repositories_login', 'contributor_totals', ['repositories', 'login'])
+    
+    # Backfill; from here on writes keep the rollup current for the logins they touch
+    op.execute("""
+        INSERT INTO contributor_totals (login, repositories, commits, last_commit_at)
+        SELECT login, count(*), sum(commits_90d), max(last_commit_at)
+        FROM project_contributors
+        GROUP BY login
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contributor_totals_repositories_login', table_name='contributor_totals')
+    op.drop_index('ix_contributor_totals_commits_login', table_name='contributor_totals')
+    op.drop_table('contributor_totals')
+    op.drop_index('ix_project_contributors_login_covering', table_name='project_contributors')
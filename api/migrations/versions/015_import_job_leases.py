@@ -0,0 +1,28 @@
+"""Add a lease to import_jobs so the worker process runs them
+
+Revision ID: 015
+Revises: 014
+Create Date: 2024-07-20 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Jobs left running by an API process that has since restarted have no lease, so the
+    # import worker resumes them on its first poll
+    op.add_column('import_jobs', sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_import_jobs_unfinished', 'import_jobs', ['created_at'],
+                    postgresql_where=sa.text("status IN ('pending','running')"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_import_jobs_unfinished', table_name='import_jobs')
+    op.drop_column('import_jobs', 'locked_until')
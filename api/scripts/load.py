@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Bulk data loader for AI Portfolio Console
+
+Loads projects and their contributors from NDJSON/CSV fixtures (the format of
+GET /projects/export), or generates a synthetic portfolio of any size for load testing:
+
+    python scripts/load.py fixtures.ndjson
+    python scripts/load.py export.csv
+    python scripts/load.py --synthetic 100000 --contributors 20
+
+Rows are generated in chunks, binary-COPYed into temporary staging tables, and moved
+into place with one INSERT ... SELECT ... ON CONFLICT DO NOTHING per table, so a chunk
+costs a handful of round trips however many rows it holds. Projects that already exist
+(same owner/name) are left untouched. Fixture contributors become a single day bucket
+on their last commit, so window totals always equal the buckets they are summed from.
+active_contributors_90d is left to the migration-004 trigger, like every other write.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Add the parent directory to the path so we can import our app
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from app.core.database import AsyncSessionLocal, async_engine
+from app.services.analytics import refresh_views
+from app.services.contributors import refresh_contributor_totals
+from app.services.github_client import contributor_window_start
+from app.services.refresh_schedule import refresh_interval
+
+PROJECT_COLUMNS = [
+    "id", "owner", "name", "html_url", "default_branch", "visibility", "last_commit_at", "last_actor",
+    "install_status", "history_watermark_oid", "history_watermark_at",
+    "contributor_window_start", "next_refresh_at",
+]
+DAY_COLUMNS = ["project_id", "login", "day", "commits", "last_commit_at"]
+CONTRIBUTOR_COLUMNS = ["id", "project_id", "login", "commits_90d", "last_commit_at"]
+
+STAGING = {
+    "load_projects": ("projects", PROJECT_COLUMNS),
+    "load_days": ("project_contributor_days", DAY_COLUMNS),
+    "load_contributors": ("project_contributors", CONTRIBUTOR_COLUMNS),
+}
+
+# Contributors of staged projects that were really inserted: staged ids are fresh, so
+# the join drops the rows of projects skipped by ON CONFLICT
+MOVE_STATEMENTS = [
+    """
+    INSERT INTO projects ({columns})
+    SELECT {columns} FROM load_projects
+    ON CONFLICT (owner, name) DO NOTHING
+    """.format(columns=", ".join(PROJECT_COLUMNS)),
+    """
+    INSERT INTO project_contributor_days ({columns})
+    SELECT {staged} FROM load_days d JOIN projects p ON p.id = d.project_id
+    ON CONFLICT DO NOTHING
+    """.format(columns=", ".join(DAY_COLUMNS), staged=", ".join(f"d.{c}" for c in DAY_COLUMNS)),
+    """
+    INSERT INTO project_contributors ({columns})
+    SELECT {staged} FROM load_contributors c JOIN projects p ON p.id = c.project_id
+    ON CONFLICT (project_id, login) DO NOTHING
+    """.format(columns=", ".join(CONTRIBUTOR_COLUMNS), staged=", ".join(f"c.{c}" for c in CONTRIBUTOR_COLUMNS)),
+]
+
+
+class LoadedProject:
+    """One project's rows for the three tables, kept consistent with each other"""
+
+    def __init__(self, data: Dict[str, Any], buckets: List[Tuple[str, date, int, datetime]]):
+        self.id = uuid.uuid4()
+        window_start = contributor_window_start().date()
+        merged: Dict[Tuple[str, date], List[Any]] = {}
+        for login, day, commits, at in buckets:
+            if day < window_start:
+                continue
+            bucket = merged.setdefault((login, day), [0, at])
+            bucket[0] += commits
+            bucket[1] = max(bucket[1], at)
+        self.days = [(self.id, login, day, commits, at) for (login, day), (commits, at) in merged.items()]
+
+        totals: Dict[str, List[Any]] = {}
+        for _, login, _, commits, at in self.days:
+            login_totals = totals.setdefault(login, [0, at])
+            login_totals[0] += commits
+            login_totals[1] = max(login_totals[1], at)
+        self.contributors = [
+            (uuid.uuid4(), self.id, login, commits, at) for login, (commits, at) in totals.items()
+        ]
+
+        last_commit_at = data.get("last_commit_at")
+        install_status = data.get("install_status") or "none"
+        # Spread first refreshes over their interval so a big load does not come due at once
+        interval = refresh_interval(last_commit_at, install_status)
+        next_refresh_at = datetime.now(timezone.utc) + interval * random.uniform(0.1, 1.0)
+        has_history = last_commit_at is not None
+        self.row = (
+            self.id,
+            data["owner"],
+            data["name"],
+            data.get("html_url") or f"https://github.com/{data['owner']}/{data['name']}",
+            data.get("default_branch") or "main",
+            data.get("visibility") or "public",
+            last_commit_at,
+            data.get("last_actor"),
+            install_status,
+            data.get("history_watermark_oid") or (uuid.uuid4().hex + uuid.uuid4().hex[:8] if has_history else None),
+            last_commit_at,
+            window_start if has_history else None,
+            next_refresh_at,
+        )
+
+
+def _time(value: Any) -> Optional[datetime]:
+    if value in (None, ""):
+        return None
+    if isinstance(value, datetime):
+        return value
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def from_fixture(record: Dict[str, Any]) -> LoadedProject:
+    """A project as exported, with contributors as a list or (from CSV) a JSON array"""
+    contributors = record.get("contributors") or []
+    if isinstance(contributors, str):
+        contributors = json.loads(contributors)
+
+    window_start = contributor_window_start()
+    buckets = []
+    for contributor in contributors:
+        at = _time(contributor.get("last_commit_at")) or window_start
+        buckets.append((contributor["login"], at.date(), int(contributor["commits"]), at))
+    data = {key: value for key, value in record.items() if value != ""}
+    data["last_commit_at"] = _time(data.get("last_commit_at"))
+    return LoadedProject(data, buckets)
+
+
+def read_fixture(path: Path) -> Iterator[LoadedProject]:
+    with path.open(newline="") as f:
+        if path.suffix == ".csv":
+            for record in csv.DictReader(f):
+                yield from_fixture(record)
+        else:
+            for line in f:
+                if line.strip():
+                    yield from_fixture(json.loads(line))
+
+
+def synthetic(projects: int, contributors: int, seed: int = 0) -> Iterator[LoadedProject]:
+    """
+    A portfolio shaped like real ones: owners with many repositories, logins shared
+    across repositories, commit counts skewed towards a few people, and some dormant projects.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    window_days = (now.date() - contributor_window_start().date()).days
+    owners = [f"org-{i:04d}" for i in range(max(1, projects // 200))]
+    logins = [f"dev-{i:06d}" for i in range(max(contributors, projects * contributors // 4))]
+
+    for i in range(projects):
+        buckets = []
+        dormant = rng.random() < 0.15
+        if not dormant:
+            for login in rng.sample(logins, min(len(logins), rng.randint(1, 2 * contributors))):
+                weight = rng.paretovariate(1.5)
+                for _ in range(min(window_days, max(1, int(weight * 2)))):
+                    at = now - timedelta(days=rng.uniform(0, window_days), seconds=rng.randint(0, 3600))
+                    buckets.append((login, at.date(), max(1, int(weight * rng.randint(1, 4))), at))
+        last = max(buckets, key=lambda bucket: bucket[3]) if buckets else None
+
+        yield LoadedProject({
+            "owner": rng.choice(owners),
+            "name": f"repo-{i:06d}",
+            "default_branch": rng.choice(["main", "main", "main", "master"]),
+            "visibility": "private" if rng.random() < 0.2 else "public",
+            "install_status": rng.choices(["app", "oauth", "none"], weights=[80, 15, 5])[0],
+            "last_commit_at": last[3] if last else now - timedelta(days=rng.randint(window_days + 1, 1000)),
+            "last_actor": last[0] if last else rng.choice(logins),
+        }, buckets)
+
+
+async def _copy_chunk(connection: AsyncConnection, chunk: List[LoadedProject]) -> Tuple[int, int]:
+    """
+    Stage one chunk with binary COPY and move it into place, contributor totals included, in
+    one transaction; a load that fails midway leaves the rollup matching what it loaded.
+    Returns (projects, contributors) inserted.
+    """
+    raw = (await connection.get_raw_connection()).driver_connection
+    rows = {
+        "load_projects": [project.row for project in chunk],
+        "load_days": [day for project in chunk for day in project.days],
+        "load_contributors": [contributor for project in chunk for contributor in project.contributors],
+    }
+    for staging, (_, columns) in STAGING.items():
+        if rows[staging]:
+            await raw.copy_records_to_table(staging, records=rows[staging], columns=columns)
+
+    counts = []
+    for statement in MOVE_STATEMENTS:
+        result = await connection.execute(text(statement))
+        counts.append(result.rowcount)
+    await refresh_contributor_totals(connection, {contributor[2] for contributor in rows["load_contributors"]})
+    # Staging tables are ON COMMIT DELETE ROWS: empty again for the next chunk
+    await connection.commit()
+    return counts[0], counts[2]
+
+
+async def load(projects: Iterable[LoadedProject], chunk_size: int = 1000, refresh_analytics: bool = True) -> None:
+    started = time.monotonic()
+    loaded_projects = loaded_contributors = 0
+    projects = iter(projects)
+
+    async with async_engine.connect() as connection:
+        for staging, (table, _) in STAGING.items():
+            await connection.execute(text(
+                f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+            ))
+
+        while chunk := list(islice(projects, chunk_size)):
+            inserted, contributors = await _copy_chunk(connection, chunk)
+            loaded_projects += inserted
+            loaded_contributors += contributors
+            print(f"  📦 {loaded_projects} projects, {loaded_contributors} contributors loaded")
+
+        await connection.execute(text(f"DROP TABLE {', '.join(STAGING)}"))
+        await connection.commit()
+
+    if refresh_analytics:
+        async with AsyncSessionLocal() as db:
+            await refresh_views(db)
+    print(f"✅ Loaded {loaded_projects} projects and {loaded_contributors} contributors in {time.monotonic() - started:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("fixture", nargs="?", type=Path, help="NDJSON (.ndjson/.jsonl) or CSV (.csv) file of projects")
+    source.add_argument("--synthetic", type=int, metavar="N", help="Generate N projects")
+    parser.add_argument("--contributors", type=int, default=10, metavar="M", help="Average contributors per synthetic project")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for synthetic data")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Projects staged per COPY")
+    parser.add_argument("--skip-analytics", action="store_true", help="Do not refresh the analytics views afterwards")
+    args = parser.parse_args()
+
+    if args.synthetic is not None:
+        random.seed(args.seed)
+        projects = synthetic(args.synthetic, args.contributors, args.seed)
+    else:
+        projects = read_fixture(args.fixture)
+    asyncio.run(load(projects, args.chunk_size, not args.skip_analytics))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import os
+import pytest
+import pytest_asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from app.core.config import settings
+from app.core.database import get_db
+from app.main import app
+from app.models import Base
+from app.routers.dependencies import get_github_client
+from app.services.github_client import GitHubClient
+
+# A scratch database, migrated to head and emptied before every test that uses it.
+# Tests taking the `pg_sessions` fixture are skipped when it is not set.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+def render_sql(statement, literal_binds: bool = False) -> str:
+    """A statement as Postgres would receive it"""
+    compile_kwargs = {"literal_binds": True} if literal_binds else {}
+    return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs=compile_kwargs))
+
+
+def session_factory_for(db):
+    """Stand-in for AsyncSessionLocal whose sessions are all `db`"""
+    @asynccontextmanager
+    async def session_factory():
+        yield db
+    return session_factory
+
+
+@pytest.fixture
+def use_db():
+    """Serve the given session from get_db for the rest of the test"""
+    def use(session):
+        async def override():
+            yield session
+        app.dependency_overrides[get_db] = override
+        return session
+
+    yield use
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def github_client():
+    """A mock GitHub client served to routes, which otherwise need the lifespan's"""
+    github_client = MagicMock(spec=GitHubClient)
+    app.dependency_overrides[get_github_client] = lambda: github_client
+    yield github_client
+    app.dependency_overrides.pop(get_github_client, None)
+
+
+@pytest.fixture
+def client(use_db):
+    """A test client for routes whose services are patched, so the session is never used"""
+    use_db(MagicMock())
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def migrated_database():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    config = Config()
+    config.set_main_option("script_location", str(Path(__file__).parent.parent / "migrations"))
+    config.set_main_option("sqlalchemy.url", TEST_DATABASE_URL)
+    with patch.object(settings, "database_url", TEST_DATABASE_URL):
+        command.upgrade(config, "head")
+    return TEST_DATABASE_URL
+
+
+@pytest_asyncio.fixture
+async def pg_sessions(migrated_database):
+    """Sessions on the empty, migrated test database; each opens its own connection"""
+    engine = create_async_engine(
+        make_url(migrated_database).set(drivername="postgresql+asyncpg"),
+        poolclass=NullPool
+    )
+    async with engine.begin() as connection:
+        tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+        await connection.execute(text(f"TRUNCATE {tables} CASCADE"))
+
+    yield async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    await engine.dispose()
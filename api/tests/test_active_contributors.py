@@ -0,0 +1,70 @@
+import pytest
+from datetime import datetime, timezone
+from sqlalchemy import and_, delete, insert, select, update
+from app.models import Project, ProjectContributor
+from app.services.project_service import apply_filters
+
+
+async def _counts(db, *projects) -> list:
+    """active_contributors_90d as the trigger left it"""
+    rows = dict((await db.execute(select(Project.id, Project.active_contributors_90d))).all())
+    return [rows[project.id] for project in projects]
+
+
+class TestActiveContributorsTrigger:
+    """projects.active_contributors_90d follows every write to project_contributors (migration 004)"""
+
+    @pytest.mark.asyncio
+    async def test_count_follows_inserts_updates_and_deletes(self, pg_sessions):
+        """Test only contributors with commits in the window are counted, through every kind of write"""
+        now = datetime.now(timezone.utc)
+        api = Project(owner="acme", name="api", html_url="https://github.com/acme/api")
+        web = Project(owner="acme", name="web", html_url="https://github.com/acme/web")
+        async with pg_sessions() as db:
+            db.add_all([api, web])
+            await db.flush()
+
+            await db.execute(insert(ProjectContributor), [
+                {"project_id": api.id, "login": "alice", "commits_90d": 3, "last_commit_at": now},
+                {"project_id": api.id, "login": "bob", "commits_90d": 1, "last_commit_at": now},
+                {"project_id": api.id, "login": "carol", "commits_90d": 0, "last_commit_at": now},
+            ])
+            assert await _counts(db, api, web) == [2, 0]
+
+            def contributor(login):
+                return and_(ProjectContributor.project_id == api.id, ProjectContributor.login == login)
+
+            # More commits from someone already counted change nothing
+            await db.execute(update(ProjectContributor).where(contributor("alice")).values(commits_90d=5))
+            assert await _counts(db, api, web) == [2, 0]
+
+            await db.execute(update(ProjectContributor).where(contributor("bob")).values(commits_90d=0))
+            await db.execute(update(ProjectContributor).where(contributor("carol")).values(commits_90d=2))
+            assert await _counts(db, api, web) == [2, 0]
+
+            await db.execute(update(ProjectContributor).where(contributor("carol")).values(project_id=web.id))
+            assert await _counts(db, api, web) == [1, 1]
+
+            await db.execute(delete(ProjectContributor).where(ProjectContributor.login.in_(["alice", "bob"])))
+            assert await _counts(db, api, web) == [0, 1]
+            await db.commit()
+
+    @pytest.mark.asyncio
+    async def test_contributor_filters_use_the_maintained_count(self, pg_sessions):
+        """Test min/max_contributors filter on counts only the trigger ever wrote"""
+        now = datetime.now(timezone.utc)
+        projects = {name: Project(owner="acme", name=name, html_url=f"https://github.com/acme/{name}") for name in ("api", "web")}
+        async with pg_sessions() as db:
+            db.add_all(projects.values())
+            await db.flush()
+            await db.execute(insert(ProjectContributor), [
+                {"project_id": projects[name].id, "login": login, "commits_90d": 1, "last_commit_at": now}
+                for name, logins in (("api", ["alice", "bob", "carol"]), ("web", ["alice"]))
+                for login in logins
+            ])
+            await db.commit()
+
+            busy = (await db.scalars(apply_filters(select(Project.name), min_contributors=2))).all()
+            quiet = (await db.scalars(apply_filters(select(Project.name), max_contributors=1))).all()
+
+        assert (busy, quiet) == (["api"], ["web"])
@@ -0,0 +1,105 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+from app.models.project import Project
+from app.services.analytics import AnalyticsRefresher, refresh_views, views
+from app.workers.refresh_worker import ClaimedRefresh, RefreshWorker
+from .conftest import session_factory_for
+
+
+def _claimed() -> ClaimedRefresh:
+    return ClaimedRefresh(1, uuid4(), 1, datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+
+class TestRefreshViews:
+    @pytest.mark.asyncio
+    async def test_refreshes_every_view_concurrently(self):
+        """Test each view is refreshed without blocking readers, in one transaction"""
+        db = AsyncMock()
+        db.scalar.return_value = True
+
+        assert await refresh_views(db) is True
+
+        statements = [str(call.args[0]) for call in db.execute.await_args_list]
+        assert statements == [f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view.name}" for view in views.sorted_tables]
+        assert len(statements) == 5
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_skips_while_another_process_refreshes(self):
+        """Test the advisory lock keeps refreshes from piling up across workers"""
+        db = AsyncMock()
+        db.scalar.return_value = False
+
+        assert await refresh_views(db) is False
+
+        db.execute.assert_not_awaited()
+        db.rollback.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_refresher_is_throttled(self):
+        """Test batches finishing within the interval share one refresh"""
+        db = AsyncMock()
+        db.scalar.return_value = True
+        refresher = AnalyticsRefresher(session_factory_for(db), min_interval=300)
+
+        assert await refresher.maybe_refresh() is True
+        assert await refresher.maybe_refresh() is False
+
+        db.commit.assert_awaited_once()
+
+
+class TestWorkerTrigger:
+    @pytest.mark.asyncio
+    async def test_refreshed_batch_refreshes_analytics(self):
+        """Test a batch that refreshed projects brings the views up to date"""
+        item = _claimed()
+        analytics = AsyncMock()
+        worker = RefreshWorker(AsyncMock(), session_factory=session_factory_for(AsyncMock()), analytics=analytics)
+
+        with patch("app.workers.refresh_worker.ProjectService.refresh_projects",
+                   AsyncMock(return_value={str(item.project_id): Project()})):
+            await worker.process([item])
+
+        analytics.maybe_refresh.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_leaves_analytics_alone(self):
+        """Test nothing is recomputed when no project changed"""
+        item = _claimed()
+        analytics = AsyncMock()
+        worker = RefreshWorker(AsyncMock(), session_factory=session_factory_for(AsyncMock()), analytics=analytics)
+
+        with patch("app.workers.refresh_worker.ProjectService.refresh_projects",
+                   AsyncMock(side_effect=Exception("GraphQL request failed: 502"))):
+            await worker.process([item])
+
+        analytics.maybe_refresh.assert_not_awaited()
+
+
+class TestAnalyticsApi:
+    def test_summary(self, client):
+        """Test the summary is served from the view's single row"""
+        summary = {
+            "repositories": 12, "active_repositories": 9, "owners": 3,
+            "active_contributors": 40, "shared_contributors": 7,
+            "refreshed_at": datetime(2024, 1, 1, tzinfo=timezone.utc)
+        }
+        with patch("app.routers.analytics.AnalyticsService.get_summary", AsyncMock(return_value=summary)):
+            response = client.get("/analytics/summary")
+
+        assert response.status_code == 200
+        assert response.json()["active_contributors"] == 40
+
+    def test_overlap_passes_filters(self, client):
+        """Test overlap queries pass their threshold and limit through"""
+        get_overlap = AsyncMock(return_value=[
+            {"login": "alice", "repositories": 4, "owners": 2, "commits": 31, "last_commit_at": None}
+        ])
+        with patch("app.routers.analytics.AnalyticsService.get_overlap", get_overlap):
+            response = client.get("/analytics/overlap?min_repositories=3&limit=10")
+
+        assert response.status_code == 200
+        assert response.json()["contributors"][0]["login"] == "alice"
+        get_overlap.assert_awaited_once_with(3, 10)
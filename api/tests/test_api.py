@@ -1,7 +1,8 @@
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, AsyncMock
 from app.main import app
+from app.routers.dependencies import get_github_client
 
 client = TestClient(app)
 
@@ -14,6 +15,21 @@ class TestHealthEndpoint:
         assert response.json() == {"status": "ok"}
 
 
+class TestLifespan:
+    def test_routes_share_the_lifespan_github_client(self):
+        """Test one pooled HTTP client serves every request and is closed on shutdown"""
+        http_client = AsyncMock()
+        with patch("app.main.create_http_client", return_value=http_client):
+            with TestClient(app) as lifespan_client:
+                assert lifespan_client.get("/github/rate-limits").status_code == 200
+                github_client = get_github_client(Mock(app=app))
+                assert github_client is get_github_client(Mock(app=app))
+                assert github_client._http_client is http_client
+                http_client.aclose.assert_not_awaited()
+
+        http_client.aclose.assert_awaited_once()
+
+
 class TestProjectsEndpoint:
     @patch('app.routers.projects.get_db')
     def test_get_projects_empty(self, mock_get_db):
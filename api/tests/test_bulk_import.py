@@ -0,0 +1,245 @@
+import asyncio
+import httpx
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock, patch
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from app.core.config import settings
+from app.main import app
+from app.models.import_job import ImportJob
+from app.services.bulk_import import BulkImporter, _item
+from app.services.github_client import GitHubClient
+from app.services.project_service import ProjectService
+from app.workers.import_worker import ImportWorker, claim_statement
+from .conftest import render_sql, session_factory_for
+
+
+def _fetched(name: str, days_ago: int = 1) -> dict:
+    committed = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    return {
+        "owner": "acme", "name": name, "html_url": f"https://github.com/acme/{name}",
+        "default_branch": "main", "visibility": "public", "last_commit_at": committed,
+        "last_actor": "alice", "install_status": "app", "head_oid": f"{name}-head",
+        "contributors": [], "last_open_pr": None,
+        "commit_days": [
+            {"login": "alice", "day": committed.date(), "commits": 2, "last_commit_at": committed},
+            {"login": "alice", "day": committed.date() - timedelta(days=1), "commits": 1, "last_commit_at": committed - timedelta(days=1)},
+            {"login": "bob", "day": date(2000, 1, 1), "commits": 5, "last_commit_at": datetime(2000, 1, 1, tzinfo=timezone.utc)},
+        ],
+    }
+
+
+@pytest.fixture
+def db(use_db, github_client):
+    session = AsyncMock()
+    session.add = Mock()
+
+    async def refresh(job):
+        job.id = uuid4()
+        job.created_at = job.updated_at = datetime.now(timezone.utc)
+
+    session.refresh.side_effect = refresh
+    return use_db(session)
+
+
+class TestBulkImportEndpoint:
+    def test_creates_job_for_the_worker(self, db):
+        """Test the request returns a pending job with one item per distinct URL, left to the import worker"""
+        with patch.object(BulkImporter, "run", AsyncMock()) as run:
+            response = TestClient(app).post("/projects/bulk", json={"repo_urls": [
+                "https://github.com/acme/api", "https://github.com/acme/api/", "https://github.com/acme/web"
+            ]})
+
+        assert response.status_code == 202
+        body = response.json()
+        assert body["status"] == "pending"
+        assert [item["repo_url"] for item in body["items"]] == ["https://github.com/acme/api", "https://github.com/acme/web"]
+        assert all(item["status"] == "pending" for item in body["items"])
+        db.add.assert_called_once()
+        run.assert_not_awaited()
+
+    @pytest.mark.parametrize("payload", [
+        {},
+        {"repo_urls": ["https://github.com/acme/api"], "org": "acme"},
+        {"repo_urls": ["https://gitlab.com/acme/api"]},
+    ])
+    def test_rejects_invalid_requests(self, db, payload):
+        """Test exactly one source of valid GitHub repositories is required"""
+        response = TestClient(app).post("/projects/bulk", json=payload)
+
+        assert response.status_code == 422
+
+    def test_unknown_job(self, db):
+        """Test polling a job that does not exist"""
+        db.scalar.return_value = None
+
+        response = TestClient(app).get(f"/projects/bulk/{uuid4()}")
+
+        assert response.status_code == 404
+
+
+class TestClaim:
+    def test_claims_pending_jobs_and_lapsed_leases(self):
+        """Test the oldest waiting job is leased, including one whose worker stopped renewing it"""
+        sql = render_sql(claim_statement(300))
+
+        assert "import_jobs.status = %(status_1)s OR import_jobs.status = %(status_2)s AND " \
+               "(import_jobs.locked_until IS NULL OR import_jobs.locked_until < now())" in sql
+        assert "ORDER BY import_jobs.created_at" in sql
+        assert "LIMIT %(param_1)s FOR UPDATE SKIP LOCKED" in sql
+        assert sql.endswith("RETURNING import_jobs.id")
+
+    @pytest.mark.asyncio
+    async def test_only_unleased_jobs_are_claimed(self, pg_sessions):
+        """Test a running job is left to its worker until the lease lapses, then resumed"""
+        now = datetime.now(timezone.utc)
+        async with pg_sessions() as db:
+            leased = ImportJob(status="running", locked_until=now + timedelta(minutes=5), created_at=now - timedelta(hours=2))
+            abandoned = ImportJob(status="running", locked_until=now - timedelta(minutes=1), created_at=now - timedelta(hours=1))
+            pending = ImportJob(status="pending", created_at=now)
+            done = ImportJob(status="completed", created_at=now - timedelta(hours=3))
+            db.add_all([leased, abandoned, pending, done])
+            await db.commit()
+
+        worker = ImportWorker(Mock(), pg_sessions)
+        claimed = [await worker.claim(), await worker.claim(), await worker.claim()]
+
+        assert claimed == [abandoned.id, pending.id, None]
+        async with pg_sessions() as db:
+            jobs = {job.id: job for job in await db.scalars(select(ImportJob))}
+        assert jobs[pending.id].status == "running"
+        assert jobs[pending.id].locked_until > now
+
+
+class TestRun:
+    @staticmethod
+    def _job(processed: int) -> ImportJob:
+        urls = [f"https://github.com/acme/{name}" for name in ("a", "b", "c")]
+        return ImportJob(id=uuid4(), status="running", items=[_item(url) for url in urls], total=3, processed=processed)
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_the_last_finished_chunk(self):
+        """Test a job taken over from a dead worker skips the chunks it already recorded"""
+        job = self._job(processed=2)
+        db = AsyncMock()
+        db.scalar.return_value = job
+        github_client = Mock(list_owner_repositories=AsyncMock())
+        importer = BulkImporter(github_client, session_factory_for(db))
+
+        with patch.object(settings, "bulk_import_chunk_size", 1), \
+             patch.object(BulkImporter, "_import_chunk", AsyncMock()) as import_chunk:
+            await importer.run(job.id)
+
+        assert [call.args[2:] for call in import_chunk.await_args_list] == [(2, 3)]
+        github_client.list_owner_repositories.assert_not_called()
+        assert job.status == "completed"
+        assert job.locked_until is None
+        assert job.finished_at is not None
+
+    @pytest.mark.asyncio
+    async def test_stopping_releases_the_lease(self):
+        """Test a worker shutting down leaves the job running but claimable, not failed"""
+        job = self._job(processed=0)
+        job.locked_until = datetime.now(timezone.utc)
+        db = AsyncMock()
+        db.scalar.return_value = job
+        stop = asyncio.Event()
+        stop.set()
+
+        with patch.object(BulkImporter, "_import_chunk", AsyncMock()) as import_chunk:
+            await BulkImporter(Mock(), session_factory_for(db)).run(job.id, stop)
+
+        import_chunk.assert_not_awaited()
+        assert job.status == "running"
+        assert job.locked_until is None
+        assert job.finished_at is None
+
+
+class TestImportChunk:
+    @pytest.mark.asyncio
+    async def test_reports_each_repository(self):
+        """Test tracked repositories are skipped, failures reported and the rest inserted"""
+        existing_id, created_id = uuid4(), uuid4()
+        db = AsyncMock()
+        db.execute.return_value = Mock(all=Mock(return_value=[(existing_id, "acme", "old")]))
+        github_client = GitHubClient(Mock())
+        github_client.fetch_many = AsyncMock(return_value={
+            "https://github.com/acme/new": _fetched("new"),
+            "https://github.com/acme/gone": Exception("Failed to fetch repository: 404"),
+        })
+        job = ImportJob(items=[
+            _item("https://github.com/acme/old"),
+            _item("https://github.com/acme/new"),
+            _item("https://github.com/acme/gone"),
+            _item("not a url"),
+        ], total=4, processed=0)
+
+        with patch.object(ProjectService, "import_projects", AsyncMock(return_value={("acme", "new"): created_id})):
+            await BulkImporter(github_client)._import_chunk(db, job, 0, 100)
+
+        github_client.fetch_many.assert_awaited_once_with(["https://github.com/acme/new", "https://github.com/acme/gone"])
+        assert [(item["status"], item["project_id"]) for item in job.items] == [
+            ("exists", str(existing_id)), ("created", str(created_id)), ("failed", None), ("failed", None)
+        ]
+        assert job.processed == 4
+
+
+class TestImportProjects:
+    @pytest.mark.asyncio
+    async def test_one_insert_per_table(self):
+        """Test a chunk costs one multi-row INSERT per table, not a round trip per project"""
+        db = AsyncMock()
+        db.execute.return_value = Mock(all=Mock(return_value=[(uuid4(), "acme", "api"), (uuid4(), "acme", "web")]))
+
+        inserted = await ProjectService(db, Mock()).import_projects([_fetched("api"), _fetched("web")])
+
+        assert set(inserted) == {("acme", "api"), ("acme", "web")}
+        assert db.execute.await_count == 6
+        projects, days, contributors, *totals = [call.args for call in db.execute.await_args_list]
+        assert len(projects[1]) == 2
+        assert days[0].table.name == "project_contributor_days"
+        # Buckets outside the window are not stored, and totals are summed per login
+        assert len(days[1]) == 4
+        assert contributors[0].table.name == "project_contributors"
+        assert sorted((row["login"], row["commits_90d"]) for row in contributors[1]) == [("alice", 3), ("alice", 3)]
+        # The rollup rows of every imported login are locked, then recomputed together
+        assert [render_sql(args[0]).split()[0] for args in totals] == ["INSERT", "SELECT", "WITH"]
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_existing_projects_get_no_contributors(self):
+        """Test rows skipped by ON CONFLICT are not given contributor rows"""
+        db = AsyncMock()
+        db.execute.return_value = Mock(all=Mock(return_value=[]))
+
+        inserted = await ProjectService(db, Mock()).import_projects([_fetched("api")])
+
+        assert inserted == {}
+        db.execute.assert_awaited_once()
+
+
+class TestListOwnerRepositories:
+    @pytest.mark.asyncio
+    async def test_pages_through_installation_repositories(self):
+        """Test every page is read and repositories of other owners are dropped"""
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/orgs/acme/installation":
+                return httpx.Response(200, json={"id": 7})
+            if request.url.params.get("page") == "2":
+                return httpx.Response(200, json={"repositories": [
+                    {"owner": {"login": "acme"}, "html_url": "https://github.com/acme/web"}
+                ]})
+            return httpx.Response(200, json={"repositories": [
+                {"owner": {"login": "Acme"}, "html_url": "https://github.com/Acme/api"},
+                {"owner": {"login": "other"}, "html_url": "https://github.com/other/lib"},
+            ]}, headers={"Link": '<https://api.github.com/installation/repositories?per_page=100&page=2>; rel="next"'})
+
+        client = GitHubClient(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        client._generate_jwt_token = Mock(return_value="jwt")
+        client._installation_tokens.get_or_refresh = AsyncMock(return_value="token")
+
+        repos = await client.list_owner_repositories("acme")
+
+        assert repos == ["https://github.com/Acme/api", "https://github.com/acme/web"]
@@ -0,0 +1,189 @@
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+from sqlalchemy import select
+from app.core.config import settings
+from app.models import Project, ProjectContributor, ProjectContributorDay
+from app.services.contributor_window import ContributorWindow
+from app.services.github_client import contributor_window_start
+from .conftest import render_sql
+
+
+def _statements(db) -> list:
+    return [render_sql(call.args[0]) for call in db.execute.await_args_list]
+
+
+def _project(start: date = None):
+    return SimpleNamespace(id=uuid4(), contributor_window_start=start or contributor_window_start().date())
+
+
+def _days(statement) -> list:
+    """The day bounds bound into a statement, earliest first"""
+    return sorted(value for value in statement.compile().params.values() if isinstance(value, date))
+
+
+class TestContributorWrites:
+    @pytest.mark.asyncio
+    async def test_record_adds_to_totals_in_one_upsert(self):
+        """Test new commits are added with a single multi-row INSERT ... ON CONFLICT"""
+        db = AsyncMock()
+        now = datetime.now(timezone.utc)
+        days = [
+            {"login": login, "day": now.date(), "commits": 1, "last_commit_at": now}
+            for login in ("alice", "bob")
+        ]
+
+        await ContributorWindow(db).record(_project(), days)
+
+        buckets, contributors = _statements(db)
+        assert "INSERT INTO project_contributors" in contributors
+        assert "ON CONFLICT (project_id, login) DO UPDATE SET commits_90d = (project_contributors.commits_90d + excluded.commits_90d)" in contributors
+        assert contributors.count("gen_random_uuid()") == 2
+
+    @pytest.mark.asyncio
+    async def test_rebuild_skips_unchanged_and_drops_departed(self):
+        """Test a rebuild is one statement that only writes rows whose totals change"""
+        db = AsyncMock()
+
+        await ContributorWindow(db).rebuild(_project(), [])
+
+        contributors = _statements(db)[-1]
+        assert contributors.startswith("WITH left_window AS \n(DELETE FROM project_contributors")
+        assert "project_contributors.login NOT IN" in contributors
+        assert "IS DISTINCT FROM (excluded.commits_90d, excluded.last_commit_at)" in contributors
+        db.delete.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_slide_expires_days_in_one_statement(self):
+        """Test expired days are subtracted and emptied contributors deleted together"""
+        db = AsyncMock()
+        project = _project(contributor_window_start().date() - timedelta(days=2))
+
+        await ContributorWindow(db).slide(project)
+
+        expire = _statements(db)[0]
+        assert "removed AS \n(DELETE FROM project_contributors USING expired" in expire
+        assert "project_contributors.commits_90d <= expired.commits" in expire
+        assert "UPDATE project_contributors SET commits_90d=(project_contributors.commits_90d - expired.commits)" in expire
+        assert project.contributor_window_start == contributor_window_start().date()
+
+
+class TestWindowRollover:
+    @pytest.mark.asyncio
+    async def test_same_day_moves_nothing(self):
+        """Test a project already on today's window only has old buckets pruned"""
+        db = AsyncMock()
+        project = _project()
+
+        await ContributorWindow(db).slide(project)
+
+        [prune] = _statements(db)
+        assert prune.startswith("DELETE FROM project_contributor_days")
+        db.scalars.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_rollover_subtracts_only_the_days_that_left(self):
+        """Test the buckets between the old and new window start are taken off the totals"""
+        db = AsyncMock()
+        db.scalars.return_value = ["alice"]
+        new_start = contributor_window_start().date()
+        project = _project(new_start - timedelta(days=3))
+
+        window = ContributorWindow(db)
+        await window.slide(project)
+
+        subtract = db.execute.await_args_list[0].args[0]
+        assert "UPDATE project_contributors SET commits_90d=(project_contributors.commits_90d - expired.commits)" in render_sql(subtract)
+        assert _days(subtract) == [new_start - timedelta(days=3), new_start]
+        assert window.touched == {"alice"}
+
+    @pytest.mark.asyncio
+    async def test_widened_window_adds_days_back(self):
+        """Test growing CONTRIBUTOR_WINDOW_DAYS adds the kept buckets now inside it"""
+        db = AsyncMock()
+        db.scalars.return_value = []
+        old_start = contributor_window_start().date()
+        project = _project(old_start)
+
+        with patch.object(settings, "contributor_window_days", settings.contributor_window_days + 5):
+            await ContributorWindow(db).slide(project)
+
+        add = db.execute.await_args_list[0].args[0]
+        assert "commits_90d = (project_contributors.commits_90d + excluded.commits_90d)" in render_sql(add)
+        assert _days(add) == [old_start - timedelta(days=5), old_start]
+        assert project.contributor_window_start == old_start - timedelta(days=5)
+
+
+class TestWindowTotals:
+    """The totals left behind, on a real database"""
+
+    @staticmethod
+    async def _totals(db, project) -> dict:
+        # Columns rather than entities, so rows loaded earlier in the session are not reused
+        rows = await db.execute(select(ProjectContributor.login, ProjectContributor.commits_90d).where(
+            ProjectContributor.project_id == project.id
+        ))
+        return dict(rows.all())
+
+    @staticmethod
+    async def _project_with_buckets(db, window_start: date, buckets: dict) -> Project:
+        """A project whose totals are the sums of `buckets` ({(login, day): commits}) from window_start"""
+        project = Project(owner="acme", name="api", html_url="https://github.com/acme/api", contributor_window_start=window_start)
+        db.add(project)
+        await db.flush()
+
+        at = datetime.now(timezone.utc)
+        totals = {}
+        for (login, day), commits in buckets.items():
+            db.add(ProjectContributorDay(project_id=project.id, login=login, day=day, commits=commits, last_commit_at=at))
+            if day >= window_start:
+                totals[login] = totals.get(login, 0) + commits
+        db.add_all([
+            ProjectContributor(project_id=project.id, login=login, commits_90d=commits, last_commit_at=at)
+            for login, commits in totals.items()
+        ])
+        await db.commit()
+        return project
+
+    @pytest.mark.asyncio
+    async def test_rollover_leaves_the_sum_of_the_window(self, pg_sessions):
+        """Test expired days are subtracted, emptied contributors removed and the rest untouched"""
+        start = contributor_window_start().date()
+        today = datetime.now(timezone.utc).date()
+        async with pg_sessions() as db:
+            project = await self._project_with_buckets(db, start - timedelta(days=2), {
+                ("alice", start - timedelta(days=2)): 3,
+                ("alice", start): 1,
+                ("bob", start - timedelta(days=1)): 2,
+                ("bob", today): 4,
+                ("carol", start - timedelta(days=1)): 5,
+            })
+
+            await ContributorWindow(db).slide(project)
+            await db.commit()
+
+            assert await self._totals(db, project) == {"alice": 1, "bob": 4}
+            assert project.contributor_window_start == start
+
+    @pytest.mark.asyncio
+    async def test_widening_then_narrowing_round_trips(self, pg_sessions):
+        """Test days added back by a wider window are subtracted again when it shrinks"""
+        start = contributor_window_start().date()
+        async with pg_sessions() as db:
+            project = await self._project_with_buckets(db, start, {
+                ("alice", start - timedelta(days=3)): 2,
+                ("alice", start): 1,
+                ("bob", start - timedelta(days=1)): 6,
+            })
+            assert await self._totals(db, project) == {"alice": 1}
+
+            with patch.object(settings, "contributor_window_days", settings.contributor_window_days + 5):
+                await ContributorWindow(db).slide(project)
+            await db.commit()
+            assert await self._totals(db, project) == {"alice": 3, "bob": 6}
+
+            await ContributorWindow(db).slide(project)
+            await db.commit()
+            assert await self._totals(db, project) == {"alice": 1}
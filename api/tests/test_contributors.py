@@ -0,0 +1,136 @@
+import asyncio
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+from uuid import uuid4
+from sqlalchemy import insert
+from app.models import ContributorTotal, Project, ProjectContributor
+from app.services.contributor_window import ContributorWindow
+from app.services.contributors import lock_statements, refresh_contributor_totals, totals_statement
+from app.services.github_client import contributor_window_start
+from app.services.project_service import ProjectService
+from .conftest import render_sql
+
+
+class TestContributorTotals:
+    def test_rows_are_locked_before_the_recompute(self):
+        """Test missing rollup rows are created and every row is locked, in login order"""
+        create, lock = [render_sql(statement) for statement in lock_statements(["bob", "alice"])]
+
+        assert "FROM unnest(%(logins)s::TEXT[]) AS login ORDER BY login ON CONFLICT (login) DO NOTHING" in create
+        assert lock.endswith("ORDER BY contributor_totals.login FOR UPDATE")
+
+    def test_recompute_is_one_statement(self):
+        """Test touched logins are upserted or zeroed together"""
+        sql = render_sql(totals_statement(["bob", "alice"]))
+
+        assert "project_contributors.login = ANY (%(logins)s::TEXT[])" in sql
+        assert "gone AS \n(UPDATE contributor_totals SET repositories=" in sql
+        assert "ON CONFLICT (login) DO UPDATE" in sql
+        assert "IS DISTINCT FROM (excluded.repositories, excluded.commits, excluded.last_commit_at)" in sql
+        assert totals_statement(["bob", "alice"]).compile().params["logins"] == ["alice", "bob"]
+
+    @pytest.mark.asyncio
+    async def test_window_reports_touched_logins(self):
+        """Test recorded commits and departed contributors both mark their logins"""
+        db = AsyncMock()
+        db.scalars.return_value = ["carol"]
+        now = datetime.now(timezone.utc)
+        project = SimpleNamespace(id=uuid4(), contributor_window_start=contributor_window_start().date())
+
+        window = ContributorWindow(db)
+        await window.record(project, [{"login": "alice", "day": now.date(), "commits": 1, "last_commit_at": now}])
+        await window.rebuild(project, [{"login": "bob", "day": now.date(), "commits": 2, "last_commit_at": now}])
+
+        # carol had commits before the rebuild and none after it
+        assert window.touched == {"alice", "bob", "carol"}
+
+    @pytest.mark.asyncio
+    async def test_refresh_updates_rollup_before_commit(self):
+        """Test the rollup is written in the same transaction as the contributors"""
+        db = AsyncMock()
+        service = ProjectService(db, Mock())
+        service._touched_logins.update({"alice", "bob"})
+
+        await service._save_contributor_totals()
+
+        statement = db.execute.await_args.args[0]
+        assert statement.table.name == "contributor_totals"
+        assert service._touched_logins == set()
+
+    @pytest.mark.asyncio
+    async def test_delete_recomputes_without_the_project(self):
+        """Test a deleted project's contributors lose it from their totals"""
+        db = AsyncMock()
+        db.execute.return_value = Mock(first=Mock(return_value=("acme", "api")))
+        project_id = uuid4()
+
+        assert await ProjectService(db, Mock()).delete_project(project_id)
+
+        *totals, deleted = [render_sql(call.args[0]) for call in db.execute.await_args_list]
+        assert totals[1].endswith("FOR UPDATE")
+        assert totals[2].startswith("WITH source AS")
+        assert "project_contributors.project_id != " in totals[2]
+        assert deleted.startswith("DELETE FROM projects")
+
+
+class TestContributorTotalsConcurrency:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("existing", [False, True])
+    async def test_interleaved_writers_keep_both_changes(self, pg_sessions, existing):
+        """Test two transactions adding commits for one login both end up in its totals"""
+        now = datetime.now(timezone.utc)
+        api = Project(owner="acme", name="api", html_url="https://github.com/acme/api")
+        web = Project(owner="acme", name="web", html_url="https://github.com/acme/web")
+        async with pg_sessions() as db:
+            db.add_all([api, web])
+            if existing:
+                db.add(ContributorTotal(login="alice"))
+            await db.commit()
+
+        async with pg_sessions() as one, pg_sessions() as two:
+            await one.execute(insert(ProjectContributor).values(project_id=api.id, login="alice", commits_90d=3, last_commit_at=now))
+            await two.execute(insert(ProjectContributor).values(project_id=web.id, login="alice", commits_90d=4, last_commit_at=now))
+            await refresh_contributor_totals(one, ["alice"])
+            # The second recompute waits for the first writer, then reads its commit
+            second = asyncio.create_task(refresh_contributor_totals(two, ["alice"]))
+            await asyncio.sleep(0.5)
+            assert not second.done()
+            await one.commit()
+            await second
+            await two.commit()
+
+        async with pg_sessions() as db:
+            total = await db.get(ContributorTotal, "alice")
+        assert (total.repositories, total.commits) == (2, 7)
+
+
+class TestContributorsApi:
+    def test_profile_lists_repositories(self, client):
+        """Test a login's repositories are returned with its totals"""
+        profile = {
+            "login": "alice", "repositories": 1, "commits": 4, "last_commit_at": None,
+            "projects": [{
+                "id": str(uuid4()), "owner": "acme", "name": "api",
+                "html_url": "https://github.com/acme/api", "commits": 4, "last_commit_at": None
+            }]
+        }
+        with patch("app.routers.contributors.ContributorService.get_contributor", AsyncMock(return_value=profile)):
+            response = client.get("/contributors/alice")
+
+        assert response.status_code == 200
+        assert response.json()["projects"][0]["name"] == "api"
+
+    def test_unknown_login_is_not_found(self, client):
+        """Test a login active nowhere gets a 404"""
+        with patch("app.routers.contributors.ContributorService.get_contributor", AsyncMock(return_value=None)):
+            response = client.get("/contributors/nobody")
+
+        assert response.status_code == 404
+
+    def test_leaderboard_rejects_unknown_order(self, client):
+        """Test only orders backed by an index are accepted"""
+        response = client.get("/contributors?order=login_asc")
+
+        assert response.status_code == 422
@@ -0,0 +1,127 @@
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.services.etag_cache import CachedResponse, ETagCache
+from app.services.github_client import GitHubClient
+from .conftest import session_factory_for
+
+
+def _session_factory(row=None):
+    """Stand-in for AsyncSessionLocal returning `row` from every lookup"""
+    db = AsyncMock()
+    db.execute.return_value = MagicMock(first=MagicMock(return_value=row))
+    return session_factory_for(db), db
+
+
+def _github(responses):
+    """Serve repository and commits requests from per-path handlers, recording conditional headers"""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.path, request.headers.get("If-None-Match")))
+        return responses[request.url.path](request)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), seen
+
+
+REPO = {"full_name": "owner/repo", "private": False, "html_url": "https://github.com/owner/repo", "default_branch": "main"}
+COMMITS = [{"sha": "abc", "commit": {"committer": {"date": "2024-01-01T00:00:00Z"}}, "author": {"login": "alice"}}]
+
+
+class TestETagCache:
+    @pytest.mark.asyncio
+    async def test_reads_through_to_database_once(self):
+        """Test a persisted entry is loaded once and then served from memory"""
+        factory, db = _session_factory(row=('"v1"', None, {"id": 1}))
+        cache = ETagCache(factory)
+
+        first = await cache.get("installation:1", "https://api.github.com/repos/o/r")
+        second = await cache.get("installation:1", "https://api.github.com/repos/o/r")
+
+        assert first == second == CachedResponse('"v1"', None, {"id": 1})
+        db.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_entries_are_per_scope(self):
+        """Test one installation's cached body is never served to another"""
+        factory, _ = _session_factory()
+        cache = ETagCache(factory)
+
+        await cache.set("installation:1", "url", CachedResponse('"v1"', None, {"private": True}))
+
+        assert await cache.get("installation:2", "url") is None
+
+    @pytest.mark.asyncio
+    async def test_database_errors_are_a_miss(self):
+        """Test an unreachable database degrades to unconditional requests"""
+        factory, db = _session_factory()
+        db.execute.side_effect = Exception("connection refused")
+        cache = ETagCache(factory)
+
+        assert await cache.get("installation:1", "url") is None
+
+    @pytest.mark.asyncio
+    async def test_memory_is_bounded(self):
+        """Test the least recently used entries are dropped from memory"""
+        factory, _ = _session_factory()
+        cache = ETagCache(factory, max_memory_entries=2)
+
+        for url in ("a", "b", "c"):
+            await cache.set("scope", url, CachedResponse('"v"', None, {}))
+
+        assert list(cache._memory) == [("scope", "b"), ("scope", "c")]
+
+
+class TestConditionalRequests:
+    @pytest.mark.asyncio
+    async def test_not_modified_replays_cached_body(self):
+        """Test a second poll revalidates both REST calls and reuses the cached bodies"""
+        def repo(request):
+            if request.headers.get("If-None-Match") == '"repo-v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json=REPO, headers={"ETag": '"repo-v1"'})
+
+        def commits(request):
+            if request.headers.get("If-None-Match") == '"commits-v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json=COMMITS, headers={"ETag": '"commits-v1"'})
+
+        http, seen = _github({"/repos/owner/repo": repo, "/repos/owner/repo/commits": commits})
+        factory, _ = _session_factory()
+        client = GitHubClient(http, etag_cache=ETagCache(factory))
+
+        first = await client.get_repository_basic_info("owner", "repo", "token")
+        second = await client.get_repository_basic_info("owner", "repo", "token")
+
+        assert first == second
+        assert second["latestCommit"]["sha"] == "abc"
+        assert seen == [
+            ("/repos/owner/repo", None),
+            ("/repos/owner/repo/commits", None),
+            ("/repos/owner/repo", '"repo-v1"'),
+            ("/repos/owner/repo/commits", '"commits-v1"'),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_changed_resource_replaces_entry(self):
+        """Test a 200 on revalidation stores the new body and validator"""
+        versions = iter([("v1", "main"), ("v2", "trunk")])
+
+        def repo(request):
+            etag, branch = next(versions)
+            return httpx.Response(200, json={**REPO, "default_branch": branch}, headers={"ETag": f'"{etag}"'})
+
+        http, seen = _github({
+            "/repos/owner/repo": repo,
+            "/repos/owner/repo/commits": lambda request: httpx.Response(200, json=[])
+        })
+        factory, _ = _session_factory()
+        client = GitHubClient(http, etag_cache=ETagCache(factory))
+
+        await client.get_repository_basic_info("owner", "repo", "token")
+        data = await client.get_repository_basic_info("owner", "repo", "token")
+
+        assert data["defaultBranchRef"]["name"] == "trunk"
+        assert seen[2] == ("/repos/owner/repo", '"v1"')
+        cached = await client.etag_cache.get("token", "https://api.github.com/repos/owner/repo")
+        assert cached.etag == '"v2"'
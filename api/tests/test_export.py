@@ -0,0 +1,105 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+from fastapi.testclient import TestClient
+from app.core.database import async_engine
+from app.main import app
+from app.services.export import ProjectExporter, csv_query, ndjson_query
+from .conftest import render_sql, session_factory_for
+
+
+class _Partitions:
+    def __init__(self, partitions):
+        self._partitions = partitions
+
+    async def partitions(self):
+        for partition in self._partitions:
+            yield partition
+
+
+def _copying_db(*chunks, error=None):
+    """A session whose raw asyncpg connection COPYs `chunks` out, then fails with `error`"""
+    async def copy_from_query(query, *args, output, **options):
+        copy_from_query.calls.append((query, args, options))
+        for chunk in chunks:
+            await output(chunk)
+        if error:
+            raise error
+    copy_from_query.calls = []
+
+    raw = SimpleNamespace(driver_connection=SimpleNamespace(copy_from_query=copy_from_query))
+    connection = SimpleNamespace(dialect=async_engine.dialect, get_raw_connection=AsyncMock(return_value=raw))
+    db = AsyncMock()
+    db.connection.return_value = connection
+    return db, copy_from_query.calls
+
+
+class TestExportQueries:
+    def test_ndjson_rows_are_rendered_by_postgres(self):
+        """Test each row arrives as one ready-made JSON document"""
+        sql = render_sql(ndjson_query(owner="acme"))
+
+        assert sql.startswith("SELECT CAST(json_build_object(")
+        assert "projects.owner = %(owner_1)s" in sql
+        assert sql.endswith("ORDER BY projects.id")
+        assert "project_contributors" not in sql
+
+    def test_contributors_are_one_correlated_aggregate(self):
+        """Test contributors ride along in the same query instead of a query per project"""
+        sql = render_sql(csv_query(include_contributors=True))
+
+        assert "json_agg(json_build_object(" in sql
+        assert "ORDER BY project_contributors.commits_90d DESC" in sql
+        assert "WHERE project_contributors.project_id = projects.id) AS contributors" in sql
+
+
+class TestProjectExporter:
+    @pytest.mark.asyncio
+    async def test_ndjson_streams_from_a_server_side_cursor(self):
+        """Test rows are fetched in batches and written as they arrive"""
+        db = AsyncMock()
+        db.stream.return_value = Mock(scalars=Mock(return_value=_Partitions([['{"name": "a"}', '{"name": "b"}'], ['{"name": "c"}']])))
+
+        chunks = [chunk async for chunk in ProjectExporter(session_factory_for(db)).ndjson()]
+
+        assert chunks == [b'{"name": "a"}\n{"name": "b"}\n', b'{"name": "c"}\n']
+        assert db.stream.await_args.args[0].get_execution_options()["yield_per"] == 1000
+
+    @pytest.mark.asyncio
+    async def test_csv_streams_copy_output(self):
+        """Test COPY chunks are passed through in order, with the filters bound"""
+        db, calls = _copying_db(b"id,owner\n", b"1,acme\n")
+
+        chunks = [chunk async for chunk in ProjectExporter(session_factory_for(db)).csv(min_contributors=2)]
+
+        assert chunks == [b"id,owner\n", b"1,acme\n"]
+        query, args, options = calls[0]
+        assert "projects.active_contributors_90d >= $1::INTEGER" in query
+        assert args == (2,)
+        assert options == {"format": "csv", "header": True}
+
+    @pytest.mark.asyncio
+    async def test_csv_copy_failure_reaches_the_stream(self):
+        """Test a failed COPY ends the response with an error rather than a truncated file"""
+        db, _ = _copying_db(b"id,owner\n", error=RuntimeError("connection lost"))
+
+        stream = ProjectExporter(session_factory_for(db)).csv()
+        assert await stream.__anext__() == b"id,owner\n"
+        with pytest.raises(RuntimeError, match="connection lost"):
+            await stream.__anext__()
+
+
+class TestExportEndpoint:
+    def test_csv_is_streamed_as_attachment(self):
+        """Test the export route streams the exporter's output with a download filename"""
+        async def rows(*args, **kwargs):
+            yield b"id,owner\n"
+            yield b"1,acme\n"
+
+        with patch("app.routers.projects.ProjectExporter.csv", rows):
+            response = TestClient(app).get("/projects/export?format=csv")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert response.headers["content-disposition"] == 'attachment; filename="projects.csv"'
+        assert response.content == b"id,owner\n1,acme\n"
@@ -0,0 +1,200 @@
+import json
+from datetime import datetime, timezone
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.core.config import settings
+from app.services.github_client import GitHubClient
+
+
+def _repository(owner: str, name: str) -> dict:
+    return {
+        "nameWithOwner": f"{owner}/{name}",
+        "isPrivate": False,
+        "url": f"https://github.com/{owner}/{name}",
+        "defaultBranchRef": {
+            "name": "main",
+            "target": {
+                "oid": "c2",
+                "committedDate": "2024-01-02T00:00:00Z",
+                "history": {
+                    "nodes": [
+                        {"oid": "c2", "committedDate": "2024-01-02T00:00:00Z", "author": {"user": {"login": "alice"}}},
+                        {"oid": "c1", "committedDate": "2024-01-01T00:00:00Z", "author": {"user": {"login": "bob"}}},
+                    ],
+                    "pageInfo": {"hasNextPage": False, "endCursor": None},
+                },
+            },
+        },
+        "pullRequests": {"nodes": []},
+    }
+
+
+def _graphql_handler(queries: list, missing: tuple = ()):
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        queries.append(body)
+        variables = body["variables"]
+        data, errors = {}, []
+        i = 0
+        while f"owner{i}" in variables:
+            owner, name = variables[f"owner{i}"], variables[f"name{i}"]
+            if name in missing:
+                data[f"r{i}"] = None
+                errors.append({"path": [f"r{i}"], "message": "Could not resolve to a Repository"})
+            else:
+                data[f"r{i}"] = _repository(owner, name)
+            i += 1
+        payload = {"data": data}
+        if errors:
+            payload["errors"] = errors
+        return httpx.Response(200, json=payload)
+    return handler
+
+
+def _history_page(oids: list, end_cursor: str = None) -> dict:
+    return {
+        "nodes": [
+            {"oid": oid, "committedDate": "2024-01-01T00:00:00Z", "author": {"user": {"login": "carol"}}}
+            for oid in oids
+        ],
+        "pageInfo": {"hasNextPage": end_cursor is not None, "endCursor": end_cursor},
+    }
+
+
+def _client(handler) -> GitHubClient:
+    client = GitHubClient(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    client.resolve_token = AsyncMock(return_value=("token", "app"))
+    return client
+
+
+class TestFetchMany:
+    @pytest.mark.asyncio
+    async def test_packs_repositories_into_one_query(self):
+        """Test repositories sharing a token are fetched with one aliased query"""
+        queries = []
+        client = _client(_graphql_handler(queries))
+        urls = [f"https://github.com/owner/repo{i}" for i in range(3)]
+
+        results = await client.fetch_many(urls)
+
+        assert len(queries) == 1
+        assert "r2: repository(owner: $owner2, name: $name2)" in queries[0]["query"]
+        for i, url in enumerate(urls):
+            assert results[url]["name"] == f"repo{i}"
+            assert results[url]["install_status"] == "app"
+            assert {c["login"] for c in results[url]["contributors"]} == {"alice", "bob"}
+
+    @pytest.mark.asyncio
+    async def test_chunks_by_batch_size(self):
+        """Test large portfolios are split into several queries"""
+        queries = []
+        client = _client(_graphql_handler(queries))
+        urls = [f"https://github.com/owner/repo{i}" for i in range(5)]
+
+        with patch.object(settings, "github_graphql_batch_size", 2):
+            results = await client.fetch_many(urls)
+
+        assert len(queries) == 3
+        assert set(results) == set(urls)
+
+    @pytest.mark.asyncio
+    async def test_failed_alias_falls_back_to_single_fetch(self):
+        """Test one unresolvable repository does not fail the batch"""
+        queries = []
+        client = _client(_graphql_handler(queries, missing=("gone",)))
+        client.fetch_repository_data = AsyncMock(side_effect=Exception("Failed to fetch repository: 404"))
+
+        results = await client.fetch_many([
+            "https://github.com/owner/kept",
+            "https://github.com/owner/gone",
+        ])
+
+        assert results["https://github.com/owner/kept"]["name"] == "kept"
+        assert isinstance(results["https://github.com/owner/gone"], Exception)
+        client.fetch_repository_data.assert_awaited_once()
+        assert client.fetch_repository_data.await_args.args[0] == "https://github.com/owner/gone"
+
+
+class TestCommitHistory:
+    @pytest.mark.asyncio
+    async def test_follows_end_cursor_until_exhausted(self):
+        """Test remaining history pages are streamed and counted"""
+        cursors = []
+        pages = {"page1": _history_page(["c3", "c4"], end_cursor="page2"), "page2": _history_page(["c5"])}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            if "query CommitHistory" in body["query"]:
+                cursors.append(body["variables"]["after"])
+                history = pages[body["variables"]["after"]]
+                return httpx.Response(200, json={"data": {"repository": {"defaultBranchRef": {"target": {"history": history}}}}})
+            repository = _repository("owner", "repo")
+            repository["defaultBranchRef"]["target"]["history"]["pageInfo"] = {"hasNextPage": True, "endCursor": "page1"}
+            return httpx.Response(200, json={"data": {"repository": repository}})
+
+        client = _client(handler)
+        result = await client.fetch_repository_data("https://github.com/owner/repo")
+
+        assert cursors == ["page1", "page2"]
+        commits = {c["login"]: c["commits"] for c in result["contributors"]}
+        assert commits == {"alice": 1, "bob": 1, "carol": 3}
+        assert result["head_oid"] == "c2"
+        days = {(d["login"], d["day"].isoformat()): d["commits"] for d in result["commit_days"]}
+        assert days == {("alice", "2024-01-02"): 1, ("bob", "2024-01-01"): 1, ("carol", "2024-01-01"): 3}
+
+    @pytest.mark.asyncio
+    async def test_incremental_fetch_skips_watermark_commit(self):
+        """Test the already-counted watermark commit is not counted twice"""
+        queries = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            queries.append(json.loads(request.content))
+            return httpx.Response(200, json={"data": {"repository": _repository("owner", "repo")}})
+
+        client = _client(handler)
+        result = await client.fetch_repository_data(
+            "https://github.com/owner/repo",
+            since=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            after_oid="c1"
+        )
+
+        assert queries[0]["variables"]["since"] == "2024-01-01T00:00:00+00:00"
+        assert [c["login"] for c in result["contributors"]] == ["alice"]
+
+    @pytest.mark.asyncio
+    async def test_incremental_fetch_stops_at_the_watermark(self):
+        """Test commits sharing the watermark's timestamp are not recounted, and nothing new counts nothing"""
+        cursors = []
+        pages = {
+            "page1": _history_page(["c3", "c2", "c1"], end_cursor="page2"),
+            "page2": _history_page(["c0"]),
+        }
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            if "query CommitHistory" in body["query"]:
+                cursors.append(body["variables"]["after"])
+                history = pages[body["variables"]["after"]]
+                return httpx.Response(200, json={"data": {"repository": {"defaultBranchRef": {"target": {"history": history}}}}})
+            repository = _repository("owner", "repo")
+            # A rebase-merge: every commit committed in the same second
+            repository["defaultBranchRef"]["target"].update(
+                oid="c5", committedDate="2024-01-01T00:00:00Z", history=_history_page(["c5", "c4"], end_cursor="page1")
+            )
+            return httpx.Response(200, json={"data": {"repository": repository}})
+
+        client = _client(handler)
+        since = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        result = await client.fetch_repository_data("https://github.com/owner/repo", since=since, after_oid="c2")
+
+        # c2 and the older c1, c0 were counted by the refresh that set the watermark
+        assert cursors == ["page1"]
+        assert {c["login"]: c["commits"] for c in result["contributors"]} == {"carol": 3}
+        assert [(d["login"], d["commits"]) for d in result["commit_days"]] == [("carol", 3)]
+
+        again = await client.fetch_repository_data("https://github.com/owner/repo", since=since, after_oid=result["head_oid"])
+
+        assert again["contributors"] == [] and again["commit_days"] == []
+        assert cursors == ["page1"]
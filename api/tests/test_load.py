@@ -0,0 +1,115 @@
+import csv
+import json
+import pytest
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+from sqlalchemy import select
+from app.models import ContributorTotal, Project
+from app.services.github_client import contributor_window_start
+
+# scripts/ is not a package; the loader is imported the way scripts/seed.py imports it
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from load import PROJECT_COLUMNS, LoadedProject, from_fixture, load, read_fixture
+
+
+def _record(**overrides) -> dict:
+    now = datetime.now(timezone.utc)
+    record = {
+        "owner": "acme", "name": "api", "html_url": "https://github.com/acme/api",
+        "default_branch": "main", "visibility": "public", "last_commit_at": now.isoformat(),
+        "last_actor": "alice", "install_status": "app",
+        "contributors": [
+            {"login": "alice", "commits": 5, "last_commit_at": now.isoformat()},
+            {"login": "bob", "commits": 2, "last_commit_at": (now - timedelta(days=3)).isoformat()},
+        ],
+    }
+    record.update(overrides)
+    return record
+
+
+def _contributors(project: LoadedProject) -> dict:
+    return {login: commits for _, _, login, commits, _ in project.contributors}
+
+
+class TestLoadedProject:
+    def test_totals_are_the_sum_of_the_buckets(self):
+        """Test buckets of one login and day are merged and totals summed from them"""
+        now = datetime.now(timezone.utc)
+        yesterday = now - timedelta(days=1)
+
+        project = LoadedProject({"owner": "acme", "name": "api", "last_commit_at": now}, [
+            ("alice", now.date(), 2, now - timedelta(hours=1)),
+            ("alice", now.date(), 3, now),
+            ("alice", yesterday.date(), 1, yesterday),
+            ("bob", yesterday.date(), 4, yesterday),
+        ])
+
+        assert sorted((login, day, commits) for _, login, day, commits, _ in project.days) == [
+            ("alice", yesterday.date(), 1), ("alice", now.date(), 5), ("bob", yesterday.date(), 4)
+        ]
+        assert _contributors(project) == {"alice": 6, "bob": 4}
+        assert sum(commits for *_, commits, _ in project.days) == sum(_contributors(project).values())
+        # active_contributors_90d is counted by the trigger as contributor rows are inserted
+        assert "active_contributors_90d" not in PROJECT_COLUMNS
+        assert len(project.row) == len(PROJECT_COLUMNS)
+
+    def test_out_of_window_buckets_are_dropped(self):
+        """Test a contributor whose only commits predate the window gets no rows"""
+        old = contributor_window_start() - timedelta(days=1)
+        now = datetime.now(timezone.utc)
+
+        project = LoadedProject({"owner": "acme", "name": "api", "last_commit_at": now}, [
+            ("alice", now.date(), 1, now),
+            ("carol", old.date(), 7, old),
+        ])
+
+        assert _contributors(project) == {"alice": 1}
+        assert {login for _, login, *_ in project.days} == {"alice"}
+
+
+class TestFixtures:
+    def test_fixture_contributors_become_one_bucket_each(self):
+        """Test exported contributors load with their window totals"""
+        project = from_fixture(_record())
+
+        assert _contributors(project) == {"alice": 5, "bob": 2}
+        assert len(project.days) == 2
+        assert project.row[1:4] == ("acme", "api", "https://github.com/acme/api")
+
+    def test_csv_contributors_cell_round_trips(self, tmp_path):
+        """Test a CSV export, with contributors as one JSON cell, loads the same as NDJSON"""
+        record = _record(last_actor="")
+        path = tmp_path / "projects.csv"
+        with path.open("w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(record))
+            writer.writeheader()
+            writer.writerow({**record, "contributors": json.dumps(record["contributors"])})
+        ndjson = tmp_path / "projects.ndjson"
+        ndjson.write_text(json.dumps(record) + "\n\n")
+
+        [from_csv] = read_fixture(path)
+        [from_ndjson] = read_fixture(ndjson)
+
+        assert _contributors(from_csv) == _contributors(from_ndjson) == {"alice": 5, "bob": 2}
+        assert from_csv.row[6] == datetime.fromisoformat(record["last_commit_at"])
+        # Empty CSV cells are missing values, not empty strings
+        assert from_csv.row[7] is None
+
+
+class TestLoad:
+    @pytest.mark.asyncio
+    async def test_chunks_commit_with_their_totals(self, pg_sessions):
+        """Test each chunk leaves the contributor rollup matching the projects it loaded"""
+        projects = [from_fixture(_record(name="api")), from_fixture(_record(name="web")), from_fixture(_record(name="api"))]
+
+        with patch("load.async_engine", pg_sessions.kw["bind"]):
+            await load(projects, chunk_size=1, refresh_analytics=False)
+
+        async with pg_sessions() as db:
+            counts = (await db.execute(select(Project.name, Project.active_contributors_90d).order_by(Project.name))).all()
+            totals = {total.login: (total.repositories, total.commits) for total in await db.scalars(select(ContributorTotal))}
+        # The repeated acme/api is skipped, with its contributors; the trigger counts each once
+        assert [tuple(row) for row in counts] == [("api", 2), ("web", 2)]
+        assert totals == {"alice": (2, 10), "bob": (2, 4)}
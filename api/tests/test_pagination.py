@@ -0,0 +1,64 @@
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+from sqlalchemy import select
+from app.models.project import Project
+from app.services.pagination import apply_cursor, apply_order, decode_cursor, encode_cursor
+from .conftest import render_sql
+
+
+class TestCursor:
+    def test_round_trip(self):
+        """Test a cursor decodes to the sort value and id it was built from"""
+        project = SimpleNamespace(id=uuid4(), last_commit_at=datetime(2024, 1, 2, tzinfo=timezone.utc))
+
+        cursor = encode_cursor("last_activity_at_desc", project)
+
+        assert decode_cursor("last_activity_at_desc", cursor) == (project.last_commit_at, project.id)
+
+    def test_round_trip_null_sort_value(self):
+        """Test projects without commits still produce usable cursors"""
+        project = SimpleNamespace(id=uuid4(), last_commit_at=None)
+
+        cursor = encode_cursor("last_activity_at_asc", project)
+
+        assert decode_cursor("last_activity_at_asc", cursor) == (None, project.id)
+
+    def test_rejects_cursor_from_other_order(self):
+        """Test a cursor cannot be replayed against a different sort order"""
+        cursor = encode_cursor("name_asc", SimpleNamespace(id=uuid4(), name="react"))
+
+        with pytest.raises(ValueError):
+            decode_cursor("name_desc", cursor)
+
+    def test_rejects_garbage(self):
+        """Test malformed cursors raise ValueError"""
+        with pytest.raises(ValueError):
+            decode_cursor("name_asc", "not-a-cursor")
+
+
+class TestKeysetQuery:
+    def test_orders_by_key_then_id(self):
+        """Test ties on the sort key are broken by id"""
+        sql = render_sql(apply_order(select(Project), "name_desc"))
+
+        assert "ORDER BY projects.name DESC, projects.id DESC" in sql
+
+    def test_filters_past_cursor_with_row_comparison(self):
+        """Test non-null keys page with a (key, id) row comparison"""
+        cursor = encode_cursor("name_asc", SimpleNamespace(id=uuid4(), name="react"))
+
+        sql = render_sql(apply_cursor(select(Project), "name_asc", cursor))
+
+        assert "WHERE (projects.name, projects.id) > (%(param_1)s, %(param_2)s::UUID)" in sql
+        assert "IS NULL" not in sql
+
+    def test_nullable_key_keeps_null_rows_reachable(self):
+        """Test ascending pages still reach projects without commits at the end"""
+        project = SimpleNamespace(id=uuid4(), last_commit_at=datetime(2024, 1, 2, tzinfo=timezone.utc))
+        cursor = encode_cursor("last_activity_at_asc", project)
+
+        sql = render_sql(apply_cursor(select(Project), "last_activity_at_asc", cursor))
+
+        assert "projects.last_commit_at IS NULL" in sql
@@ -0,0 +1,43 @@
+import pytest
+from unittest.mock import AsyncMock
+from uuid import uuid4
+from app.services.project_lookup import ProjectLookup
+
+
+class TestProjectLookup:
+    @pytest.mark.asyncio
+    async def test_hit_is_served_from_memory(self):
+        """Test repeated events for one repository cost a single query"""
+        project_id = uuid4()
+        db = AsyncMock()
+        db.scalar.return_value = project_id
+        lookup = ProjectLookup()
+
+        assert await lookup.get_id(db, "facebook", "react") == project_id
+        assert await lookup.get_id(db, "facebook", "react") == project_id
+
+        db.scalar.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_miss_is_not_cached(self):
+        """Test a repository added later by another process is still found"""
+        project_id = uuid4()
+        db = AsyncMock()
+        db.scalar.side_effect = [None, project_id]
+        lookup = ProjectLookup()
+
+        assert await lookup.get_id(db, "facebook", "react") is None
+        assert await lookup.get_id(db, "facebook", "react") == project_id
+
+    @pytest.mark.asyncio
+    async def test_forget_drops_entry(self):
+        """Test a deleted project is looked up again"""
+        db = AsyncMock()
+        lookup = ProjectLookup()
+        lookup.remember("facebook", "react", uuid4())
+
+        lookup.forget("facebook", "react")
+        db.scalar.return_value = None
+
+        assert await lookup.get_id(db, "facebook", "react") is None
+
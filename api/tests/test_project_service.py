@@ -0,0 +1,112 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock, patch
+from uuid import uuid4
+from sqlalchemy import select
+from app.models.project import Project
+from app.services.github_client import contributor_window_start
+from app.services.project_service import ProjectService, _escape_like, apply_filters
+from .conftest import render_sql
+
+
+class TestProjectFilters:
+    def test_escape_like_wildcards(self):
+        """Test user input cannot inject LIKE wildcards"""
+        assert _escape_like("100%_done!") == "100!%!_done!!"
+
+    def test_search_matches_owner_or_name(self):
+        """Test q is a case-insensitive substring match on either column"""
+        sql = render_sql(apply_filters(select(Project), q="react"), literal_binds=True)
+
+        assert "projects.owner ILIKE '%%react%%' ESCAPE '!'" in sql
+        assert "OR projects.name ILIKE '%%react%%' ESCAPE '!'" in sql
+
+    def test_search_owner_slash_name(self):
+        """Test owner/name searches each half against its own column"""
+        sql = render_sql(apply_filters(select(Project), q="face/rea"), literal_binds=True)
+
+        assert "projects.owner ILIKE '%%face%%' ESCAPE '!'" in sql
+        assert "AND projects.name ILIKE '%%rea%%' ESCAPE '!'" in sql
+
+    def test_range_filters(self):
+        """Test contributor-count bounds are inclusive"""
+        sql = render_sql(apply_filters(
+            select(Project), visibility="public", min_contributors=2, max_contributors=5
+        ), literal_binds=True)
+
+        assert "projects.visibility = 'public'" in sql
+        assert "projects.active_contributors_90d >= 2" in sql
+        assert "projects.active_contributors_90d <= 5" in sql
+
+
+class TestGetProjects:
+    @pytest.mark.asyncio
+    async def test_page_and_total_in_one_round_trip(self):
+        """Test an empty first page needs no separate count query"""
+        db = AsyncMock()
+        db.execute.return_value = Mock(all=Mock(return_value=[]))
+
+        result = await ProjectService(db, Mock()).get_projects(q="react")
+
+        db.execute.assert_awaited_once()
+        db.scalar.assert_not_awaited()
+        assert result["total"] == 0
+        assert result["next_cursor"] is None
+
+
+class TestApplyGithubData:
+    def _fetched(self, last_commit_at: datetime) -> dict:
+        return {
+            "default_branch": "main", "visibility": "public", "install_status": "app",
+            "last_commit_at": last_commit_at, "last_actor": "bob", "head_oid": "b",
+            "commit_days": [], "last_open_pr": None,
+        }
+
+    async def _apply(self, project: Project, fetched: dict, stored: dict) -> None:
+        """Apply an incremental fetch to `project`, whose locked row holds `stored`"""
+        db = AsyncMock()
+
+        async def refresh(instance, attributes, with_for_update=False):
+            for key in set(attributes) & set(stored):
+                setattr(instance, key, stored[key])
+
+        db.refresh.side_effect = refresh
+        service = ProjectService(db, Mock())
+        service._save_pr_snapshot = AsyncMock()
+        with patch("app.services.project_service.ContributorWindow") as window:
+            window.return_value.record = AsyncMock()
+            window.return_value.slide = AsyncMock()
+            window.return_value.touched = set()
+            await service._apply_github_data(project, fetched, incremental=True)
+
+    def _project(self, **values) -> Project:
+        return Project(
+            id=uuid4(), owner="acme", name="api", install_status="app",
+            contributor_window_start=contributor_window_start().date(), **values
+        )
+
+    @pytest.mark.asyncio
+    async def test_older_fetch_keeps_the_stored_head(self):
+        """Test a fetch that lags the stored head commit does not move it back"""
+        now = datetime.now(timezone.utc)
+        project = self._project(history_watermark_oid="a", last_commit_at=now, last_actor="alice")
+
+        await self._apply(project, self._fetched(now - timedelta(hours=1)), {
+            "history_watermark_oid": "a", "last_commit_at": now, "last_actor": "alice"
+        })
+
+        assert (project.last_commit_at, project.last_actor) == (now, "alice")
+        assert project.history_watermark_oid == "b"
+
+    @pytest.mark.asyncio
+    async def test_push_applied_during_fetch_keeps_its_head(self):
+        """Test a push committed while fetching keeps both its history and its head"""
+        now = datetime.now(timezone.utc)
+        project = self._project(history_watermark_oid="a", last_commit_at=now - timedelta(days=1), last_actor="bob")
+
+        await self._apply(project, self._fetched(now - timedelta(hours=1)), {
+            "history_watermark_oid": "c", "last_commit_at": now, "last_actor": "alice"
+        })
+
+        assert (project.last_commit_at, project.last_actor) == (now, "alice")
+        assert project.history_watermark_oid == "c"
@@ -0,0 +1,151 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock, patch
+from uuid import uuid4
+from app.models.project import Project, ProjectPullRequestSnapshot
+from app.services.project_service import ProjectService
+from app.services.pull_request_events import apply_pull_request_event, snapshot_values
+from app.workers.webhook_consumer import ClaimedEvent, WebhookConsumer
+
+
+def _at(day: int) -> datetime:
+    return datetime(2024, 1, day, tzinfo=timezone.utc)
+
+
+def _event(action: str, number: int, created: int, updated: int, state: str = "open") -> dict:
+    return {
+        "action": action,
+        "pull_request": {
+            "number": number,
+            "state": state,
+            "created_at": _at(created).isoformat(),
+            "updated_at": _at(updated).isoformat(),
+            "user": {"login": "alice"},
+        },
+        "repository": {"name": "react", "full_name": "facebook/react", "owner": {"login": "facebook"}},
+    }
+
+
+def _snapshot(**overrides) -> ProjectPullRequestSnapshot:
+    values = dict(
+        open_pr_count=2, last_open_pr_number=7, last_open_pr_updated_at=_at(10),
+        last_open_pr_author="bob", oldest_open_pr_created_at=_at(2)
+    )
+    values.update(overrides)
+    return ProjectPullRequestSnapshot(**values)
+
+
+class TestSnapshotValues:
+    def test_rest_fallback_keeps_stored_snapshot(self):
+        """Test data without PR information does not overwrite the snapshot"""
+        assert snapshot_values({"open_pr_count": None, "last_open_pr": None}) is None
+
+    def test_flattens_fetched_pr_data(self):
+        """Test fetched PR data maps onto snapshot columns"""
+        values = snapshot_values({
+            "open_pr_count": 3,
+            "last_open_pr": {"number": 9, "updated_at": _at(5), "author": "alice"},
+            "oldest_open_pr_at": _at(1),
+        })
+
+        assert values == {
+            "open_pr_count": 3, "last_open_pr_number": 9, "last_open_pr_updated_at": _at(5),
+            "last_open_pr_author": "alice", "oldest_open_pr_created_at": _at(1)
+        }
+
+
+class TestApplyEvent:
+    def test_opened_counts_and_becomes_latest(self):
+        """Test a new PR is counted and is the latest updated one"""
+        snapshot = _snapshot()
+
+        stale = apply_pull_request_event(snapshot, _event("opened", 8, created=11, updated=11))
+
+        assert not stale
+        assert snapshot.open_pr_count == 3
+        assert (snapshot.last_open_pr_number, snapshot.last_open_pr_author) == (8, "alice")
+        assert snapshot.oldest_open_pr_created_at == _at(2)
+
+    def test_activity_moves_latest(self):
+        """Test new activity on an open PR makes it the latest"""
+        snapshot = _snapshot()
+
+        apply_pull_request_event(snapshot, _event("synchronize", 3, created=3, updated=12))
+
+        assert snapshot.last_open_pr_number == 3
+        assert snapshot.open_pr_count == 2
+
+    def test_closing_other_pr_only_counts(self):
+        """Test closing a PR that is neither latest nor oldest needs no refresh"""
+        snapshot = _snapshot(open_pr_count=3)
+
+        stale = apply_pull_request_event(snapshot, _event("closed", 5, created=4, updated=9, state="closed"))
+
+        assert not stale
+        assert snapshot.open_pr_count == 2
+        assert snapshot.last_open_pr_number == 7
+
+    def test_closing_latest_needs_refresh(self):
+        """Test closing the latest PR leaves a gap only GitHub can fill"""
+        snapshot = _snapshot()
+
+        stale = apply_pull_request_event(snapshot, _event("closed", 7, created=6, updated=10, state="closed"))
+
+        assert stale
+        assert snapshot.last_open_pr_number is None
+
+    def test_closing_last_pr_clears_snapshot(self):
+        """Test no open PRs is known exactly"""
+        snapshot = _snapshot(open_pr_count=1)
+
+        stale = apply_pull_request_event(snapshot, _event("closed", 7, created=2, updated=10, state="closed"))
+
+        assert not stale
+        assert snapshot.open_pr_count == 0
+        assert snapshot.oldest_open_pr_created_at is None
+
+
+class TestProjectService:
+    @pytest.mark.asyncio
+    async def test_detail_serves_snapshot(self):
+        """Test the detail endpoint reads PR data from the snapshot"""
+        now = _at(1)
+        project = Project(
+            id=uuid4(), owner="facebook", name="react", html_url="https://github.com/facebook/react",
+            active_contributors_90d=0, install_status="app", created_at=now, updated_at=now
+        )
+        db = AsyncMock()
+        db.execute.return_value = Mock(first=Mock(return_value=(project, _snapshot())))
+        db.scalars.return_value = []
+
+        detail = await ProjectService(db, Mock()).get_project_detail(str(project.id))
+
+        assert detail.last_open_pr.number == 7
+        assert detail.open_pr_count == 2
+        assert detail.oldest_open_pr_at == _at(2)
+
+    @pytest.mark.asyncio
+    async def test_unknown_snapshot_queues_refresh(self):
+        """Test events for a project whose PRs were never counted queue a refresh"""
+        db = AsyncMock()
+        db.scalar.return_value = None
+        service = ProjectService(db, Mock())
+
+        with patch("app.services.project_service.project_lookup.get_id", AsyncMock(return_value=uuid4())), \
+             patch.object(ProjectService, "queue_refresh", AsyncMock()) as queue_refresh:
+            outcome = await service.apply_pull_requests([_event("opened", 1, created=1, updated=1)])
+
+        assert outcome == "queued"
+        queue_refresh.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_consumer_routes_pull_request_events(self):
+        """Test pull_request events reach the snapshot alongside coalesced pushes"""
+        consumer = WebhookConsumer(AsyncMock(), session_factory=Mock())
+        service = Mock(apply_pull_requests=AsyncMock(return_value="applied"))
+        events = [ClaimedEvent(1, "facebook/react", "pull_request", _event("opened", 1, created=1, updated=1), 1)]
+
+        outcome = await consumer._apply(service, events)
+
+        assert outcome == "pull requests applied"
+        service.apply_pull_requests.assert_awaited_once_with([events[0].payload])
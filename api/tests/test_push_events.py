@@ -0,0 +1,116 @@
+import pytest
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+from uuid import uuid4
+from app.services.project_lookup import project_lookup
+from app.services.project_service import ProjectService
+from app.services.push_events import is_default_branch_push, needs_full_refresh, push_commit_days
+
+
+def _payload(commits: int = 2, **overrides) -> dict:
+    payload = {
+        "ref": "refs/heads/main",
+        "before": "old",
+        "after": "new",
+        "forced": False,
+        "deleted": False,
+        "repository": {"name": "react", "full_name": "facebook/react", "owner": {"login": "facebook"}, "default_branch": "main"},
+        "commits": [
+            {"id": f"c{i}", "timestamp": f"2024-01-0{i % 9 + 1}T10:00:00+02:00", "author": {"username": "alice", "email": "a@x.io"}}
+            for i in range(commits)
+        ],
+    }
+    payload.update(overrides)
+    return payload
+
+
+def _project(**overrides) -> SimpleNamespace:
+    project = SimpleNamespace(
+        id=uuid4(),
+        history_watermark_oid="old",
+        history_watermark_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        contributor_window_start=date(2023, 10, 1),
+        default_branch="main",
+        last_commit_at=None,
+        last_actor=None,
+        updated_at=None,
+    )
+    project.__dict__.update(overrides)
+    return project
+
+
+class TestPushPayload:
+    def test_only_default_branch_counts(self):
+        """Test pushes to other branches are not applied"""
+        assert is_default_branch_push(_payload())
+        assert not is_default_branch_push(_payload(ref="refs/heads/feature"))
+        assert not is_default_branch_push(_payload(deleted=True))
+
+    def test_forced_or_truncated_needs_refresh(self):
+        """Test history rewrites and possibly cut-off commit lists fall back to a refresh"""
+        assert not needs_full_refresh(_payload(commits=19))
+        assert needs_full_refresh(_payload(commits=20))
+        assert needs_full_refresh(_payload(forced=True))
+
+    def test_commits_bucketed_by_utc_day(self):
+        """Test payload commits become per-login, per-UTC-day buckets"""
+        payload = _payload(commits=0)
+        payload["commits"] = [
+            {"id": "a", "timestamp": "2024-01-02T01:00:00+02:00", "author": {"username": "alice"}},
+            {"id": "b", "timestamp": "2024-01-02T09:00:00Z", "author": {"email": "bob@x.io"}},
+        ]
+
+        days = {(d["login"], d["day"]): d["commits"] for d in push_commit_days(payload)}
+
+        assert days == {("alice", date(2024, 1, 1)): 1, ("bob@x.io", date(2024, 1, 2)): 1}
+
+
+class TestApplyPush:
+    @pytest.fixture(autouse=True)
+    def lookup(self):
+        yield
+        project_lookup.clear()
+
+    async def _apply(self, project, payload):
+        db = AsyncMock()
+        db.scalar.return_value = project
+        project_lookup.remember("facebook", "react", project.id)
+        service = ProjectService(db, Mock())
+        service.queue_refresh = AsyncMock()
+        with patch("app.services.project_service.ContributorWindow") as window:
+            window.return_value.record = AsyncMock()
+            window.return_value.slide = AsyncMock()
+            outcome = await service.apply_push(payload)
+        return outcome, service, window.return_value
+
+    @pytest.mark.asyncio
+    async def test_contiguous_push_applied_without_fetch(self):
+        """Test a push continuing from the watermark updates the project in place"""
+        project = _project()
+
+        outcome, service, window = await self._apply(project, _payload())
+
+        assert outcome == "applied"
+        service.queue_refresh.assert_not_awaited()
+        window.record.assert_awaited_once()
+        assert project.history_watermark_oid == "new"
+        assert project.last_actor == "alice"
+
+    @pytest.mark.asyncio
+    async def test_gap_in_history_queues_refresh(self):
+        """Test a push that does not start at the watermark is left to a refresh"""
+        project = _project(history_watermark_oid="older")
+
+        outcome, service, window = await self._apply(project, _payload())
+
+        assert outcome == "queued"
+        service.queue_refresh.assert_awaited_once_with(str(project.id))
+        window.record.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_force_push_queues_refresh(self):
+        """Test a force-push is never applied from the payload"""
+        outcome, service, _ = await self._apply(_project(), _payload(forced=True))
+
+        assert outcome == "queued"
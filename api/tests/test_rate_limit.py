@@ -0,0 +1,181 @@
+import asyncio
+import time
+import httpx
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import app
+from app.services.github_client import GitHubClient
+from app.services.rate_limit import RateLimitExceeded, RateLimitGovernor, background_governor
+
+
+def _headers(remaining: int, limit: int = 5000, reset_in: int = 600) -> dict:
+    return {
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Reset": str(int(time.time()) + reset_in),
+    }
+
+
+class TestGovernor:
+    @pytest.mark.asyncio
+    async def test_low_budget_fails_fast_past_max_wait(self):
+        """Test requests that would have to wait for the window reset raise instead of hanging"""
+        governor = RateLimitGovernor(max_wait_seconds=5)
+        governor.observe("installation:1", "core", httpx.Response(200, headers=_headers(remaining=0)))
+
+        with pytest.raises(RateLimitExceeded):
+            async with governor.slot("installation:1", "core"):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_only_background_work_keeps_the_reserve(self):
+        """Test interactive requests may spend the points the workers leave untouched"""
+        interactive = RateLimitGovernor(max_wait_seconds=5)
+        with patch.object(settings, "github_rate_limit_worker_max_wait_seconds", 5):
+            background = background_governor()
+        for governor in (interactive, background):
+            governor.observe("installation:1", "core", httpx.Response(200, headers=_headers(remaining=10)))
+
+        async with interactive.slot("installation:1", "core") as budget:
+            assert budget.in_flight == 1
+        with pytest.raises(RateLimitExceeded):
+            async with background.slot("installation:1", "core"):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_budgets_are_per_scope(self):
+        """Test one exhausted installation does not hold back another"""
+        governor = RateLimitGovernor(max_wait_seconds=5)
+        governor.observe("installation:1", "core", httpx.Response(200, headers=_headers(remaining=0)))
+
+        async with governor.slot("installation:2", "core") as budget:
+            assert budget.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_secondary_limit_halves_concurrency(self):
+        """Test a secondary limit pauses the scope and backs its concurrency off"""
+        governor = RateLimitGovernor()
+        budget = governor.budget("installation:1", "core")
+        start = budget.concurrency
+
+        limited = governor.observe("installation:1", "core", httpx.Response(403, headers={"Retry-After": "30"}))
+
+        assert limited
+        assert budget.concurrency == max(1, start // 2)
+        assert budget.paused_until > time.time() + 25
+        assert budget.secondary_limits == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_queues_callers(self):
+        """Test callers beyond the concurrency limit wait for a slot"""
+        governor = RateLimitGovernor()
+        governor.budget("installation:1", "graphql").concurrency = 1
+        order = []
+
+        async def call(name: str):
+            async with governor.slot("installation:1", "graphql"):
+                order.append(f"{name} start")
+                await asyncio.sleep(0.01)
+                order.append(f"{name} end")
+
+        await asyncio.gather(call("a"), call("b"))
+
+        assert order == ["a start", "a end", "b start", "b end"]
+
+    def test_graphql_cost_becomes_the_estimate(self):
+        """Test the reported query cost is reserved for the next query"""
+        governor = RateLimitGovernor()
+
+        governor.observe_graphql("installation:1", {"cost": 3, "remaining": 4000, "limit": 5000, "resetAt": "2030-01-01T00:00:00Z"})
+
+        budget = governor.budget("installation:1", "graphql")
+        assert budget.cost_estimate == 3
+        assert budget.remaining == 4000
+
+
+class TestClientThrottling:
+    @pytest.mark.asyncio
+    async def test_secondary_limit_is_retried(self):
+        """Test a secondary limit is waited out and retried instead of failing the call"""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(403, headers={"Retry-After": "0"}, text="You have exceeded a secondary rate limit")
+            return httpx.Response(200, json={"data": {"rateLimit": {"cost": 1, "remaining": 4999}}}, headers=_headers(4999))
+
+        client = GitHubClient(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+        body = await client._graphql_request("query { viewer { login } }", {}, "token")
+
+        assert len(calls) == 2
+        assert body["data"]["rateLimit"]["remaining"] == 4999
+
+    @pytest.mark.asyncio
+    async def test_graphql_rate_limits_are_retried_once_per_attempt(self):
+        """Test a rate-limited query is sent GITHUB_RATE_LIMIT_MAX_RETRIES more times, not that squared"""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200, json={"errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]},
+                                  headers=_headers(0, reset_in=-1))
+
+        client = GitHubClient(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+        with patch.object(settings, "github_secondary_limit_pause_seconds", 0), pytest.raises(RateLimitExceeded):
+            await client._graphql_request("query { viewer { login } }", {}, "token")
+
+        assert len(calls) == settings.github_rate_limit_max_retries + 1
+
+    @pytest.mark.asyncio
+    async def test_exhausted_graphql_does_not_fall_back_to_rest(self):
+        """Test an exhausted quota is reported rather than spent again over REST"""
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]},
+                                  headers=_headers(0))
+
+        client = GitHubClient(httpx.AsyncClient(transport=httpx.MockTransport(handler)), RateLimitGovernor(max_wait_seconds=5))
+        client.resolve_token = AsyncMock(return_value=("token", "app"))
+        client._fetch_repository_data_rest = AsyncMock()
+
+        with pytest.raises(RateLimitExceeded):
+            await client.fetch_repository_data("https://github.com/owner/repo")
+
+        client._fetch_repository_data_rest.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_throttled_installation_lookup_is_a_rate_limit(self):
+        """Test an exhausted App quota while resolving the token is not mistaken for a missing installation"""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(403, json={"message": "API rate limit exceeded"}, headers=_headers(0))
+
+        client = GitHubClient(httpx.AsyncClient(transport=httpx.MockTransport(handler)), RateLimitGovernor(max_wait_seconds=5))
+        client._generate_jwt_token = Mock(return_value="jwt")
+
+        with pytest.raises(RateLimitExceeded) as raised:
+            await client.fetch_repository_data("https://github.com/owner/repo")
+
+        assert raised.value.scope == "app"
+        assert calls == ["/repos/owner/repo/installation"]
+
+
+class TestRateLimitsEndpoint:
+    def test_lists_scopes(self):
+        """Test per-installation budgets are exposed"""
+        with TestClient(app) as client:
+            app.state.github_client.governor.observe(
+                "installation:7", "graphql", httpx.Response(200, headers=_headers(remaining=4200))
+            )
+            response = client.get("/github/rate-limits")
+
+        assert response.status_code == 200
+        scope = next(s for s in response.json()["scopes"] if s["scope"] == "installation:7")
+        assert scope["remaining"] == 4200
+        assert scope["resource"] == "graphql"
@@ -0,0 +1,81 @@
+import time
+import httpx
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+from app.core.config import settings
+from app.services.github_client import GitHubClient
+from app.services.refresh_schedule import refresh_interval, schedule_statement
+from app.workers.refresh_scheduler import RefreshScheduler
+from .conftest import render_sql
+
+
+def _ago(**kwargs) -> datetime:
+    return datetime.now(timezone.utc) - timedelta(**kwargs)
+
+
+class TestRefreshInterval:
+    def test_active_projects_refresh_sooner(self):
+        """Test the interval grows with time since the last commit"""
+        today = refresh_interval(_ago(hours=1), "app")
+        last_week = refresh_interval(_ago(days=7), "app")
+
+        assert today < last_week
+        assert today >= timedelta(seconds=settings.refresh_min_interval_seconds)
+
+    def test_capped_at_slo(self):
+        """Test dormant and never-committed projects still refresh within the SLO"""
+        slo = timedelta(seconds=settings.refresh_slo_seconds)
+
+        assert refresh_interval(_ago(days=400), "app") == slo
+        assert refresh_interval(None, "none") == slo
+
+    def test_tokenless_projects_wait_longer(self):
+        """Test projects read without a token use less of the scarcer quota"""
+        assert refresh_interval(_ago(days=1), "none") > refresh_interval(_ago(days=1), "app")
+
+
+class TestSchedule:
+    def test_statement_queues_and_defers_in_one_round_trip(self):
+        """Test due projects are locked, queued and pushed out in a single statement"""
+        sql = render_sql(schedule_statement(10))
+
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "ON CONFLICT (project_id) WHERE processed_at IS NULL DO NOTHING" in sql
+        assert "updated_at=projects.updated_at" in sql
+
+    def test_capacity_follows_quota_and_backlog(self):
+        """Test the scheduler slows down as quota or queue room runs out"""
+        client = Mock(rate_limit_fraction=Mock(return_value=1.0))
+        scheduler = RefreshScheduler(client)
+
+        with patch.object(settings, "scheduler_batch_size", 100), \
+             patch.object(settings, "scheduler_max_pending", 150):
+            assert scheduler.capacity(pending=0) == 100
+            assert scheduler.capacity(pending=120) == 30
+            client.rate_limit_fraction.return_value = 0.5
+            assert scheduler.capacity(pending=0) == 50
+            client.rate_limit_fraction.return_value = 0.05
+            assert scheduler.capacity(pending=0) == 0
+
+
+class TestRateLimitObservation:
+    @pytest.mark.asyncio
+    async def test_fraction_tracks_latest_headers(self):
+        """Test the lowest remaining share across installations is reported"""
+        reset = str(int(time.time()) + 600)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            remaining = "500" if request.headers["Authorization"] == "Bearer low" else "4500"
+            return httpx.Response(200, json={"data": {}}, headers={
+                "X-RateLimit-Remaining": remaining, "X-RateLimit-Limit": "5000", "X-RateLimit-Reset": reset
+            })
+
+        client = GitHubClient(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        client._token_scopes = {"high": "installation:1", "low": "installation:2"}
+        assert client.rate_limit_fraction() == 1.0
+
+        await client._graphql_request("query { viewer { login } }", {}, "high")
+        await client._graphql_request("query { viewer { login } }", {}, "low")
+
+        assert client.rate_limit_fraction() == pytest.approx(0.1)
@@ -0,0 +1,93 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+from app.core.config import settings
+from app.models.project import Project
+from app.workers.refresh_worker import ClaimedRefresh, RefreshWorker, claim_statement, retry_delay
+from .conftest import render_sql, session_factory_for
+
+
+def _claimed(attempts: int = 1) -> ClaimedRefresh:
+    return ClaimedRefresh(1, uuid4(), attempts, datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+
+def _worker(db) -> RefreshWorker:
+    return RefreshWorker(AsyncMock(), session_factory=session_factory_for(db))
+
+
+def _values(db) -> list:
+    """SET clauses of every UPDATE the worker issued, as column -> bound value"""
+    return [
+        {column.key: value for column, value in call.args[0]._values.items()}
+        for call in db.execute.await_args_list
+    ]
+
+
+class TestClaim:
+    def test_claims_with_skip_locked(self):
+        """Test concurrent workers skip rows another worker has locked"""
+        sql = render_sql(claim_statement(25, 600))
+
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "project_refresh_queue.locked_until < now()" in sql
+        assert "RETURNING" in sql
+
+    def test_backoff_grows_and_is_capped(self):
+        """Test retry delays double per attempt up to the maximum"""
+        with patch.object(settings, "refresh_worker_backoff_seconds", 10), \
+             patch.object(settings, "refresh_worker_max_backoff_seconds", 60):
+            assert 5 <= retry_delay(1) <= 10
+            assert 20 <= retry_delay(3) <= 40
+            assert 30 <= retry_delay(10) <= 60
+
+
+class TestProcess:
+    @pytest.mark.asyncio
+    async def test_success_marks_row_processed(self):
+        """Test a refreshed project's row is marked processed and released"""
+        db = AsyncMock()
+        item = _claimed()
+        worker = _worker(db)
+
+        with patch("app.workers.refresh_worker.ProjectService.refresh_projects",
+                   AsyncMock(return_value={str(item.project_id): Project()})):
+            await worker.process([item])
+
+        values = _values(db)
+        assert "processed_at" in values[0]
+        assert "processed_at" not in values[1]
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failure_is_retried_with_backoff(self):
+        """Test a failed refresh leaves the row pending with a later next attempt"""
+        db = AsyncMock()
+        item = _claimed(attempts=1)
+        worker = _worker(db)
+
+        with patch("app.workers.refresh_worker.ProjectService.refresh_projects",
+                   AsyncMock(side_effect=Exception("GraphQL request failed: 502"))):
+            await worker.process([item])
+
+        values = _values(db)
+        assert len(values) == 1
+        assert "next_attempt_at" in values[0]
+        assert "processed_at" not in values[0]
+        assert values[0]["last_error"].value == "GraphQL request failed: 502"
+        db.rollback.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        """Test a row that keeps failing is closed with its last error"""
+        db = AsyncMock()
+        item = _claimed(attempts=settings.refresh_worker_max_attempts)
+        worker = _worker(db)
+
+        with patch("app.workers.refresh_worker.ProjectService.refresh_projects",
+                   AsyncMock(return_value={str(item.project_id): Exception("Not Found")})):
+            await worker.process([item])
+
+        values = _values(db)
+        assert "processed_at" in values[0]
+        assert "next_attempt_at" not in values[0]
@@ -0,0 +1,170 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock, patch
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import app
+from app.models.project import Project
+from app.services.project_service import ProjectService
+from app.services.response_cache import MemoryBackend, RedisBackend, ResponseCache, response_cache
+
+
+class FakeRedis:
+    """Local stand-in for redis.asyncio.Redis"""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1).encode()
+        return int(self.values[key])
+
+
+def _project() -> Project:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return Project(
+        id=uuid4(), owner="acme", name="api", html_url="https://github.com/acme/api",
+        active_contributors_90d=1, install_status="app", created_at=now, updated_at=now
+    )
+
+
+@pytest.fixture
+def db(use_db):
+    session = AsyncMock()
+    session.execute.return_value = Mock(all=Mock(return_value=[(_project(), 1)]))
+
+    response_cache.clear()
+    yield use_db(session)
+    response_cache.clear()
+
+
+class TestBackends:
+    @pytest.mark.asyncio
+    async def test_memory_entries_expire(self):
+        """Test entries past their TTL are misses"""
+        backend = MemoryBackend(max_entries=10)
+
+        await backend.set("key", b"value", ttl=-1)
+
+        assert await backend.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_memory_eviction_keeps_versions(self):
+        """Test LRU eviction drops entries but never resets a version counter"""
+        backend = MemoryBackend(max_entries=1)
+        await backend.incr("version")
+
+        await backend.set("a", b"1", ttl=60)
+        await backend.set("b", b"2", ttl=60)
+
+        assert await backend.get("a") is None
+        assert await backend.get("b") == b"2"
+        assert await backend.get("version") == b"1"
+
+    @pytest.mark.asyncio
+    async def test_invalidation_is_shared_through_redis(self):
+        """Test a write in one process invalidates another process' cache"""
+        redis = FakeRedis()
+        api, worker = ResponseCache(RedisBackend(redis), ttl=30), ResponseCache(RedisBackend(redis), ttl=30)
+        project_id = uuid4()
+
+        key, _ = await api.get("detail", {"project_id": project_id})
+        await api.set(key, b'{"name": "api"}')
+        await worker.invalidate(project_id)
+
+        _, cached = await api.get("detail", {"project_id": project_id})
+        assert cached is None
+
+    @pytest.mark.asyncio
+    async def test_backend_errors_are_misses(self):
+        """Test an unreachable backend only costs the cache, not the request"""
+        backend = Mock(get=AsyncMock(side_effect=ConnectionError("down")))
+
+        assert await ResponseCache(backend, ttl=30).get("list", {}) == (None, None)
+
+
+class TestCachedEndpoints:
+    def test_repeated_list_reads_skip_the_database(self, db):
+        """Test identical polls are answered from the cache"""
+        client = TestClient(app)
+
+        first = client.get("/projects?limit=10")
+        second = client.get("/projects?limit=10")
+
+        assert first.json() == second.json()
+        assert first.headers["ETag"] == second.headers["ETag"]
+        db.execute.assert_awaited_once()
+
+    def test_if_none_match_gets_not_modified(self, db):
+        """Test a client holding the current body gets an empty 304"""
+        client = TestClient(app)
+        etag = client.get("/projects").headers["ETag"]
+
+        response = client.get("/projects", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_write_invalidates_lists(self, db):
+        """Test the next poll after a project write reads fresh data"""
+        client = TestClient(app)
+        client.get("/projects")
+
+        db.execute.return_value = Mock(first=Mock(return_value=("acme", "api")))
+        with TestClient(app) as writer:
+            assert writer.delete(f"/projects/{uuid4()}").status_code == 204
+        db.execute.return_value = Mock(all=Mock(return_value=[]))
+
+        response = client.get("/projects")
+
+        assert response.json()["projects"] == []
+
+    def test_parameters_are_part_of_the_key(self, db):
+        """Test differently filtered lists are cached separately"""
+        client = TestClient(app)
+
+        client.get("/projects?q=react")
+        client.get("/projects?q=vue")
+
+        assert db.execute.await_count == 2
+
+
+class TestServiceInvalidation:
+    @pytest.mark.asyncio
+    async def test_refresh_invalidates_project(self):
+        """Test refreshing a project drops its cached detail"""
+        project = _project()
+        db = AsyncMock()
+        db.scalar.return_value = project
+        github_client = Mock(fetch_repository_data=AsyncMock(return_value={}))
+        service = ProjectService(db, github_client)
+
+        with patch.object(ProjectService, "_apply_github_data", AsyncMock()), \
+             patch("app.services.project_service.response_cache") as cache:
+            cache.invalidate = AsyncMock()
+            await service.refresh_project(str(project.id))
+
+        cache.invalidate.assert_awaited_once_with(project.id)
+
+
+class TestDeployment:
+    def test_memory_backend_warns_when_workers_run_elsewhere(self, caplog):
+        """Test an API process without the workers warns that their writes will look stale"""
+        with patch.object(settings, "response_cache_backend", "memory"), TestClient(app):
+            pass
+
+        assert "RESPONSE_CACHE_BACKEND=memory" in caplog.text
+
+    def test_shared_backend_does_not_warn(self, caplog):
+        """Test Redis-backed deployments start quietly"""
+        with patch.object(settings, "response_cache_backend", "redis"), TestClient(app):
+            pass
+
+        assert "RESPONSE_CACHE_BACKEND" not in caplog.text
@@ -0,0 +1,83 @@
+import asyncio
+import httpx
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from app.services.github_client import GitHubClient
+from app.services.token_cache import CachedToken, TokenCache
+
+
+def _expiring_in(seconds: int) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+
+class TestTokenCache:
+    @pytest.mark.asyncio
+    async def test_reuses_fresh_token(self):
+        """Test a fresh token is served without calling refresh again"""
+        cache = TokenCache(refresh_margin_seconds=300)
+        calls = []
+
+        async def refresh():
+            calls.append(1)
+            return CachedToken(f"token-{len(calls)}", _expiring_in(3600))
+
+        assert await cache.get_or_refresh(1, refresh) == "token-1"
+        assert await cache.get_or_refresh(1, refresh) == "token-1"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_refreshes_ahead_of_expiry(self):
+        """Test tokens inside the refresh margin are replaced"""
+        cache = TokenCache(refresh_margin_seconds=300)
+        cache.set(1, CachedToken("old", _expiring_in(120)))
+
+        async def refresh():
+            return CachedToken("new", _expiring_in(3600))
+
+        assert cache.get(1) is None
+        assert await cache.get_or_refresh(1, refresh) == "new"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_refreshes_are_single_flighted(self):
+        """Test concurrent callers for one key share a single refresh"""
+        cache = TokenCache(refresh_margin_seconds=300)
+        calls = []
+
+        async def refresh():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return CachedToken("token", _expiring_in(3600))
+
+        tokens = await asyncio.gather(*[cache.get_or_refresh(1, refresh) for _ in range(10)])
+        assert tokens == ["token"] * 10
+        assert len(calls) == 1
+
+
+class TestInstallationTokenReuse:
+    @pytest.mark.asyncio
+    async def test_resolve_token_hits_github_once_per_installation(self):
+        """Test repeated token resolution reuses the installation id and token"""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request.url.path)
+            if request.url.path.endswith("/installation"):
+                return httpx.Response(200, json={"id": 42})
+            return httpx.Response(201, json={
+                "token": "installation-token",
+                "expires_at": _expiring_in(3600).isoformat()
+            })
+
+        client = GitHubClient(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+        with patch.object(GitHubClient, "_generate_jwt_token", return_value="jwt"):
+            first = await client.resolve_token("owner", "repo-a")
+            second = await client.resolve_token("owner", "repo-b")
+
+        assert first == ("installation-token", "app")
+        assert second == ("installation-token", "app")
+        assert requests == [
+            "/repos/owner/repo-a/installation",
+            "/app/installations/42/access_tokens",
+        ]
@@ -0,0 +1,160 @@
+import hashlib
+import hmac
+import json
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock, patch
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import app
+from app.models.webhook_event import WebhookEvent
+from app.services.push_events import coalesce_pushes
+from app.workers.webhook_consumer import ClaimedEvent, WebhookConsumer, claim_statement
+from .conftest import render_sql, session_factory_for
+
+
+def _push(before: str, after: str, commits: int = 1, **overrides) -> dict:
+    payload = {
+        "ref": "refs/heads/main",
+        "before": before,
+        "after": after,
+        "repository": {"name": "react", "full_name": "facebook/react", "owner": {"login": "facebook"}, "default_branch": "main"},
+        "commits": [
+            {"id": f"{after}-{i}", "timestamp": "2024-01-02T10:00:00Z", "author": {"username": "alice"}}
+            for i in range(commits)
+        ],
+        "head_commit": {"id": after, "timestamp": "2024-01-02T10:00:00Z", "author": {"username": "alice"}},
+    }
+    payload.update(overrides)
+    return payload
+
+
+@pytest.fixture
+def db(use_db):
+    session = AsyncMock()
+    session.execute.return_value = Mock(rowcount=1)
+    return use_db(session)
+
+
+class TestWebhookEndpoint:
+    def _post(self, body: bytes, event: str = "push", **headers):
+        return TestClient(app).post("/webhooks/github", content=body, headers={
+            "X-GitHub-Event": event, "X-GitHub-Delivery": "d-1", **headers
+        })
+
+    def test_push_is_journaled_and_acknowledged(self, db):
+        """Test a delivery is recorded and acknowledged without being processed inline"""
+        response = self._post(json.dumps(_push("a", "b")).encode())
+
+        assert response.status_code == 202
+        assert response.json() == {"status": "accepted"}
+        db.execute.assert_awaited_once()
+        db.commit.assert_awaited_once()
+
+    def test_redelivery_is_deduplicated(self, db):
+        """Test a delivery id already in the journal is not stored again"""
+        db.execute.return_value = Mock(rowcount=0)
+
+        response = self._post(json.dumps(_push("a", "b")).encode())
+
+        assert response.json() == {"status": "duplicate"}
+
+    def test_bad_signature_rejected(self, db):
+        """Test deliveries not signed with the webhook secret are refused"""
+        body = json.dumps(_push("a", "b")).encode()
+        with patch.object(settings, "github_webhook_secret", "secret"):
+            signature = "sha256=" + hmac.new(b"wrong", body, hashlib.sha256).hexdigest()
+            response = self._post(body, **{"X-Hub-Signature-256": signature})
+
+        assert response.status_code == 403
+        db.execute.assert_not_awaited()
+
+    def test_unhandled_event_not_journaled(self, db):
+        """Test events the consumer ignores are acknowledged without storing them"""
+        response = self._post(json.dumps({"zen": "hi"}).encode(), event="ping")
+
+        assert response.json() == {"status": "ignored"}
+        db.execute.assert_not_awaited()
+
+
+class TestCoalescing:
+    def test_chained_pushes_merge(self):
+        """Test a burst of consecutive pushes becomes one payload"""
+        merged = coalesce_pushes([_push("a", "b"), _push("b", "c", commits=2)])
+
+        assert (merged["before"], merged["after"]) == ("a", "c")
+        assert len(merged["commits"]) == 3
+        assert merged["head_commit"]["id"] == "c"
+        assert merged["incomplete"] is False
+
+    def test_broken_chain_is_incomplete(self):
+        """Test a missing push in the burst forces a refresh"""
+        merged = coalesce_pushes([_push("a", "b"), _push("x", "y")])
+
+        assert merged["incomplete"] is True
+
+    def test_truncated_source_is_incomplete(self):
+        """Test one truncated payload in the burst forces a refresh"""
+        merged = coalesce_pushes([_push("a", "b", commits=20), _push("b", "c")])
+
+        assert merged["incomplete"] is True
+
+    @pytest.mark.asyncio
+    async def test_consumer_applies_repository_once(self):
+        """Test the consumer applies a repository's burst as one push and settles every event"""
+        session = AsyncMock()
+        consumer = WebhookConsumer(AsyncMock(), session_factory=session_factory_for(session))
+        events = [
+            ClaimedEvent(1, "facebook/react", "push", _push("a", "b"), 1),
+            ClaimedEvent(2, "facebook/react", "push", _push("b", "c"), 1),
+        ]
+
+        with patch("app.workers.webhook_consumer.ProjectService.apply_push", AsyncMock(return_value="applied")) as apply_push:
+            await consumer.process_repository("facebook/react", events)
+
+        apply_push.assert_awaited_once()
+        assert apply_push.await_args.args[0]["after"] == "c"
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failures_use_the_consumer_attempt_limit(self):
+        """Test events are given up after WEBHOOK_CONSUMER_MAX_ATTEMPTS, not the refresh worker's limit"""
+        session = AsyncMock()
+        consumer = WebhookConsumer(AsyncMock(), session_factory=session_factory_for(session))
+        events = [ClaimedEvent(1, "facebook/react", "push", _push("a", "b"), 2)]
+
+        with patch.object(settings, "webhook_consumer_max_attempts", 2), \
+             patch.object(settings, "refresh_worker_max_attempts", 10), \
+             patch("app.workers.webhook_consumer.ProjectService.apply_push", AsyncMock(side_effect=RuntimeError("boom"))):
+            await consumer.process_repository("facebook/react", events)
+
+        values = {column.key for column in session.execute.await_args.args[0]._values}
+        assert "processed_at" in values
+
+
+class TestClaim:
+    def test_skips_repositories_with_a_leased_event(self):
+        """Test a repository is not claimed while another of its events is leased"""
+        sql = render_sql(claim_statement(50, 120))
+
+        assert "NOT (EXISTS (SELECT webhook_events_1.id" in sql
+        assert "webhook_events_1.repository = webhook_events.repository" in sql
+        assert "webhook_events_1.locked_until >= now()" in sql
+
+    @pytest.mark.asyncio
+    async def test_newer_event_waits_for_the_leased_one(self, pg_sessions):
+        """Test an unleased event is not claimed while an older event of its repository is held"""
+        received = datetime.now(timezone.utc) - timedelta(minutes=5)
+        async with pg_sessions() as db:
+            db.add_all([
+                WebhookEvent(delivery_id="1", event_type="push", repository="acme/api", payload={}, received_at=received,
+                             attempts=1, locked_until=datetime.now(timezone.utc) + timedelta(minutes=1)),
+                WebhookEvent(delivery_id="2", event_type="push", repository="acme/api", payload={}, received_at=received),
+                WebhookEvent(delivery_id="3", event_type="push", repository="acme/web", payload={}, received_at=received),
+            ])
+            await db.commit()
+
+            claimed = (await db.execute(claim_statement(50, 120))).all()
+            await db.commit()
+
+        assert [row.repository for row in claimed] == ["acme/web"]
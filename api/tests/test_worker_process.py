@@ -0,0 +1,35 @@
+import asyncio
+import os
+import signal
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from app.workers import __main__ as worker_process
+
+
+class _Worker:
+    def __init__(self, *args, **kwargs):
+        self._stop = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    async def run(self) -> None:
+        await self._stop.wait()
+
+
+class TestWorkerProcess:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sig", [signal.SIGTERM, signal.SIGINT])
+    async def test_signal_stops_every_worker(self, sig):
+        """Test one SIGTERM/SIGINT stops all the workers, so the process exits"""
+        http_client = AsyncMock()
+        with patch.multiple(worker_process, RefreshScheduler=_Worker, RefreshWorker=_Worker,
+                            WebhookConsumer=_Worker, ImportWorker=_Worker), \
+             patch.object(worker_process, "create_http_client", Mock(return_value=http_client)), \
+             patch.object(worker_process, "async_engine", AsyncMock()):
+            process = asyncio.create_task(worker_process.main())
+            await asyncio.sleep(0.05)
+            os.kill(os.getpid(), sig)
+            await asyncio.wait_for(process, timeout=2)
+
+        http_client.aclose.assert_awaited_once()
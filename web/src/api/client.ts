@@ -20,6 +20,8 @@ export const projectsApi = {
     order?: string;
     limit?: number;
     offset?: number;
+    cursor?: string;
+    q?: string;
   }): Promise<ProjectsResponse> => {
     const response = await apiClient.get('/projects', { params });
     return response.data;
@@ -1,4 +1,4 @@
-import React, { useState, useMemo } from 'react';
+import React, { useState, useEffect } from 'react';
 import { ExternalLink, Eye, RefreshCw, Search, Plus } from 'lucide-react';
 import { useProjects, useRefreshProject } from '../hooks/useProjects';
 import { formatRelativeTime, formatDateTime } from '../utils/formatters';
@@ -10,24 +10,25 @@ interface ProjectsTableProps {
 
 export const ProjectsTable: React.FC<ProjectsTableProps> = ({ onViewProject, onAddRepo }) => {
   const [searchTerm, setSearchTerm] = useState('');
+  const [debouncedSearch, setDebouncedSearch] = useState('');
   const [sortOrder, setSortOrder] = useState<'asc' | 'desc'>('desc');
+
+  // Search runs server-side across the whole portfolio; wait for typing to pause
+  useEffect(() => {
+    const timer = setTimeout(() => setDebouncedSearch(searchTerm.trim()), 300);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
   
   const { data, isLoading, error } = useProjects({
     order: `last_activity_at_${sortOrder}`,
     limit: 50,
     offset: 0,
+    q: debouncedSearch || undefined,
   });
   
   const refreshProject = useRefreshProject();
 
-  const filteredProjects = useMemo(() => {
-    if (!data?.projects) return [];
-    
-    return data.projects.filter(project => 
-      project.owner.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      project.name.toLowerCase().includes(searchTerm.toLowerCase())
-    );
-  }, [data?.projects, searchTerm]);
+  const filteredProjects = data?.projects ?? [];
 
   const handleRefresh = async (projectId: string, e: React.MouseEvent) => {
     e.stopPropagation();
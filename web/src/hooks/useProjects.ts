@@ -1,4 +1,4 @@
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { useQuery, useMutation, useQueryClient, keepPreviousData } from '@tanstack/react-query';
 import { projectsApi } from '../api/client';
 import type { CreateProjectRequest } from '../types/project';
 
@@ -6,10 +6,13 @@ export const useProjects = (params?: {
   order?: string;
   limit?: number;
   offset?: number;
+  cursor?: string;
+  q?: string;
 }) => {
   return useQuery({
     queryKey: ['projects', params],
     queryFn: () => projectsApi.getProjects(params),
+    placeholderData: keepPreviousData,
   });
 };
 
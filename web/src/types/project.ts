@@ -33,9 +33,10 @@ export interface LastOpenPR {
 
 export interface ProjectsResponse {
   projects: Project[];
-  total: number;
+  total: number | null;
   limit: number;
   offset: number;
+  next_cursor: string | null;
 }
 
 export interface CreateProjectRequest {